@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+抓取性能基准测试脚本
+基于本地回放服务器（录制的夹具或合成页面）测量抓取和完整监控流程的耗时，无需真实账户
+
+用法：
+    python benchmark.py fetch --rows 300 --engine selenium --repeat 3
+    python benchmark.py run --rows 300 --repeat 2
+    python benchmark.py serve --rows 300 --fixtures data/fixtures
+    python benchmark.py models --records 50000
+    python benchmark.py render --records 10000
+    python benchmark.py notify --records 1000 --delay 3 --timeout 1
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+
+from config import Config
+import fixtures
+
+
+def configure(servers, work_dir: str, engine: str):
+    """将配置指向回放服务器，数据文件写入临时目录"""
+    Config.IEEE_EMAIL = Config.IEEE_PASSWORD = Config.IEEE_URL = None
+    Config.ELSEVIER_EMAIL = Config.ELSEVIER_PASSWORD = Config.ELSEVIER_URL = None
+    Config.PORTALS_FILE = None
+    Config.PORTALS_JSON = json.dumps(fixtures.replay_portals(servers))
+    Config.DATA_FILE = os.path.join(work_dir, 'manuscripts.json')
+    Config.STORAGE_DB = os.path.join(work_dir, 'manuscripts.db')
+    Config.EVENT_LOG_FILE = os.path.join(work_dir, 'manuscripts.events.jsonl')
+    Config.SHARD_DIR = os.path.join(work_dir, 'shards')
+    Config.SNAPSHOT_FILE = os.path.join(work_dir, 'manuscripts.snap')
+    Config.HEARTBEAT_FILE = os.path.join(work_dir, 'heartbeat.json')
+    Config.HISTORY_FILE = os.path.join(work_dir, 'history.jsonl')
+    Config.HISTORY_STATS_FILE = os.path.join(work_dir, 'history_stats.json')
+    Config.LOCATOR_FILE = os.path.join(work_dir, 'locators.json')
+    Config.SESSION_FILE = os.path.join(work_dir, 'sessions.json')
+    Config.DIGEST_QUEUE_FILE = os.path.join(work_dir, 'digest_queue.json')
+    Config.OUTBOX_FILE = os.path.join(work_dir, 'outbox.json')
+    # 通知写入临时目录中的文件，不发送邮件
+    Config.NOTIFY_CHANNELS = 'file'
+    Config.NOTIFY_FILE = os.path.join(work_dir, 'notifications.jsonl')
+    Config.FIXTURE_RECORD_DIR = None
+    Config.FETCH_ENGINE = engine
+
+
+@contextmanager
+def quiet(enabled: bool):
+    """屏蔽被测代码的日志输出"""
+    if enabled:
+        with redirect_stdout(StringIO()):
+            yield
+    else:
+        yield
+
+
+def report(name: str, timings, detail: str = ''):
+    print(f"⏱️  {name}: 中位数 {statistics.median(timings):.3f}s，"
+          f"最快 {min(timings):.3f}s，最慢 {max(timings):.3f}s（{len(timings)} 次）{detail}")
+
+
+def bench_fetch(args, servers):
+    """分别计时每个平台的抓取"""
+    from monitor import JournalMonitor
+    import http_engine
+
+    monitor = JournalMonitor()
+    if args.engine == 'selenium':
+        monitor._init_driver_pool()
+    try:
+        for portal in Config.get_portals():
+            timings = []
+            count = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with quiet(not args.verbose):
+                    if args.engine == 'selenium':
+                        fetch = monitor.fetch_ieee_manuscripts if portal.type == 'scholarone' \
+                            else monitor.fetch_elsevier_manuscripts
+                        with monitor.driver_pool.driver() as driver:
+                            manuscripts = fetch(driver, portal)
+                    else:
+                        fetch = http_engine.fetch_scholarone if portal.type == 'scholarone' \
+                            else http_engine.fetch_editorial_manager
+                        manuscripts = fetch(portal.url, portal.username, portal.password,
+                                            Config.HTTP_TIMEOUT, label=portal.name)
+                timings.append(time.perf_counter() - start)
+                count = len(manuscripts)
+            report(f"{portal.name} ({portal.source}, {args.engine})", timings, f"，{count} 篇稿件")
+    finally:
+        monitor._close_driver_pool()
+
+
+def bench_run(args, servers):
+    """计时完整的 run()；第一次运行写入初始状态，之后为常规运行"""
+    from monitor import JournalMonitor
+
+    timings = []
+    for _ in range(args.repeat):
+        monitor = JournalMonitor()
+        start = time.perf_counter()
+        with quiet(not args.verbose):
+            monitor.run()
+        timings.append(time.perf_counter() - start)
+    stored = len(monitor.storage.get_all_manuscripts())
+    report(f"run() ({args.engine})", timings, f"，保存 {stored} 篇稿件")
+
+
+STATUSES = ['Under Review', 'Awaiting Reviewer Scores', 'Major Revision', 'Accept', 'Reject',
+            'With Editor', 'Awaiting AE Recommendation', 'Submitted']
+
+
+def synthetic_rows(count: int):
+    """模拟解析页面得到的字段：每行的来源和状态都是新建的字符串对象"""
+    for i in range(count):
+        source = 'IEEE' if i % 2 else 'Elsevier'
+        status = STATUSES[i % len(STATUSES)]
+        yield (f"TNNLS-2026-{i:05d}", f"Synthetic manuscript title number {i} on benchmarking",
+               ' '.join(status.split(' ')), source[:1] + source[1:], f"https://example.com/folder?id={i % 7}")
+
+
+def build_dicts(count: int):
+    return [{'id': i, 'title': t, 'status': s, 'source': src, 'url': u, 'portal': src}
+            for i, t, s, src, u in synthetic_rows(count)]
+
+
+def build_models(count: int):
+    from models import Manuscript
+    return [Manuscript(id=i, title=t, status=s, source=src, url=u) for i, t, s, src, u in synthetic_rows(count)]
+
+
+def measure_memory(build, count: int) -> int:
+    """构建结果占用的内存字节数"""
+    tracemalloc.start()
+    records = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def bench_models(args):
+    """对比字典与 Manuscript 模型的内存占用和处理耗时"""
+    from storage import ManuscriptStorage
+
+    count = args.records
+    results = {}
+    for name, build in (('dict', build_dicts), ('Manuscript', build_models)):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            records = build(count)
+            timings.append(time.perf_counter() - start)
+        size = measure_memory(build, count)
+        start = time.perf_counter()
+        if name == 'dict':
+            total = sum(len(r.get('title', '')) + len(r.get('status', '')) for r in records)
+        else:
+            total = sum(len(r.title) + len(r.status) for r in records)
+        access = time.perf_counter() - start
+        distinct = len({id(r['status'] if name == 'dict' else r.status) for r in records})
+        results[name] = size
+        report(f"{name} 构建 {count} 条", timings,
+               f"，内存 {size / 1024 / 1024:.1f} MiB，字段读取 {access * 1000:.1f}ms（{total} 个字符），"
+               f"状态字符串对象 {distinct} 个")
+
+    print(f"💾 Manuscript 相比字典节省内存 {(1 - results['Manuscript'] / results['dict']) * 100:.0f}%")
+
+    # 以模型输入运行完整的状态对比（首次写入和无变化的第二次运行）
+    with tempfile.TemporaryDirectory() as work_dir:
+        storage = ManuscriptStorage(os.path.join(work_dir, 'manuscripts.json'))
+        for label in ('首次写入', '无变化'):
+            start = time.perf_counter()
+            with quiet(not args.verbose):
+                storage.compare_and_update(records)
+            print(f"⏱️  compare_and_update（{label}，{count} 条）: {time.perf_counter() - start:.3f}s")
+
+
+def bench_render(args):
+    """测量每日报告和变化通知的渲染耗时，按稿件数分档，检查单篇稿件耗时是否保持不变"""
+    import templates
+    from models import StatusChange
+
+    manuscripts = build_models(args.records)
+    changes = [StatusChange(m, 'Submitted', '2026-01-01 08:00:00') for m in manuscripts]
+    for fraction in (0.1, 0.25, 0.5, 1):
+        count = max(1, int(args.records * fraction))
+        for name, render, items in (('每日报告HTML', templates.render_daily_html, manuscripts),
+                                    ('每日报告文本', templates.render_daily_text, manuscripts),
+                                    ('变化通知HTML', templates.render_change_html, changes)):
+            batch = items[:count]
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                body = render(batch)
+                timings.append(time.perf_counter() - start)
+            per_item = statistics.median(timings) / count * 1e6
+            report(f"{name} {count} 篇", timings, f"，每篇 {per_item:.2f}µs，正文 {len(body) / 1024:.0f} KiB")
+
+
+def check(name: str, ok: bool, detail: str = '') -> bool:
+    """输出一项检查的结果"""
+    print(f"{'✅' if ok else '❌'} {name}{'：' + detail if detail else ''}")
+    return ok
+
+
+def bench_notify(args) -> bool:
+    """
+    通知扇出：正常 Webhook、慢速 Webhook 和文件渠道同时发送，检查慢速渠道是否拖慢其他渠道和运行结束；
+    再分别检查 Webhook 的5xx重试、文件渠道的写入超时，以及邮件渠道的SMTP会话复用和断线重连
+
+    Returns:
+        是否所有检查都通过
+    """
+    from models import StatusChange
+    from notification import EmailNotifier, FileNotifier, NotificationQueue, WebhookNotifier
+
+    fast = fixtures.WebhookStandIn().start()
+    slow = fixtures.WebhookStandIn(delay=args.delay).start()
+    manuscripts = build_models(args.records)
+    changes = [StatusChange(m, 'Submitted', '2026-01-01 08:00:00') for m in manuscripts[:10]]
+    expected = args.repeat + 1
+    passed = []
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            notify_file = os.path.join(work_dir, 'notifications.jsonl')
+            notifiers = [WebhookNotifier(fast.url, args.timeout), WebhookNotifier(slow.url, args.timeout),
+                         FileNotifier(notify_file, args.timeout)]
+            notifiers[0].name, notifiers[1].name = 'webhook', 'webhook-slow'
+            start = time.perf_counter()
+            with quiet(not args.verbose):
+                notifications = NotificationQueue(notifiers)
+                for _ in range(args.repeat):
+                    notifications.submit('send_change_notification', changes)
+                notifications.submit('send_daily_report', manuscripts)
+                submitted = time.perf_counter() - start
+                done = notifications.close(args.drain)
+            elapsed = time.perf_counter() - start
+            for channel in notifications.channels:
+                results = channel.results
+                print(f"📮 {channel.name}: 完成 {len(results)}/{channel.submitted} 个通知，"
+                      f"成功 {sum(r['ok'] for r in results)} 个，发送耗时共 {sum(r['duration'] for r in results):.2f}s")
+            print(f"📡 Webhook 接收: 正常 {len(fast.received)} 个，慢速 {len(slow.received)} 个")
+            print(f"⏱️  提交 {submitted * 1000:.1f}ms，等待发送完毕 {elapsed:.2f}s"
+                  f"（期限 {args.drain:g}s，{'全部完成' if done else '有渠道未完成'}）")
+
+            fast_channel, slow_channel, file_channel = notifications.channels
+            with open(notify_file, encoding='utf-8') as f:
+                events = [json.loads(line)['event'] for line in f]
+            passed.append(check('正常 Webhook 收到全部通知',
+                                sum(r['ok'] for r in fast_channel.results) == expected
+                                and len(fast.received) == expected,
+                                f"{len(fast.received)}/{expected}"))
+            passed.append(check('文件渠道写入全部通知',
+                                events == ['status_change'] * args.repeat + ['daily_report'],
+                                f"{len(events)}/{expected} 行"))
+            if args.delay > args.timeout:
+                passed.append(check('慢速 Webhook 超时失败，不影响其他渠道',
+                                    not any(r['ok'] for r in slow_channel.results)
+                                    and not fast_channel.thread.is_alive() and not file_channel.thread.is_alive(),
+                                    f"失败 {len(slow_channel.results)}/{slow_channel.submitted} 个"))
+    finally:
+        fast.stop()
+        slow.stop()
+
+    # Webhook 遇到5xx时重试：第一次返回500，重试后成功；一直返回500时重试 retries 次后失败
+    for fail_first, status, expect_ok in ((1, 200, True), (0, 500, False)):
+        stand_in = fixtures.WebhookStandIn(status=status, fail_first=fail_first).start()
+        try:
+            with quiet(not args.verbose):
+                ok = WebhookNotifier(stand_in.url, args.timeout, retries=1, retry_delay=0.1) \
+                    .send_change_notification(changes)
+        finally:
+            stand_in.stop()
+        label = '第一次返回500时重试后成功' if expect_ok else '一直返回500时重试1次后失败'
+        passed.append(check(f"Webhook {label}", ok == expect_ok and len(stand_in.received) == 2,
+                            f"请求 {len(stand_in.received)} 次"))
+
+    # 文件渠道写入超时：写入没有读取端的命名管道时 open 会一直阻塞
+    if hasattr(os, 'mkfifo'):
+        with tempfile.TemporaryDirectory() as work_dir:
+            fifo = os.path.join(work_dir, 'blocked.fifo')
+            os.mkfifo(fifo)
+            start = time.perf_counter()
+            with quiet(not args.verbose):
+                ok = FileNotifier(fifo, timeout=0.5).send_change_notification(changes)
+            waited = time.perf_counter() - start
+            # 打开读取端，让阻塞的写入线程结束
+            reader = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+            time.sleep(0.1)
+            os.close(reader)
+        passed.append(check('文件渠道写入阻塞时按超时失败', not ok and waited < 1.5, f"{waited:.2f}s"))
+
+    # 邮件渠道：本地SMTP服务（SMTP_SECURITY=none）上多封邮件共用一个会话，服务端断开后重新连接重发
+    smtp = fixtures.SmtpStandIn().start()
+    Config.SMTP_HOST, Config.SMTP_PORT, Config.SMTP_SECURITY = smtp.host, smtp.port, 'none'
+    Config.SMTP_TIMEOUT = args.timeout
+    Config.EMAIL_SENDER, Config.EMAIL_PASSWORD = 'bench@example.com', 'bench'
+    Config.EMAIL_RECEIVER = 'a@example.com, b@example.com'
+    try:
+        email = EmailNotifier()
+        with quiet(not args.verbose):
+            results = [email.send_change_notification(changes) for _ in range(args.repeat)]
+        passed.append(check('邮件渠道多封邮件共用一个SMTP连接',
+                            all(results) and len(smtp.received) == args.repeat and smtp.connections == 1,
+                            f"{len(smtp.received)} 封，{smtp.connections} 次连接"))
+        smtp.drop_connections()
+        with quiet(not args.verbose):
+            ok = email.send_daily_report(manuscripts[:10])
+            email.close()
+        passed.append(check('SMTP服务断开连接后重新连接并重发',
+                            ok and len(smtp.received) == args.repeat + 1 and smtp.connections == 2
+                            and email.smtp.connect_count == 2,
+                            f"{len(smtp.received)} 封，{smtp.connections} 次连接"))
+    finally:
+        smtp.stop()
+
+    print(f"{'✅' if all(passed) else '❌'} 通知渠道检查: 通过 {sum(passed)}/{len(passed)} 项")
+    return all(passed)
+
+
+def serve(args, servers):
+    """只启动回放服务器，便于手动运行 monitor.py 或 test_login.py"""
+    print("回放平台配置（可作为 PORTALS_JSON 使用）：")
+    print(json.dumps(fixtures.replay_portals(servers), ensure_ascii=False))
+    print("按 Ctrl+C 停止")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='期刊状态监控抓取性能基准测试')
+    parser.add_argument('command', choices=['fetch', 'run', 'serve', 'models', 'render', 'notify'])
+    parser.add_argument('--fixtures', help='录制的夹具目录（FIXTURE_RECORD_DIR），默认使用合成页面')
+    parser.add_argument('--rows', type=int, default=300, help='仪表板和投稿列表扩充到的行数')
+    parser.add_argument('--engine', choices=['selenium', 'http', 'auto'], default='selenium')
+    parser.add_argument('--records', type=int, default=50000, help='models/render/notify 命令使用的合成稿件数')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--delay', type=float, default=3, help='notify 命令中慢速 Webhook 每次响应的延迟（秒）')
+    parser.add_argument('--timeout', type=float, default=1, help='notify 命令中 Webhook 渠道的请求超时（秒）')
+    parser.add_argument('--drain', type=float, default=5, help='notify 命令中等待所有渠道发送完毕的期限（秒）')
+    parser.add_argument('--verbose', action='store_true', help='显示被测代码的日志')
+    args = parser.parse_args()
+
+    if args.command == 'models':
+        bench_models(args)
+        return
+    if args.command == 'render':
+        bench_render(args)
+        return
+    if args.command == 'notify':
+        if not bench_notify(args):
+            sys.exit(1)
+        return
+
+    servers = fixtures.start_replay(args.fixtures, args.rows)
+    print(f"🎞️  回放服务器: {', '.join(f'{s.login_url} ({s.type})' for s in servers)}")
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            configure(servers, work_dir, args.engine)
+            {'fetch': bench_fetch, 'run': bench_run, 'serve': serve}[args.command](args, servers)
+    finally:
+        for server in servers:
+            server.stop()
+    print(f"📡 回放服务器共处理 {sum(s.request_count for s in servers)} 次请求")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,9 @@
 负责从环境变量中读取配置信息
 """
 import os
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import urlsplit
+from portals import PortalConfig, load_portals
 
 
 class Config:
@@ -19,38 +21,128 @@ class Config:
     ELSEVIER_PASSWORD: Optional[str] = os.getenv('ELSEVIER_PASSWORD')
     ELSEVIER_URL: Optional[str] = os.getenv('ELSEVIER_URL')  # Elsevier期刊的Editorial Manager网址
     
+    # 多账户、多期刊配置（可选）：平台列表配置文件或JSON字符串，
+    # 也可以使用 PORTAL_<n>_TYPE / _URL / _USERNAME / _PASSWORD / _NAME 编号环境变量
+    PORTALS_FILE: Optional[str] = os.getenv('PORTALS_FILE')
+    PORTALS_JSON: Optional[str] = os.getenv('PORTALS_JSON')
+    
     # 邮件配置
     EMAIL_SENDER: Optional[str] = os.getenv('EMAIL_SENDER')
     EMAIL_PASSWORD: Optional[str] = os.getenv('EMAIL_PASSWORD')
-    EMAIL_RECEIVER: Optional[str] = os.getenv('EMAIL_RECEIVER')
+    EMAIL_RECEIVER: Optional[str] = os.getenv('EMAIL_RECEIVER')  # 多个地址用逗号分隔
     
     # SMTP配置（自动识别）
     SMTP_HOST: Optional[str] = os.getenv('SMTP_HOST')
     SMTP_PORT: int = int(os.getenv('SMTP_PORT') or '465')  # 如果为空则使用默认值
+    # 连接加密方式：auto（465端口用ssl，其他端口用starttls）、ssl、starttls 或 none（仅用于本地测试SMTP服务）
+    SMTP_SECURITY: str = (os.getenv('SMTP_SECURITY') or 'auto').lower()
+    SMTP_TIMEOUT: float = float(os.getenv('SMTP_TIMEOUT') or '30')
+    # SMTP会话空闲超过该秒数后，发送下一封邮件前先发NOOP确认连接可用
+    SMTP_KEEPALIVE: float = float(os.getenv('SMTP_KEEPALIVE') or '30')
+    # 通知渠道：逗号分隔的 email、webhook、file，通知同时发往所有渠道
+    NOTIFY_CHANNELS: str = os.getenv('NOTIFY_CHANNELS') or 'email'
+    # webhook 渠道：以JSON向该地址发送POST请求，WEBHOOK_TOKEN 不为空时作为 Bearer 令牌
+    WEBHOOK_URL: Optional[str] = os.getenv('WEBHOOK_URL')
+    WEBHOOK_TOKEN: Optional[str] = os.getenv('WEBHOOK_TOKEN')
+    WEBHOOK_TIMEOUT: float = float(os.getenv('WEBHOOK_TIMEOUT') or '10')
+    # 服务端5xx错误或连接失败时的重试次数
+    WEBHOOK_RETRIES: int = int(os.getenv('WEBHOOK_RETRIES') or '2')
+    # file 渠道：追加写入的JSONL文件，"-" 表示以纯文本输出到标准输出；写入超过 NOTIFY_FILE_TIMEOUT 秒视为失败
+    NOTIFY_FILE: str = os.getenv('NOTIFY_FILE') or '-'
+    NOTIFY_FILE_TIMEOUT: float = float(os.getenv('NOTIFY_FILE_TIMEOUT') or '10')
+    # 运行结束前等待后台通知队列发送完毕的最长时间（秒）
+    NOTIFY_DRAIN_TIMEOUT: float = float(os.getenv('NOTIFY_DRAIN_TIMEOUT') or '120')
+    # 变化通知摘要：变化先进入队列，最早的变化等待满 DIGEST_WINDOW_MINUTES 分钟或达到 DIGEST_MAX_SIZE 条时合并发送
+    # （0 表示不合并，每次检测到变化立即发送）；进入 DIGEST_IMMEDIATE_STATUSES 中状态的变化立即发送
+    DIGEST_WINDOW_MINUTES: float = float(os.getenv('DIGEST_WINDOW_MINUTES') or '0')
+    DIGEST_MAX_SIZE: int = int(os.getenv('DIGEST_MAX_SIZE') or '20')
+    DIGEST_IMMEDIATE_STATUSES: str = os.getenv('DIGEST_IMMEDIATE_STATUSES') or 'accept,accepted,reject,rejected'
     
     # 其他配置
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
     DATA_FILE: str = os.getenv('DATA_FILE', 'data/manuscripts.json')
+    # 存储后端：json（整个数据文件读写）或 sqlite（只写入变化的行，并保留状态变化历史）
+    STORAGE_BACKEND: str = os.getenv('STORAGE_BACKEND', 'json').lower()
+    STORAGE_DB: str = os.getenv('STORAGE_DB') or os.path.join(os.path.dirname(DATA_FILE), 'manuscripts.db')
+    # eventlog 后端：数据文件作为快照，变化追加到事件日志，日志达到阈值行数后压缩回快照
+    EVENT_LOG_FILE: str = os.getenv('EVENT_LOG_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'manuscripts.events.jsonl')
+    EVENT_LOG_COMPACT_THRESHOLD: int = int(os.getenv('EVENT_LOG_COMPACT_THRESHOLD') or '500')
+    # sharded 后端：每个平台账户一个JSON分片，只改写本次抓取到的平台的分片
+    SHARD_DIR: str = os.getenv('SHARD_DIR') or os.path.join(os.path.dirname(DATA_FILE), 'shards')
+    # binary 后端：按列存储的二进制快照，通过 mmap 读取
+    SNAPSHOT_FILE: str = os.getenv('SNAPSHOT_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'manuscripts.snap')
+    # 多个监控进程共用数据时等待文件锁的最长时间（秒）
+    STORAGE_LOCK_TIMEOUT: float = float(os.getenv('STORAGE_LOCK_TIMEOUT') or '60')
+    # 心跳文件：按平台保存每次运行都会变化的检查时间，不提交到仓库
+    HEARTBEAT_FILE: str = os.getenv('HEARTBEAT_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'heartbeat.json')
+    # 状态变化历史（只追加）和增量维护的状态停留统计
+    HISTORY_FILE: str = os.getenv('HISTORY_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'history.jsonl')
+    HISTORY_STATS_FILE: str = os.getenv('HISTORY_STATS_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'history_stats.json')
+    # 变化通知摘要的待发送队列
+    DIGEST_QUEUE_FILE: str = os.getenv('DIGEST_QUEUE_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'digest_queue.json')
+    # 通知发件箱：变化通知在状态写入前保存，发送成功后删除；失败后按指数退避（基数、上限为秒）在之后的运行中重试
+    OUTBOX_FILE: str = os.getenv('OUTBOX_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'outbox.json')
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv('OUTBOX_MAX_ATTEMPTS') or '8')
+    OUTBOX_BACKOFF_BASE: float = float(os.getenv('OUTBOX_BACKOFF_BASE') or '300')
+    OUTBOX_BACKOFF_MAX: float = float(os.getenv('OUTBOX_BACKOFF_MAX') or '21600')
     HEADLESS: bool = os.getenv('HEADLESS', 'true').lower() == 'true'
     
+    # 并发抓取配置：浏览器驱动池大小（同时运行的浏览器数量上限）
+    DRIVER_POOL_SIZE: int = int(os.getenv('DRIVER_POOL_SIZE') or '2')
+    # 同时抓取的平台数量上限
+    FETCH_CONCURRENCY: int = int(os.getenv('FETCH_CONCURRENCY') or '4')
+    
+    # 精简浏览器模式：屏蔽图片、字体、音视频和统计脚本，使用eager加载策略和固定小窗口
+    LEAN_BROWSER: bool = os.getenv('LEAN_BROWSER', 'false').lower() == 'true'
+    
+    # 页面等待配置：单个等待步骤的默认超时时间（秒）
+    WAIT_TIMEOUT: float = float(os.getenv('WAIT_TIMEOUT') or '15')
+    
+    # 表格提取模式：js（单次脚本调用提取整张表格）或 dom（逐元素提取，兼容模式）
+    EXTRACTION_MODE: str = os.getenv('EXTRACTION_MODE', 'js').lower()
+    
+    # Editorial Manager投稿列表同时打开的标签页数量（1为在当前标签页逐个访问）
+    FOLDER_TABS: int = int(os.getenv('FOLDER_TABS') or '4')
+    
+    # 页面录制目录：设置后保存抓取过程中访问的页面，供 benchmark.py 离线回放
+    FIXTURE_RECORD_DIR: Optional[str] = os.getenv('FIXTURE_RECORD_DIR')
+    
+    # 抓取引擎：auto（优先HTTP，必要时回退到浏览器）、http（仅HTTP）、selenium（仅浏览器）
+    FETCH_ENGINE: str = os.getenv('FETCH_ENGINE', 'auto').lower()
+    HTTP_TIMEOUT: float = float(os.getenv('HTTP_TIMEOUT') or '20')
+    
+    # 定位器缓存配置：记录各页面元素上次成功的定位方式，连续失败指定次数后失效
+    LOCATOR_FILE: str = os.getenv('LOCATOR_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'locators.json')
+    LOCATOR_MAX_FAILURES: int = int(os.getenv('LOCATOR_MAX_FAILURES') or '2')
+    
+    # 登录会话复用配置：保存登录Cookie，下次运行直接进入仪表板
+    SESSION_REUSE: bool = os.getenv('SESSION_REUSE', 'true').lower() == 'true'
+    SESSION_FILE: str = os.getenv('SESSION_FILE') or os.path.join(os.path.dirname(DATA_FILE), 'sessions.json')
+    SESSION_MAX_AGE_HOURS: float = float(os.getenv('SESSION_MAX_AGE_HOURS') or '24')
+    
     @classmethod
     def validate(cls) -> bool:
         """验证配置是否完整"""
         required_fields = []
         
         # 检查是否至少配置了一个期刊账户
-        ieee_configured = cls.IEEE_EMAIL and cls.IEEE_PASSWORD and cls.IEEE_URL
-        elsevier_configured = cls.ELSEVIER_EMAIL and cls.ELSEVIER_PASSWORD and cls.ELSEVIER_URL
-        
-        if not ieee_configured and not elsevier_configured:
+        if not cls.get_portals():
             required_fields.append('IEEE或Elsevier账户（包括邮箱、密码和期刊网址）')
         
+        channels = cls.get_notify_channels()
+        if not channels:
+            required_fields.append('通知渠道（NOTIFY_CHANNELS）')
+        
         # 检查邮件配置
-        if not cls.EMAIL_SENDER or not cls.EMAIL_PASSWORD:
-            required_fields.append('邮件发送配置')
+        if 'email' in channels:
+            if not cls.EMAIL_SENDER or not cls.EMAIL_PASSWORD:
+                required_fields.append('邮件发送配置')
+            
+            if not cls.EMAIL_RECEIVER:
+                required_fields.append('邮件接收地址')
         
-        if not cls.EMAIL_RECEIVER:
-            required_fields.append('邮件接收地址')
+        if 'webhook' in channels and not cls.WEBHOOK_URL:
+            required_fields.append('Webhook地址（WEBHOOK_URL）')
         
         if required_fields:
             print(f"❌ 配置不完整，缺少: {', '.join(required_fields)}")
@@ -58,6 +150,16 @@ class Config:
         
         return True
     
+    @classmethod
+    def get_portals(cls) -> List[PortalConfig]:
+        """获取所有已配置的投稿平台账户"""
+        return load_portals(cls)
+    
+    @classmethod
+    def get_notify_channels(cls) -> List[str]:
+        """已启用的通知渠道"""
+        return [c.strip().lower() for c in cls.NOTIFY_CHANNELS.split(',') if c.strip()]
+    
     @classmethod
     def get_smtp_config(cls) -> tuple:
         """自动识别SMTP配置"""
@@ -97,11 +199,36 @@ class Config:
         print(f"Elsevier账户: {cls.ELSEVIER_EMAIL if cls.ELSEVIER_EMAIL else '未配置'}")
         if cls.ELSEVIER_URL:
             print(f"Elsevier期刊网址: {cls.ELSEVIER_URL}")
-        print(f"发件邮箱: {cls.EMAIL_SENDER}")
-        print(f"收件邮箱: {cls.EMAIL_RECEIVER}")
-        smtp_host, smtp_port = cls.get_smtp_config()
-        print(f"SMTP服务器: {smtp_host}:{smtp_port}")
+        portals = cls.get_portals()
+        print(f"监控平台: {len(portals)} 个")
+        for portal in portals:
+            print(f"  • {portal.name} ({portal.source}): {portal.username} @ {portal.url}")
+        channels = cls.get_notify_channels()
+        print(f"通知渠道: {', '.join(channels)}")
+        if 'webhook' in channels and cls.WEBHOOK_URL:
+            # 只显示主机，Webhook地址的路径中常带有密钥
+            print(f"Webhook地址: {urlsplit(cls.WEBHOOK_URL).netloc}")
+        if 'file' in channels:
+            print(f"通知文件: {'标准输出' if cls.NOTIFY_FILE == '-' else cls.NOTIFY_FILE}")
+        if 'email' in channels:
+            print(f"发件邮箱: {cls.EMAIL_SENDER}")
+            print(f"收件邮箱: {cls.EMAIL_RECEIVER}")
+            if cls.EMAIL_SENDER or cls.SMTP_HOST:
+                smtp_host, smtp_port = cls.get_smtp_config()
+                print(f"SMTP服务器: {smtp_host}:{smtp_port}")
+        if cls.DIGEST_WINDOW_MINUTES > 0:
+            print(f"变化通知摘要: {cls.DIGEST_WINDOW_MINUTES:g} 分钟或 {cls.DIGEST_MAX_SIZE} 条合并发送，"
+                  f"立即发送: {cls.DIGEST_IMMEDIATE_STATUSES}")
         print(f"无头模式: {cls.HEADLESS}")
+        print(f"抓取引擎: {cls.FETCH_ENGINE}")
+        print(f"浏览器池大小: {cls.DRIVER_POOL_SIZE}")
+        print(f"并发平台数: {cls.FETCH_CONCURRENCY}")
+        print(f"精简浏览器模式: {cls.LEAN_BROWSER}")
+        print(f"投稿列表并行标签页: {cls.FOLDER_TABS}")
+        print(f"会话复用: {cls.SESSION_REUSE}")
         print(f"日志级别: {cls.LOG_LEVEL}")
         print(f"数据文件: {cls.DATA_FILE}")
+        storage_file = {'sqlite': cls.STORAGE_DB, 'eventlog': cls.EVENT_LOG_FILE,
+                        'sharded': cls.SHARD_DIR, 'binary': cls.SNAPSHOT_FILE}.get(cls.STORAGE_BACKEND)
+        print(f"存储后端: {cls.STORAGE_BACKEND}" + (f" ({storage_file})" if storage_file else ''))
         print("=" * 50)
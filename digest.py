@@ -0,0 +1,126 @@
+"""
+变化通知摘要模块
+把状态变化先放入持久队列，达到时间窗口或数量上限时合并为一封邮件发送，
+避免频繁轮询时每次运行都单独发送一封变化通知；录用、拒稿等最终状态立即发送。
+取出的变化在队列锁内先交给 sink（发件箱）持久保存，之后才清空队列，中途出错或进程退出都不会丢失变化
+"""
+import json
+import os
+import re
+import time
+from typing import Callable, List, Optional, Sequence
+
+from locks import file_lock
+from models import StatusChange
+
+
+class ChangeDigest:
+    """变化通知摘要队列
+
+    queue_file 中保存尚未发送的状态变化（按加入顺序），每条附带加入时间 queued_at_ts。
+    以下任一条件满足时取出队列中的全部变化，合并为一封通知：
+    - 最早的变化已等待 window_minutes 分钟（在每次运行时检查）
+    - 待发送的变化达到 max_size 条
+    - 新的变化进入了 immediate_statuses 中的状态（状态名中包含其中任一完整单词，不区分大小写，
+      例如 reject 匹配 "Reject & Resubmit"，但不匹配 "Not Rejectable"）
+
+    window_minutes 为0时不合并，每次检测到的变化直接发送。
+    """
+
+    def __init__(self, queue_file: str, window_minutes: float = 0, max_size: int = 20,
+                 immediate_statuses: Sequence[str] = (), lock_timeout: float = 60):
+        self.queue_file = queue_file
+        self.window_seconds = window_minutes * 60
+        self.max_size = max_size
+        self.immediate_statuses = [s.strip().lower() for s in immediate_statuses if s.strip()]
+        self._immediate_patterns = [re.compile(r'\b' + re.escape(k) + r'\b') for k in self.immediate_statuses]
+        self.lock_timeout = lock_timeout
+
+    @classmethod
+    def from_config(cls, config) -> 'ChangeDigest':
+        return cls(config.DIGEST_QUEUE_FILE, config.DIGEST_WINDOW_MINUTES, config.DIGEST_MAX_SIZE,
+                   config.DIGEST_IMMEDIATE_STATUSES.split(','), config.STORAGE_LOCK_TIMEOUT)
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def _read(self) -> List[dict]:
+        if not os.path.exists(self.queue_file):
+            return []
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('pending', [])
+        except Exception as e:
+            print(f"⚠️  读取摘要队列失败: {e}")
+            return []
+
+    def _write(self, pending: List[dict]):
+        queue_dir = os.path.dirname(self.queue_file)
+        if queue_dir:
+            os.makedirs(queue_dir, exist_ok=True)
+        tmp_file = f"{self.queue_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'pending': pending}, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.queue_file)
+
+    def is_immediate(self, change: StatusChange) -> bool:
+        """新状态是否需要立即通知"""
+        status = (change.new_status or '').lower()
+        return any(pattern.search(status) for pattern in self._immediate_patterns)
+
+    def _flush_reason(self, pending: List[dict], now: float, immediate: bool) -> Optional[str]:
+        if not pending:
+            return None
+        if immediate:
+            return '最终状态立即发送'
+        if len(pending) >= self.max_size:
+            return f"达到 {self.max_size} 条上限"
+        if now - pending[0]['queued_at_ts'] >= self.window_seconds:
+            return f"等待已满 {self.window_seconds / 60:g} 分钟"
+        return None
+
+    def _take(self, changes: List[StatusChange], immediate: bool,
+              sink: Callable[[List[StatusChange]], None]) -> List[StatusChange]:
+        """把新的变化加入队列，满足发送条件时取出全部待发送的变化，交给 sink 保存后再清空队列"""
+        with file_lock(self.queue_file, self.lock_timeout):
+            pending = self._read()
+            now = time.time()
+            pending += [{**change.to_dict(), 'queued_at_ts': now} for change in changes]
+            reason = self._flush_reason(pending, now, immediate)
+            if reason is None:
+                if changes:
+                    self._write(pending)
+                    waited = (now - pending[0]['queued_at_ts']) / 60
+                    print(f"📥 {len(changes)} 篇稿件状态变化已加入摘要，共 {len(pending)} 篇待发送"
+                          f"（最早一篇已等待 {waited:.0f} 分钟）")
+                return []
+            batch = [StatusChange.from_dict(record) for record in pending]
+            # sink 出错时队列保持原样（本次新加入的变化也不写入），由调用方放弃本次状态写入
+            sink(batch)
+            self._write([])
+
+        print(f"📤 合并发送 {len(pending)} 篇稿件状态变化（{reason}）")
+        return batch
+
+    def add(self, changes: List[StatusChange], sink: Callable[[List[StatusChange]], None]) -> List[StatusChange]:
+        """
+        加入新检测到的变化，需要发送时把变化（可能包含之前排队的变化）交给 sink 保存
+
+        Returns:
+            交给 sink 的变化，无需发送时为空列表
+        """
+        if not changes:
+            return []
+        if not self.enabled:
+            sink(changes)
+            return changes
+        return self._take(changes, any(self.is_immediate(change) for change in changes), sink)
+
+    def flush_due(self, sink: Callable[[List[StatusChange]], None]) -> List[StatusChange]:
+        """把已到发送时间的变化交给 sink 保存（每次运行结束时调用）"""
+        if not self.enabled or not os.path.exists(self.queue_file):
+            return []
+        return self._take([], False, sink)
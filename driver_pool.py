@@ -0,0 +1,186 @@
+"""
+浏览器驱动池模块
+负责管理多个WebDriver实例，供并发抓取使用
+"""
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue, Empty
+from typing import Callable, List, Optional
+
+
+# 精简模式下屏蔽的资源：图片、字体、音视频以及常见的统计/广告域名
+LEAN_BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m4a',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*hotjar.com*', '*nr-data.net*', '*newrelic.com*',
+    '*facebook.net*', '*scorecardresearch.com*', '*quantserve.com*',
+    '*demdex.net*', '*omtrdc.net*', '*adobedtm.com*', '*crazyegg.com*',
+    '*pendo.io*', '*qualtrics.com*', '*trendemon.com*', '*cookielaw.org*',
+]
+
+# 精简模式下禁用的Chrome内容设置（2 = 阻止）
+LEAN_CONTENT_SETTINGS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.fonts': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.managed_default_content_settings.notifications': 2,
+    'profile.managed_default_content_settings.geolocation': 2,
+}
+
+# 精简模式下使用的固定小窗口
+LEAN_WINDOW_SIZE = '1280,800'
+
+
+def apply_lean_options(chrome_options):
+    """为ChromeOptions启用精简配置：eager加载策略、小窗口、禁用图片等资源"""
+    chrome_options.page_load_strategy = 'eager'
+    chrome_options.add_argument(f'--window-size={LEAN_WINDOW_SIZE}')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--mute-audio')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_experimental_option('prefs', LEAN_CONTENT_SETTINGS)
+
+
+def block_lean_resources(driver):
+    """通过CDP屏蔽精简模式下不需要的资源请求"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️  无法通过CDP屏蔽资源: {e}")
+
+
+def reset_browser_state(driver):
+    """
+    清除上一个账户留下的登录状态，驱动归还后再借给其他账户使用
+
+    优先通过CDP清除浏览器全部Cookie（WebDriver的 delete_all_cookies 只作用于当前域名），
+    清空当前页面所在站点的 localStorage / sessionStorage，最后回到空白页。
+    """
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except Exception:
+        driver.delete_all_cookies()
+    if driver.current_url.startswith('http'):
+        driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+    driver.get('about:blank')
+
+
+class DriverPool:
+    """WebDriver驱动池
+
+    驱动按需创建，最多创建 size 个；归还后的驱动可被后续任务复用。
+    归还时先调用 reset 清除浏览器状态，清除失败的驱动直接关闭，不再放回池中。
+    """
+
+    def __init__(self, factory: Callable, size: int = 2, reset: Optional[Callable] = None):
+        self.factory = factory
+        self.reset = reset
+        self.size = max(1, size)
+        self._idle: Queue = Queue()
+        self._all: List = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _try_create(self):
+        """在未达到上限时创建新驱动，否则返回None"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("驱动池已关闭")
+            if len(self._all) + self._pending >= self.size:
+                return None
+            # 先占位，避免并发时超出上限
+            self._pending += 1
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        with self._lock:
+            self._pending -= 1
+            self._all.append(driver)
+        return driver
+
+    def acquire(self, timeout: Optional[float] = None):
+        """获取一个驱动，池满时阻塞等待其他任务归还"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except Empty:
+                pass
+
+            driver = self._try_create()
+            if driver is not None:
+                return driver
+
+            # 定期醒来重试创建：其他任务归还时关闭的驱动会腾出名额
+            wait = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+            if wait <= 0:
+                raise TimeoutError("等待可用浏览器超时")
+            try:
+                return self._idle.get(timeout=wait)
+            except Empty:
+                continue
+
+    def release(self, driver):
+        """归还驱动"""
+        if driver is None:
+            return
+        if self.reset:
+            try:
+                self.reset(driver)
+            except Exception as e:
+                print(f"⚠️  清除浏览器状态失败，关闭该浏览器: {e}")
+                self._discard(driver)
+                return
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        """关闭驱动并移出池，腾出的名额可重新创建"""
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """以上下文管理器方式借用驱动"""
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    @property
+    def created(self) -> int:
+        """已创建的驱动数量"""
+        with self._lock:
+            return len(self._all)
+
+    def close_all(self):
+        """关闭池中所有驱动"""
+        with self._lock:
+            drivers = self._all
+            self._all = []
+            self._closed = True
+
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"⚠️  关闭浏览器失败: {e}")
+
+        if drivers:
+            print(f"🔒 已关闭 {len(drivers)} 个浏览器")
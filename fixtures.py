@@ -0,0 +1,458 @@
+"""
+离线页面夹具模块
+录制抓取过程中访问的登录页、仪表板和投稿列表页面，并通过本地HTTP服务器回放，
+用于在没有真实账户的情况下测量和回归测试抓取性能；
+另提供接收 Webhook 通知的本地HTTP服务（WebhookStandIn）和接收邮件的本地SMTP服务（SmtpStandIn），
+用于测试通知渠道
+"""
+import copy
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from lxml import html as lxml_html
+
+
+# 夹具目录中的索引文件
+INDEX_FILE = 'index.json'
+
+# 合成页面中使用的稿件状态
+SYNTHETIC_STATUSES = ['Under Review', 'Awaiting Reviewer Scores', 'Awaiting AE Recommendation',
+                      'Required Reviews Completed', 'With Editor']
+
+# Editorial Manager合成主菜单中的投稿列表
+SYNTHETIC_FOLDERS = ['Submissions Being Processed', 'Submissions Needing Revision', 'Submissions Sent Back to Author']
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _path(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else '')
+
+
+class FixtureRecorder:
+    """页面录制器
+
+    按访问顺序保存页面HTML，同一地址重复访问时保留最后一次的内容
+    （表格由JavaScript渲染时，提取前的页面比加载完成时更完整）。
+    """
+
+    def __init__(self, fixture_dir: str, portals=()):
+        self.fixture_dir = fixture_dir
+        # 平台登录地址所在站点 → 平台类型，用于回放时按平台表格结构扩充行数
+        self.site_types = {_origin(p.url): p.type for p in portals}
+        self._lock = threading.Lock()
+        self.pages: List[Dict] = self._load_index()
+
+    def _load_index(self) -> List[Dict]:
+        index_file = os.path.join(self.fixture_dir, INDEX_FILE)
+        if not os.path.exists(index_file):
+            return []
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def record(self, url: str, page_html: str):
+        """保存一个页面"""
+        if not url or not url.startswith('http'):
+            return
+        with self._lock:
+            entry = next((p for p in self.pages if p['url'] == url), None)
+            if entry is None:
+                entry = {
+                    'url': url,
+                    'file': f"page_{len(self.pages):03d}.html",
+                    'type': self.site_types.get(_origin(url)),
+                }
+                self.pages.append(entry)
+            os.makedirs(self.fixture_dir, exist_ok=True)
+            with open(os.path.join(self.fixture_dir, entry['file']), 'w', encoding='utf-8') as f:
+                f.write(page_html)
+            with open(os.path.join(self.fixture_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+                json.dump(self.pages, f, ensure_ascii=False, indent=2)
+
+
+# 当前启用的录制器（未启用时为None）
+recorder: Optional[FixtureRecorder] = None
+
+
+def start_recording(fixture_dir: str, portals=()):
+    """启用页面录制"""
+    global recorder
+    recorder = FixtureRecorder(fixture_dir, portals)
+    print(f"🎞️  页面录制已启用: {fixture_dir}")
+
+
+def record_page(driver):
+    """录制浏览器当前页面（未启用录制时不做任何事）"""
+    if recorder is None:
+        return
+    try:
+        recorder.record(driver.current_url, driver.page_source)
+    except Exception as e:
+        print(f"⚠️  录制页面失败: {e}")
+
+
+def record_response(response):
+    """录制HTTP引擎收到的页面（未启用录制时不做任何事）"""
+    if recorder is not None:
+        recorder.record(response.url, response.text)
+
+
+def scale_rows(page_html: str, portal_type: Optional[str], rows: int) -> str:
+    """
+    复制稿件行，将表格扩充到至少 rows 行
+
+    复制的行在稿件ID后追加序号，保证每行ID唯一。
+    """
+    if not rows or not portal_type:
+        return page_html
+    doc = lxml_html.fromstring(page_html)
+    if portal_type == 'scholarone':
+        data_rows = doc.xpath("//table//tr[@class='data' or @class='data-even' or @class='data-odd']") or \
+            [r for r in doc.xpath("//table//tr[td]") if len(r.xpath('./td')) >= 5]
+        id_column = 3
+    else:
+        data_rows = doc.xpath("//table//tr[contains(@class, 'data')]")
+        id_column = 0
+    data_rows = [r for r in data_rows if len(r.xpath('./td')) > id_column]
+    if not data_rows or len(data_rows) >= rows:
+        return page_html
+
+    last = data_rows[-1]
+    for n in range(rows - len(data_rows)):
+        template = data_rows[n % len(data_rows)]
+        clone = copy.deepcopy(template)
+        clone.tail = last.tail
+        _suffix_text(clone.xpath('./td')[id_column], f"-{n + 1}")
+        last.addnext(clone)
+        last = clone
+    return lxml_html.tostring(doc, encoding='unicode', doctype='<!DOCTYPE html>')
+
+
+def _suffix_text(cell, suffix: str):
+    """在单元格第一段非空文本后追加后缀"""
+    for node in cell.iter():
+        if node.text and node.text.strip():
+            node.text = node.text.rstrip() + suffix
+            return
+    cell.text = (cell.text or '') + suffix
+
+
+def _synthetic_row(portal_type: str, n: int) -> str:
+    status = SYNTHETIC_STATUSES[n % len(SYNTHETIC_STATUSES)]
+    title = f"Synthetic Manuscript {n + 1} on Adaptive Control of Benchmark Systems"
+    if portal_type == 'scholarone':
+        return (f'<tr class="data"><td><a href="#">View Submission</a></td><td><img alt=""></td>'
+                f'<td><span>ADM: Staff</span><span>{status}</span></td>'
+                f'<td>TBENCH-2024-{n + 1:05d}</td><td><a href="#">{title}</a></td></tr>')
+    return f'<tr class="data"><td>BENCH-D-24-{n + 1:05d}</td><td>{title}</td><td>{status}</td></tr>'
+
+
+def synthetic_site(portal_type: str, rows: int) -> Dict[str, str]:
+    """
+    生成合成站点页面（地址路径 → HTML）
+
+    页面结构与 monitor.py 和 http_engine.py 中的定位方式一致：
+    登录页（POST /login 后跳转到登录后首页）、ScholarOne作者仪表板、Editorial Manager主菜单和投稿列表。
+    """
+    rows = rows or 10
+    if portal_type == 'scholarone':
+        table = ''.join(_synthetic_row(portal_type, n) for n in range(rows))
+        return {
+            '/login': ('<!DOCTYPE html><html><head><title>Log In</title></head><body>'
+                       '<form method="post" action="/login">'
+                       '<input type="text" id="login" name="login"><input type="password" id="password" name="password">'
+                       '<button type="submit">Log In</button></form></body></html>'),
+            '/home': ('<!DOCTYPE html><html><head><title>ScholarOne Manuscripts</title></head><body>'
+                      '<a href="/author">Author</a></body></html>'),
+            '/author': ('<!DOCTYPE html><html><head><title>ScholarOne Manuscripts - Author Dashboard</title></head>'
+                        '<body><table><tr><th></th><th></th><th>STATUS</th><th>ID</th><th>TITLE</th></tr>'
+                        f'{table}</table></body></html>'),
+            'after_login': '/home',
+        }
+
+    pages = {
+        '/login': ('<!DOCTYPE html><html><head><title>Editorial Manager Login</title></head><body>'
+                   '<form method="post" action="/login">'
+                   '<input type="text" name="login"><input type="password" name="password">'
+                   '<input type="submit" value="Login"></form></body></html>'),
+        '/menu': ('<!DOCTYPE html><html><head><title>Author Main Menu</title></head><body>'
+                  + ''.join(f'<a href="/folder?id={i}">{name}</a><br>' for i, name in enumerate(SYNTHETIC_FOLDERS))
+                  + '</body></html>'),
+        'after_login': '/menu',
+    }
+    per_folder = max(1, rows // len(SYNTHETIC_FOLDERS))
+    for i, name in enumerate(SYNTHETIC_FOLDERS):
+        table = ''.join(_synthetic_row(portal_type, i * per_folder + n) for n in range(per_folder))
+        pages[f'/folder?id={i}'] = (f'<!DOCTYPE html><html><head><title>{name}</title></head>'
+                                     f'<body><table><tr><th>ID</th><th>Title</th><th>Status</th></tr>{table}</table>'
+                                     '</body></html>')
+    return pages
+
+
+def recorded_sites(fixture_dir: str, rows: int = 0) -> List[Dict]:
+    """
+    读取录制的夹具，按站点分组
+
+    Returns:
+        [{'origin': 录制时的站点, 'type': 平台类型, 'pages': {路径: HTML}, 'login': 登录页路径}]
+    """
+    with open(os.path.join(fixture_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    sites: Dict[str, Dict] = {}
+    for entry in index:
+        origin = _origin(entry['url'])
+        site = sites.setdefault(origin, {'origin': origin, 'type': entry.get('type'), 'pages': {}, 'login': None})
+        with open(os.path.join(fixture_dir, entry['file']), 'r', encoding='utf-8') as f:
+            page_html = f.read()
+        path = _path(entry['url'])
+        site['pages'][path] = scale_rows(page_html, entry.get('type'), rows)
+        if site['login'] is None:
+            site['login'] = path
+        # 登录表单提交后跳转到登录页之后录制的第一个页面
+        if 'after_login' not in site['pages'] and path != site['login']:
+            site['pages']['after_login'] = path
+        site['type'] = site['type'] or entry.get('type')
+    return list(sites.values())
+
+
+class ReplayServer:
+    """夹具回放服务器
+
+    每个站点使用独立端口，页面中的相对地址无需改写；录制时的绝对地址替换为本地地址。
+    任何路径的POST请求（登录表单提交）都跳转到登录后首页。
+    """
+
+    def __init__(self, pages: Dict[str, str], portal_type: str, origin: str = '', login_path: str = '/login'):
+        self.pages = pages
+        self.type = portal_type
+        self.origin = origin
+        self.login_path = login_path
+        self.request_count = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def login_url(self) -> str:
+        return self.url + self.login_path
+
+    def start(self) -> 'ReplayServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _page(self, path: str) -> Optional[bytes]:
+        page_html = self.pages.get(path) or self.pages.get(path.split('?')[0])
+        if page_html is None:
+            return None
+        if self.origin:
+            page_html = page_html.replace(self.origin, self.url)
+        return page_html.encode('utf-8')
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.request_count += 1
+                body = server._page(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                server.request_count += 1
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                self.send_response(303)
+                self.send_header('Location', server.pages.get('after_login', server.login_path))
+                self.send_header('Set-Cookie', 'fixture_session=1; Path=/')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class WebhookStandIn:
+    """本地 Webhook 接收服务
+
+    记录收到的每个POST请求的JSON内容，delay 秒后返回 status 状态码，用于模拟慢速或出错的渠道；
+    前 fail_first 个请求返回500，用于模拟暂时不可用的服务。
+    """
+
+    def __init__(self, delay: float = 0, status: int = 200, fail_first: int = 0):
+        self.delay = delay
+        self.status = status
+        self.fail_first = fail_first
+        self.received: List[Dict] = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/hook"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self) -> 'WebhookStandIn':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                server.received.append(json.loads(body or b'null'))
+                time.sleep(server.delay)
+                status = 500 if len(server.received) <= server.fail_first else server.status
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                except OSError:
+                    pass  # 客户端已超时断开
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class SmtpStandIn:
+    """本地SMTP接收服务
+
+    只实现发送邮件需要的命令（不加密、不提供AUTH，对应 SMTP_SECURITY=none），
+    记录收到的每封邮件和建立过的连接数；drop_connections() 从服务端断开所有会话，用于测试重连。
+    """
+
+    def __init__(self):
+        self.received: List[Dict] = []
+        self.connections = 0
+        self._sockets = []
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self) -> 'SmtpStandIn':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.drop_connections()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def drop_connections(self):
+        """断开所有已建立的会话（客户端下次发送时才会发现）"""
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+
+    def _handler(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str):
+                self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+            def handle(self):
+                with server._lock:
+                    server.connections += 1
+                    server._sockets.append(self.request)
+                sender, recipients = None, []
+                try:
+                    self.reply('220 localhost SMTP stand-in')
+                    for raw in self.rfile:
+                        command = raw.decode('utf-8', 'replace').strip()
+                        verb = command[:4].upper()
+                        if verb == 'EHLO':
+                            self.reply('250 localhost')
+                        elif verb in ('HELO', 'NOOP', 'RSET'):
+                            self.reply('250 OK')
+                            if verb == 'RSET':
+                                sender, recipients = None, []
+                        elif verb == 'MAIL':
+                            sender, recipients = command.split(':', 1)[1].strip(), []
+                            self.reply('250 OK')
+                        elif verb == 'RCPT':
+                            recipients.append(command.split(':', 1)[1].strip())
+                            self.reply('250 OK')
+                        elif verb == 'DATA':
+                            self.reply('354 End data with <CR><LF>.<CR><LF>')
+                            lines = []
+                            for data in self.rfile:
+                                if data in (b'.\r\n', b'.\n'):
+                                    break
+                                lines.append(data)
+                            server.received.append({'from': sender, 'to': recipients,
+                                                    'data': b''.join(lines).decode('utf-8', 'replace')})
+                            sender, recipients = None, []
+                            self.reply('250 OK')
+                        elif verb == 'QUIT':
+                            self.reply('221 Bye')
+                            return
+                        else:
+                            self.reply('502 Command not implemented')
+                except OSError:
+                    pass  # 会话被 drop_connections() 断开
+
+        return Handler
+
+
+def start_replay(fixture_dir: Optional[str] = None, rows: int = 0) -> List[ReplayServer]:
+    """
+    启动回放服务器
+
+    Args:
+        fixture_dir: 录制的夹具目录，为空时使用合成的ScholarOne和Editorial Manager站点
+        rows: 仪表板和投稿列表扩充到的行数
+
+    Returns:
+        已启动的回放服务器列表
+    """
+    if fixture_dir:
+        servers = [ReplayServer(site['pages'], site['type'], site['origin'], site['login'])
+                   for site in recorded_sites(fixture_dir, rows) if site['type']]
+    else:
+        servers = [ReplayServer(synthetic_site(portal_type, rows), portal_type)
+                   for portal_type in ('scholarone', 'editorial_manager')]
+    for server in servers:
+        server.start()
+    return servers
+
+
+def replay_portals(servers: List[ReplayServer]) -> List[Dict]:
+    """回放服务器对应的平台配置项（可直接作为 PORTALS_JSON 使用）"""
+    return [
+        {'name': f"Replay-{i + 1}", 'type': server.type, 'url': server.login_url,
+         'username': 'fixture@example.com', 'password': 'fixture'}
+        for i, server in enumerate(servers)
+    ]
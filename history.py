@@ -0,0 +1,152 @@
+"""
+稿件状态历史模块
+记录每次状态变化，提供稿件状态时间线和各状态停留时间查询，
+并增量维护各期刊每个状态的停留天数统计（中位数可直接读取，无需重新扫描历史）
+"""
+import bisect
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from locks import file_lock
+
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value, TIME_FORMAT)
+
+
+def _days_between(start: str, end: str) -> float:
+    return (_parse_time(end) - _parse_time(start)).total_seconds() / 86400
+
+
+class StatusHistory:
+    """状态历史
+
+    history_file 为只追加的JSONL文件，每行一次状态变化（新稿件的 from 为 null）。
+    stats_file 保存增量维护的统计：
+    - open：每篇稿件当前状态及进入时间
+    - dwell：按 "期刊（稿件来源）|状态" 保存已结束的停留天数（有序列表，插入时用二分查找保持有序）
+    """
+
+    def __init__(self, history_file: str, stats_file: str):
+        self.history_file = history_file
+        self.stats_file = stats_file
+        self.open: Dict[str, Dict] = {}
+        self.dwell: Dict[str, List[float]] = {}
+        self._load_stats()
+
+    @staticmethod
+    def _stat_key(journal: str, status: str) -> str:
+        return f"{journal}|{status}"
+
+    def _load_stats(self):
+        if not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+            self.open = stats.get('open', {})
+            self.dwell = stats.get('dwell', {})
+        except Exception as e:
+            print(f"⚠️  读取状态统计失败: {e}")
+
+    def _save_stats(self):
+        tmp_file = f"{self.stats_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'open': self.open, 'dwell': self.dwell}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.stats_file)
+
+    def record(self, transitions: List[Dict], timeout: float = 60):
+        """
+        记录一批状态变化并更新统计
+
+        Args:
+            transitions: [{'key', 'journal', 'old_status', 'new_status', 'changed_at'}]，
+                         新稿件的 old_status 为None
+            timeout: 等待历史文件锁的最长时间（秒）
+        """
+        if not transitions:
+            return
+        # 其他进程可能同时记录，在锁内重新读取统计后再更新
+        with file_lock(self.history_file, timeout):
+            self._load_stats()
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                for t in transitions:
+                    f.write(json.dumps({'k': t['key'], 'j': t['journal'], 'from': t['old_status'],
+                                        'to': t['new_status'], 't': t['changed_at']},
+                                       ensure_ascii=False, separators=(',', ':')) + '\n')
+
+            for t in transitions:
+                previous = self.open.get(t['key'])
+                # 开始记录历史之前就已存在的稿件，进入当前状态的时间未知，不计入停留统计
+                if previous and previous['status'] == t['old_status']:
+                    days = round(_days_between(previous['since'], t['changed_at']), 3)
+                    bisect.insort(self.dwell.setdefault(self._stat_key(previous['journal'], previous['status']), []), days)
+                self.open[t['key']] = {'status': t['new_status'], 'since': t['changed_at'], 'journal': t['journal']}
+            self._save_stats()
+
+    def timeline(self, key: str) -> List[Dict]:
+        """
+        稿件的状态时间线
+
+        Returns:
+            [{'status', 'since', 'until', 'days'}]，当前状态的 until 为None、days 计算到现在
+        """
+        events = []
+        if os.path.exists(self.history_file):
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    # 先按文本粗筛，只解析可能属于该稿件的行
+                    if f'"k":{json.dumps(key, ensure_ascii=False)}' not in line:
+                        continue
+                    event = json.loads(line)
+                    if event['k'] == key:
+                        events.append(event)
+
+        now = datetime.now().strftime(TIME_FORMAT)
+        timeline = []
+        for i, event in enumerate(events):
+            until = events[i + 1]['t'] if i + 1 < len(events) else None
+            timeline.append({
+                'status': event['to'],
+                'since': event['t'],
+                'until': until,
+                'days': round(_days_between(event['t'], until or now), 3),
+            })
+        return timeline
+
+    def time_in_status(self, key: str) -> Dict[str, float]:
+        """稿件在每个状态累计停留的天数（当前状态计算到现在）"""
+        totals: Dict[str, float] = {}
+        for entry in self.timeline(key):
+            totals[entry['status']] = round(totals.get(entry['status'], 0) + entry['days'], 3)
+        return totals
+
+    def median_days(self, journal: str, status: str) -> Optional[float]:
+        """某期刊在某状态停留天数的中位数（常数时间），没有样本时返回None"""
+        samples = self.dwell.get(self._stat_key(journal, status))
+        if not samples:
+            return None
+        mid = len(samples) // 2
+        if len(samples) % 2:
+            return samples[mid]
+        return round((samples[mid - 1] + samples[mid]) / 2, 3)
+
+    def summary(self) -> List[Dict]:
+        """所有期刊、状态的停留天数统计"""
+        result = []
+        for stat_key in sorted(self.dwell):
+            journal, status = stat_key.split('|', 1)
+            result.append({'journal': journal, 'status': status, 'count': len(self.dwell[stat_key]),
+                           'median_days': self.median_days(journal, status)})
+        return result
+
+    def clear(self):
+        for path in (self.history_file, self.stats_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self.open = {}
+        self.dwell = {}
@@ -0,0 +1,334 @@
+"""
+HTTP抓取引擎模块
+不启动浏览器，直接通过HTTP会话登录并下载仪表板页面，用lxml解析稿件表格。
+遇到需要JavaScript渲染的页面、登录失败或未识别到稿件表格（且没有空状态提示）时抛出 HttpFallbackError，由调用方切换到浏览器模式
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree, html as lxml_html
+import fixtures
+from models import Manuscript
+from scraping import (ELSEVIER_FOLDER_XPATH, is_empty_state, is_navigable, parse_scholarone_row,
+                      scholarone_skip_reason)
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 计算文本换行时视为块级的标签
+BLOCK_TAGS = {'br', 'div', 'p', 'li', 'tr', 'table'}
+
+
+class HttpFallbackError(Exception):
+    """HTTP引擎无法完成抓取，需要回退到浏览器模式"""
+
+
+class JSOnlyPageError(HttpFallbackError):
+    """页面依赖JavaScript渲染"""
+
+
+class LoginFailedError(HttpFallbackError):
+    """HTTP登录失败"""
+
+
+def inner_text(element) -> str:
+    """近似浏览器 innerText：块级元素换行，忽略脚本和样式，合并空白"""
+    chunks = []
+
+    def walk(node, is_root=False):
+        tag = node.tag if isinstance(node.tag, str) else ''
+        if tag not in ('script', 'style') and tag:
+            if tag in BLOCK_TAGS:
+                chunks.append('\n')
+            if node.text:
+                chunks.append(node.text)
+            for child in node:
+                walk(child)
+            if tag in BLOCK_TAGS and tag != 'br':
+                chunks.append('\n')
+        if not is_root and node.tail:
+            chunks.append(node.tail)
+
+    walk(element, is_root=True)
+    lines = (' '.join(line.split()) for line in ''.join(chunks).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def page_text(doc) -> str:
+    """页面正文的 innerText"""
+    body = doc.find('body')
+    return inner_text(body) if body is not None else ''
+
+
+def looks_js_only(doc) -> bool:
+    """判断页面内容是否依赖JavaScript渲染"""
+    if doc.xpath('//noscript[contains(translate(., "JAVASCRIPT", "javascript"), "javascript")]'):
+        return True
+    return len(page_text(doc)) < 50 and bool(doc.xpath('//script'))
+
+
+class HttpFetchEngine:
+    """HTTP抓取引擎
+
+    每个实例对应一个平台账户，内部使用带连接池的 requests.Session，
+    登录、仪表板和各投稿列表请求复用同一组keep-alive连接。
+    """
+
+    def __init__(self, label: str, timeout: float = 20, pool_size: int = 4):
+        self.label = label
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        self.request_count = 0
+        self.elapsed = 0.0
+
+    def close(self):
+        self.session.close()
+
+    def _request(self, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        self.request_count += 1
+        self.elapsed += time.perf_counter() - start
+        response.raise_for_status()
+        fixtures.record_response(response)
+        try:
+            doc = lxml_html.fromstring(response.content, base_url=response.url)
+        except (etree.ParserError, ValueError) as e:
+            # 空响应或无法解析的内容（lxml 对空文档抛出 ParserError）
+            raise HttpFallbackError(f"无法解析页面 {response.url}: {e}")
+        return response, doc
+
+    def get(self, url: str):
+        """GET页面，返回 (response, 解析后的文档)"""
+        return self._request('GET', url)
+
+    def login(self, login_url: str, username: str, password: str, is_logged_in) -> Tuple[str, object]:
+        """
+        提交登录表单
+
+        Args:
+            login_url: 登录页面地址
+            username: 用户名
+            password: 密码
+            is_logged_in: 接收文档、判断是否处于登录状态的函数
+
+        Returns:
+            (登录后页面URL, 登录后页面文档)
+        """
+        response, doc = self.get(login_url)
+
+        forms = [f for f in doc.forms if f.xpath('.//input[@type="password"]')]
+        if not forms:
+            raise JSOnlyPageError("登录页面没有可提交的密码表单")
+        form = forms[0]
+
+        fields = {}
+        username_name = None
+        password_name = None
+        for inp in form.inputs:
+            name = inp.get('name')
+            if not name:
+                continue
+            input_type = (inp.get('type') or 'text').lower() if inp.tag == 'input' else inp.tag
+            if input_type == 'password' and password_name is None:
+                password_name = name
+            elif input_type in ('text', 'email') and username_name is None:
+                username_name = name
+            elif input_type in ('hidden',):
+                fields[name] = inp.get('value', '')
+            elif input_type == 'submit' and name not in fields:
+                fields[name] = inp.get('value', '')
+
+        if not username_name or not password_name:
+            raise JSOnlyPageError("登录表单缺少用户名或密码输入框")
+
+        fields[username_name] = username
+        fields[password_name] = password
+
+        action = urljoin(response.url, form.get('action') or response.url)
+        if (form.get('method') or 'get').lower() == 'post':
+            response, doc = self._request('POST', action, data=fields)
+        else:
+            response, doc = self._request('GET', action, params=fields)
+
+        if not is_logged_in(doc):
+            if looks_js_only(doc):
+                raise JSOnlyPageError("登录后页面依赖JavaScript渲染")
+            raise LoginFailedError("登录后仍停留在登录页面")
+
+        print(f"✅ [{self.label}] HTTP登录成功")
+        return response.url, doc
+
+    def summary(self) -> str:
+        return f"{self.request_count} 次HTTP请求，耗时 {self.elapsed:.1f}s"
+
+
+def _link_href(doc, xpath: str) -> Optional[str]:
+    """查找第一个可直接访问的链接地址"""
+    for link in doc.xpath(xpath):
+        href = (link.get('href') or '').strip()
+        if href and not href.lower().startswith('javascript:') and href != '#':
+            return urljoin(doc.base_url or '', href)
+    return None
+
+
+def _title(doc) -> str:
+    titles = doc.xpath('//title/text()')
+    return titles[0].strip() if titles else ''
+
+
+def scholarone_logged_in(doc) -> bool:
+    """ScholarOne页面是否处于登录状态"""
+    if doc.xpath('//input[@type="password"]'):
+        return False
+    title = _title(doc)
+    return "ScholarOne" in title or "Manuscripts" in title
+
+
+def editorial_manager_logged_in(doc) -> bool:
+    """Editorial Manager页面是否处于登录状态"""
+    if doc.xpath('//input[@type="password"]'):
+        return False
+    title = _title(doc)
+    return "Author" in title or "Main Menu" in title
+
+
+def scholarone_rows(doc) -> List[Dict]:
+    """从文档中提取ScholarOne稿件行，结构与 scraping.extract_scholarone_rows 相同"""
+    rows = doc.xpath("//table//tr[@class='data' or @class='data-even' or @class='data-odd']")
+    if not rows:
+        rows = doc.xpath("//table//tr[contains(@class, 'manuscript')]")
+    if not rows:
+        rows = [r for r in doc.xpath("//table//tr[td]") if len(r.xpath('.//td')) >= 3]
+
+    result = []
+    for row in rows:
+        cells = row.xpath('.//td')
+        result.append({
+            'cell_count': len(cells),
+            'cells': [{
+                'text': inner_text(cell),
+                'html': ''.join(lxml_html.tostring(c, encoding='unicode') for c in cell)[:100],
+                'status_items': [inner_text(e) for e in cell.xpath('.//a | .//button | .//span')],
+                'children': [inner_text(e) for e in cell.xpath('.//*')],
+                'blocks': [inner_text(e) for e in cell.xpath('.//a | .//span | .//div')],
+            } for cell in cells[:5]],
+        })
+    return result
+
+
+def editorial_manager_rows(doc) -> List[List[str]]:
+    """从文档中提取Editorial Manager投稿列表行"""
+    return [
+        [inner_text(td) for td in row.xpath('.//td')]
+        for row in doc.xpath("//table//tr[contains(@class, 'data')]")
+    ]
+
+
+def fetch_scholarone(login_url: str, username: str, password: str, timeout: float = 20,
+                     label: str = 'IEEE') -> List[Manuscript]:
+    """
+    通过HTTP获取ScholarOne稿件列表
+
+    Returns:
+        与 JournalMonitor.fetch_ieee_manuscripts 相同结构的稿件列表
+    """
+    engine = HttpFetchEngine(label, timeout)
+    try:
+        _, doc = engine.login(login_url, username, password, scholarone_logged_in)
+
+        author_href = _link_href(doc, "//a[normalize-space(text())='Author']") or \
+            _link_href(doc, "//a[contains(text(), 'Author') or contains(@href, 'author')]")
+        if not author_href:
+            raise JSOnlyPageError("Author入口需要JavaScript跳转")
+
+        response, doc = engine.get(author_href)
+        rows = scholarone_rows(doc)
+        if not rows and looks_js_only(doc):
+            raise JSOnlyPageError("作者仪表板依赖JavaScript渲染")
+
+        manuscripts = []
+        for row in rows:
+            parsed = parse_scholarone_row(row)
+            if parsed is None:
+                continue
+            status, manuscript_id, title = parsed
+            # 过滤掉空行、表头行或非稿件行
+            if scholarone_skip_reason(status, manuscript_id, title):
+                continue
+            manuscripts.append(Manuscript(
+                id=manuscript_id,
+                title=title,
+                status=status,
+                source='IEEE',
+                url=response.url
+            ))
+            print(f"  ✓ [{status}] {manuscript_id}: {title}")
+
+        # 没有识别到稿件表格时不能当作"没有稿件"，否则会删除该账户已保存的全部稿件
+        if not manuscripts and not is_empty_state(page_text(doc)):
+            raise HttpFallbackError("作者仪表板中未识别到稿件表格")
+
+        print(f"📡 [{label}] HTTP引擎获取 {len(manuscripts)} 篇稿件，{engine.summary()}")
+        return manuscripts
+    except requests.RequestException as e:
+        raise HttpFallbackError(f"HTTP请求失败: {e}")
+    finally:
+        engine.close()
+
+
+def fetch_editorial_manager(login_url: str, username: str, password: str, timeout: float = 20,
+                            label: str = 'Elsevier') -> List[Manuscript]:
+    """
+    通过HTTP获取Editorial Manager稿件列表
+
+    Returns:
+        与 JournalMonitor.fetch_elsevier_manuscripts 相同结构的稿件列表
+    """
+    engine = HttpFetchEngine(label, timeout)
+    try:
+        page_url, doc = engine.login(login_url, username, password, editorial_manager_logged_in)
+
+        hrefs = []
+        for link in doc.xpath(ELSEVIER_FOLDER_XPATH):
+            href = (link.get('href') or '').strip()
+            if not is_navigable(href):
+                raise JSOnlyPageError("投稿列表入口需要JavaScript跳转")
+            href = urljoin(page_url, href)
+            if href not in hrefs:
+                hrefs.append(href)
+        if not hrefs and not is_empty_state(page_text(doc)):
+            raise HttpFallbackError("主菜单中未识别到投稿列表入口")
+
+        manuscripts = []
+        for href in hrefs:
+            response, folder = engine.get(href)
+            if not folder.xpath('//table') and looks_js_only(folder):
+                raise JSOnlyPageError("投稿列表依赖JavaScript渲染")
+            rows = editorial_manager_rows(folder)
+            if not rows and not is_empty_state(page_text(folder)):
+                raise HttpFallbackError("投稿列表中未识别到稿件表格")
+            for cells in rows:
+                if len(cells) >= 3:
+                    manuscript_id, title, status = cells[0], cells[1], cells[2]
+                    manuscripts.append(Manuscript(
+                        id=manuscript_id,
+                        title=title,
+                        status=status,
+                        source='Elsevier',
+                        url=response.url
+                    ))
+                    print(f"  ✓ {manuscript_id}: {title} - {status}")
+
+        print(f"📡 [{label}] HTTP引擎获取 {len(manuscripts)} 篇稿件，{engine.summary()}")
+        return manuscripts
+    except requests.RequestException as e:
+        raise HttpFallbackError(f"HTTP请求失败: {e}")
+    finally:
+        engine.close()
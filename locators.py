@@ -0,0 +1,161 @@
+"""
+自适应定位器缓存模块
+按平台和页面元素记录上次成功的定位方式，下次运行优先尝试，
+连续失败的记录会自动失效
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# 定位方式：(名称, 接收driver并返回元素或None的查找函数)
+Strategy = Tuple[str, Callable]
+
+
+def by(by_type: str, value: str) -> Strategy:
+    """由Selenium定位方式构造查找策略（不等待，找不到返回None）"""
+    def finder(driver):
+        elements = driver.find_elements(by_type, value)
+        return elements[0] if elements else None
+    return f"{by_type}={value}", finder
+
+
+class LocatorRegistry:
+    """定位器注册表
+
+    每条记录保存某个平台页面元素最近一次成功的定位方式。
+    当缓存的定位方式连续 max_failures 次未命中时记录失效，由新的成功方式替换；
+    超过 ttl_days 天未命中的记录在加载时丢弃。
+    """
+
+    def __init__(self, registry_file: str, max_failures: int = 2, ttl_days: float = 30):
+        self.registry_file = registry_file
+        self.max_failures = max(1, max_failures)
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.registry_file):
+            return {}
+        try:
+            with open(self.registry_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"⚠️  读取定位器缓存失败: {e}")
+            return {}
+        now = time.time()
+        valid = {}
+        for key, entry in entries.items():
+            # 逐条检查，格式错误（如手工修改过）的记录单独丢弃，不影响其他记录
+            try:
+                last_success = datetime.strptime(entry['last_success'], '%Y-%m-%d').timestamp()
+                if not isinstance(entry.get('strategy'), str) or not isinstance(entry.get('failures'), int):
+                    raise ValueError('缺少 strategy 或 failures 字段')
+            except Exception as e:
+                print(f"⚠️  忽略无效的定位器缓存记录 {key}: {e!r}")
+                continue
+            if now - last_success <= self.ttl_seconds:
+                valid[key] = entry
+        return valid
+
+    def save(self):
+        """将有变化的注册表写回文件"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self.entries)
+            self._dirty = False
+        try:
+            registry_dir = os.path.dirname(self.registry_file)
+            if registry_dir:
+                os.makedirs(registry_dir, exist_ok=True)
+            tmp_file = f"{self.registry_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.registry_file)
+        except Exception as e:
+            print(f"⚠️  保存定位器缓存失败: {e}")
+
+    @staticmethod
+    def _key(portal: str, element: str) -> str:
+        return f"{portal}:{element}"
+
+    def ordered(self, portal: str, element: str, strategies: Sequence[Strategy]) -> List[Strategy]:
+        """按缓存结果排序定位方式：上次成功的方式排在最前"""
+        entry = self.entries.get(self._key(portal, element))
+        if not entry:
+            return list(strategies)
+        cached = [s for s in strategies if s[0] == entry['strategy']]
+        return cached + [s for s in strategies if s[0] != entry['strategy']]
+
+    def record(self, portal: str, element: str, strategy_name: Optional[str]):
+        """
+        记录一次查找结果
+
+        命中时间只精确到天，文件在内容真正变化时才会改写，避免每次运行都产生差异。
+
+        Args:
+            strategy_name: 命中的定位方式名称，全部未命中时为None
+        """
+        key = self._key(portal, element)
+        today = datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry['strategy'] == strategy_name:
+                updated = {'strategy': strategy_name, 'failures': 0, 'last_success': today}
+            else:
+                if entry:
+                    failures = entry['failures'] + 1
+                    if failures < self.max_failures:
+                        self.entries[key] = {**entry, 'failures': failures}
+                        self._dirty = True
+                        return
+                    print(f"♻️  定位器缓存失效: {key} ({entry['strategy']})")
+                if strategy_name is None:
+                    if self.entries.pop(key, None) is not None:
+                        self._dirty = True
+                    return
+                updated = {'strategy': strategy_name, 'failures': 0, 'last_success': today}
+            if updated != entry:
+                self.entries[key] = updated
+                self._dirty = True
+
+    def find(self, driver, waiter, portal: str, element: str, strategies: Sequence[Strategy],
+             timeout: Optional[float] = None):
+        """
+        按缓存顺序查找元素
+
+        每轮轮询依次尝试所有定位方式；缓存命中时只需一次查找。
+
+        Args:
+            waiter: PageWaiter，用于等待并记录耗时
+            portal: 平台名称
+            element: 页面元素名称
+            strategies: 候选定位方式（默认顺序）
+            timeout: 等待超时时间
+
+        Returns:
+            (命中的定位方式名称, 元素)，全部未命中时返回 (None, None)
+        """
+        ordered = self.ordered(portal, element, strategies)
+        lookups = 0
+
+        def condition(d):
+            nonlocal lookups
+            for name, finder in ordered:
+                lookups += 1
+                found = finder(d)
+                if found is not None:
+                    return name, found
+            return False
+
+        result = waiter.until(element, condition, timeout, required=False)
+        name, found = result if result else (None, None)
+        self.record(portal, element, name)
+        print(f"🔎 {element}: {lookups} 次查找" + (f"，命中 {name}" if name else "，未找到"))
+        return name, found
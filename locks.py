@@ -0,0 +1,66 @@
+"""
+文件锁模块
+多个监控进程共用同一份数据时，用 <文件>.lock 上的排他锁保护读-改-写过程
+"""
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 60):
+    """
+    获取 path 对应的排他文件锁
+
+    Args:
+        path: 被保护的文件，锁文件为 <path>.lock
+        timeout: 等待锁的最长时间（秒），超时抛出 TimeoutError
+    """
+    lock_dir = os.path.dirname(path)
+    if lock_dir:
+        os.makedirs(lock_dir, exist_ok=True)
+    with open(f"{path}.lock", 'a+') as f:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(f):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"等待文件锁超时: {path}.lock")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+@contextmanager
+def file_locks(paths: Iterable[str], timeout: float = 60):
+    """按固定顺序获取多个文件锁，避免不同进程交叉加锁导致死锁"""
+    with ExitStack() as stack:
+        for path in sorted(set(paths)):
+            stack.enter_context(file_lock(path, timeout))
+        yield
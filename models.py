@@ -0,0 +1,107 @@
+"""
+稿件数据模型
+抓取、状态对比和邮件通知之间传递的稿件与状态变化记录。
+使用带 __slots__ 的不可变数据类，来源、平台和状态等重复出现的字符串统一驻留（sys.intern），
+同一个状态值在所有稿件之间共享一个字符串对象
+"""
+import sys
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+
+def manuscript_key(source: str, manuscript_id: str) -> str:
+    """构建稿件唯一键"""
+    return f"{source}_{manuscript_id}"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+@dataclass(frozen=True, slots=True)
+class Manuscript:
+    """一篇稿件的当前状态"""
+
+    id: str
+    title: str
+    status: str
+    source: str
+    url: str = ''
+    # 所属平台账户名称，为空时与来源相同
+    portal: str = ''
+
+    def __post_init__(self):
+        object.__setattr__(self, 'status', _intern(self.status))
+        object.__setattr__(self, 'source', _intern(self.source))
+        object.__setattr__(self, 'portal', _intern(self.portal or self.source))
+
+    @property
+    def key(self) -> str:
+        """稿件唯一键（与存储中的键相同）"""
+        return manuscript_key(self.source, self.id)
+
+    def on_portal(self, portal: str) -> 'Manuscript':
+        """返回归属到指定平台账户的副本"""
+        return replace(self, portal=portal)
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> 'Manuscript':
+        """由存储记录或旧格式的字典构建"""
+        return cls(
+            id=record.get('id') or '',
+            title=record.get('title') or '未知标题',
+            status=record.get('status') or '未知状态',
+            source=record.get('source') or '未知来源',
+            url=record.get('url') or '',
+            portal=record.get('portal') or '',
+        )
+
+    def to_dict(self) -> Dict:
+        return {'id': self.id, 'title': self.title, 'status': self.status, 'source': self.source,
+                'portal': self.portal, 'url': self.url}
+
+
+@dataclass(frozen=True, slots=True)
+class StatusChange:
+    """一次状态变化（用于变化通知）"""
+
+    manuscript: Manuscript
+    old_status: str
+    changed_at: str
+
+    def __post_init__(self):
+        object.__setattr__(self, 'old_status', _intern(self.old_status))
+
+    @property
+    def new_status(self) -> str:
+        return self.manuscript.status
+
+    @property
+    def id(self) -> str:
+        return self.manuscript.id
+
+    @property
+    def title(self) -> str:
+        return self.manuscript.title
+
+    @property
+    def source(self) -> str:
+        return self.manuscript.source
+
+    @property
+    def portal(self) -> str:
+        return self.manuscript.portal
+
+    @property
+    def url(self) -> str:
+        return self.manuscript.url
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> 'StatusChange':
+        """由 to_dict 的结果重建"""
+        return cls(Manuscript.from_dict({**record, 'status': record.get('new_status') or record.get('status')}),
+                   record.get('old_status'), record.get('changed_at') or '')
+
+    def to_dict(self) -> Dict:
+        return {**self.manuscript.to_dict(), 'old_status': self.old_status, 'new_status': self.new_status,
+                'changed_at': self.changed_at}
@@ -3,16 +3,82 @@
 负责登录IEEE和Elsevier，获取稿件状态
 """
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import List, Dict
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 from config import Config
+import fixtures
+from driver_pool import DriverPool, apply_lean_options, block_lean_resources, reset_browser_state
+import http_engine
+from http_engine import HttpFallbackError
+from locators import LocatorRegistry, by
+from models import Manuscript, StatusChange
+from portals import PortalConfig
+from scraping import (
+    CommandCounter,
+    extract_scholarone_rows,
+    collect_scholarone_rows_dom,
+    parse_scholarone_row,
+    scholarone_skip_reason,
+    extract_elsevier_rows,
+    collect_elsevier_rows_dom,
+    extract_link_targets,
+    is_navigable,
+    is_empty_state,
+    ELSEVIER_FOLDER_XPATH,
+)
+from session_store import SessionStore
 from storage import ManuscriptStorage
-from notification import EmailNotifier
+from waits import PageWaiter
+from notification import NotificationQueue, create_notifiers
+from digest import ChangeDigest
+from outbox import NotificationOutbox
+
+
+class FetchError(Exception):
+    """平台抓取未完成（登录失败或页面提取出错），本次结果不能代表该平台的全部稿件"""
+
+
+def _find_login_button_by_text(driver):
+    """遍历所有按钮，按文本查找登录按钮"""
+    buttons = driver.find_elements(By.XPATH, "//button | //input[@type='submit'] | //input[@type='button']")
+    for btn in buttons:
+        btn_text = btn.text or btn.get_attribute('value') or ''
+        if 'log in' in btn_text.lower():
+            return btn
+    return None
+
+
+# ScholarOne页面元素的候选定位方式（默认顺序），实际顺序由定位器缓存决定
+IEEE_USERNAME_LOCATORS = [
+    by(By.ID, "login"),
+    by(By.NAME, "login"),
+    by(By.XPATH, "//input[@type='text' or @type='email']"),
+    by(By.XPATH, "//input[contains(@placeholder, 'User') or contains(@placeholder, 'ID')]"),
+]
+IEEE_PASSWORD_LOCATORS = [
+    by(By.ID, "password"),
+    by(By.NAME, "password"),
+    by(By.XPATH, "//input[@type='password']"),
+]
+IEEE_LOGIN_BUTTON_LOCATORS = [
+    # 方式1：通过按钮文本查找
+    by(By.XPATH, "//button[contains(text(), 'Log In')]"),
+    # 方式2：通过input value查找
+    by(By.XPATH, "//input[@value='Log In']"),
+    # 方式3：通过name属性查找
+    by(By.NAME, "login"),
+    # 方式4：查找所有button和input，然后过滤
+    ('scan_buttons', _find_login_button_by_text),
+]
+IEEE_AUTHOR_LOCATORS = [
+    by(By.LINK_TEXT, "Author"),
+    by(By.XPATH, "//a[contains(text(), 'Author') or contains(@href, 'author')]"),
+]
 
 
 class JournalMonitor:
@@ -20,12 +86,20 @@ class JournalMonitor:
     
     def __init__(self):
         self.config = Config
-        self.storage = ManuscriptStorage(Config.DATA_FILE)
-        self.notifier = EmailNotifier()
-        self.driver = None
+        self.storage = ManuscriptStorage.from_config(Config)
+        self.notifiers = create_notifiers(Config)
+        self.session_store = SessionStore(Config.SESSION_FILE, Config.SESSION_MAX_AGE_HOURS)
+        self.fetched_portals = set()
+        self.changed_manuscripts = []
+        self.is_daily_report = False
+        self.notifications = None
+        self.digest = ChangeDigest.from_config(Config)
+        self.outbox = NotificationOutbox.from_config(Config, [getattr(n, 'name', type(n).__name__) for n in self.notifiers])
+        self.locators = LocatorRegistry(Config.LOCATOR_FILE, Config.LOCATOR_MAX_FAILURES)
+        self.driver_pool = None
     
-    def _init_driver(self):
-        """初始化浏览器驱动"""
+    def _create_driver(self):
+        """创建一个浏览器驱动实例"""
         print("🌐 初始化浏览器...")
         
         chrome_options = Options()
@@ -38,386 +112,623 @@ class JournalMonitor:
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.implicitly_wait(10)
+        if self.config.LEAN_BROWSER:
+            # 精简模式：不下载图片、字体、音视频和统计脚本，DOM就绪即返回
+            apply_lean_options(chrome_options)
+        
+        driver = webdriver.Chrome(options=chrome_options)
+        # 不使用全局隐式等待：所有等待都通过 PageWaiter 的显式条件完成，
+        # 避免每次查找失败的备选定位方式都空等
+        driver.implicitly_wait(0)
         
-        print("✅ 浏览器初始化完成")
+        if self.config.LEAN_BROWSER:
+            block_lean_resources(driver)
+        
+        print(f"✅ 浏览器初始化完成{'（精简模式）' if self.config.LEAN_BROWSER else ''}")
+        return driver
+    
+    def _init_driver_pool(self):
+        """初始化浏览器驱动池（浏览器按需启动）"""
+        self.driver_pool = DriverPool(self._create_driver, self.config.DRIVER_POOL_SIZE, reset_browser_state)
+    
+    def _close_driver_pool(self):
+        """关闭驱动池中的所有浏览器"""
+        if self.driver_pool:
+            self.driver_pool.close_all()
+            self.driver_pool = None
     
-    def _close_driver(self):
-        """关闭浏览器"""
-        if self.driver:
-            self.driver.quit()
-            print("🔒 浏览器已关闭")
+    def _fetch_with_pool(self, portal: PortalConfig, fetch_func) -> List[Manuscript]:
+        """从驱动池借用一个浏览器执行抓取任务"""
+        with self.driver_pool.driver() as driver, CommandCounter(driver) as counter:
+            manuscripts = fetch_func(driver, portal)
+        print(f"📡 [{portal.name}] 共发出WebDriver命令 {counter.summary()}")
+        return manuscripts
+    
+    def _fetch_portal(self, portal: PortalConfig) -> List[Manuscript]:
+        """
+        按 FETCH_ENGINE 配置抓取单个平台
+        
+        auto 模式下优先使用HTTP引擎，只有遇到依赖JavaScript的页面或HTTP登录失败时
+        才从驱动池借用浏览器，因此浏览器只会在确实需要时启动。
+        """
+        if portal.type == 'scholarone':
+            http_fetch, selenium_fetch = http_engine.fetch_scholarone, self.fetch_ieee_manuscripts
+        else:
+            http_fetch, selenium_fetch = http_engine.fetch_editorial_manager, self.fetch_elsevier_manuscripts
+        
+        manuscripts = None
+        engine = self.config.FETCH_ENGINE
+        if engine in ('http', 'auto'):
+            try:
+                print(f"\n📚 [{portal.name}] 使用HTTP引擎获取稿件状态...")
+                manuscripts = http_fetch(portal.url, portal.username, portal.password,
+                                         self.config.HTTP_TIMEOUT, label=portal.name)
+            except HttpFallbackError as e:
+                if engine == 'http':
+                    print(f"❌ [{portal.name}] HTTP引擎抓取失败: {e}")
+                    raise FetchError(f"{portal.name} HTTP引擎抓取失败") from e
+                print(f"↩️  [{portal.name}] HTTP引擎无法完成抓取（{e}），切换到浏览器模式")
+        
+        if manuscripts is None:
+            manuscripts = self._fetch_with_pool(portal, selenium_fetch)
+        
+        return [manuscript.on_portal(portal.name) for manuscript in manuscripts]
     
-    def fetch_ieee_manuscripts(self) -> List[Dict]:
+    def fetch_all_manuscripts(self) -> List[Manuscript]:
         """
-        获取IEEE稿件列表
+        并发获取所有平台的稿件
+        
+        各平台账户在线程池中并发抓取（并发数由 FETCH_CONCURRENCY 限制，
+        浏览器模式下同时运行的浏览器数由 DRIVER_POOL_SIZE 限制），
+        总耗时随并发数而非账户数增长。结果按平台配置顺序合并。
+        抓取成功的平台名称记录在 fetched_portals 中。
         
         Returns:
-            稿件列表
+            所有平台的稿件列表
         """
-        if not self.config.IEEE_EMAIL or not self.config.IEEE_PASSWORD:
-            print("⚠️  未配置IEEE账户，跳过")
+        self.fetched_portals = set()
+        portals = self.config.get_portals()
+        if not portals:
             return []
         
+        start_time = time.time()
+        results = {}
+        # 调用方未初始化驱动池时（run() 之外的调用）在这里创建，抓取结束后关闭
+        owns_pool = self.driver_pool is None
+        if owns_pool:
+            self._init_driver_pool()
+        pool = self.driver_pool
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.FETCH_CONCURRENCY) as executor:
+                futures = {executor.submit(self._fetch_portal, portal): portal for portal in portals}
+                for future in as_completed(futures):
+                    portal = futures[future]
+                    try:
+                        results[portal.name] = future.result()
+                        self.fetched_portals.add(portal.name)
+                    except Exception as e:
+                        print(f"❌ [{portal.name}] 抓取任务失败: {e}")
+                        continue
+        finally:
+            browsers = pool.created
+            if owns_pool:
+                self._close_driver_pool()
+        
+        all_manuscripts = [m for portal in portals for m in results.get(portal.name, [])]
+        self.locators.save()
+        print(f"\n⏱️  抓取耗时: {time.time() - start_time:.1f}s（{len(portals)} 个平台，{browsers} 个浏览器）")
+        return all_manuscripts
+    
+    def _restore_session(self, driver, waiter: PageWaiter, portal: str, account: str, is_logged_in) -> bool:
+        """
+        尝试复用上次保存的登录会话
+
+        写入Cookie后直接打开上次的仪表板地址，校验仍处于登录状态则跳过登录流程。
+
+        Args:
+            portal: 平台名称
+            account: 登录账户
+            is_logged_in: 接收driver、判断当前页面是否处于登录状态的函数
+
+        Returns:
+            是否复用成功
+        """
+        if not self.config.SESSION_REUSE:
+            return False
+        
+        session = self.session_store.load(portal, account)
+        if not session:
+            return False
+        
+        print(f"♻️  尝试复用 {portal} 登录会话...")
+        try:
+            dashboard_url = session['dashboard_url']
+            self._add_cookies(driver, session['cookies'], dashboard_url)
+            driver.get(dashboard_url)
+            waiter.ready('会话仪表板加载')
+            if is_logged_in(driver):
+                return True
+        except Exception as e:
+            print(f"⚠️  复用会话失败: {e}")
+        
+        print(f"⌛ {portal} 会话已失效，重新登录")
+        self.session_store.invalidate(portal, account)
+        driver.delete_all_cookies()
+        return False
+    
+    def _add_cookies(self, driver, cookies: List[Dict], url: str):
+        """写入Cookie；优先使用CDP，无需先打开目标域名下的页面"""
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [
+                {
+                    'name': c['name'],
+                    'value': c['value'],
+                    'domain': c.get('domain', ''),
+                    'path': c.get('path', '/'),
+                    'secure': c.get('secure', False),
+                    'httpOnly': c.get('httpOnly', False),
+                    **({'expires': c['expiry']} if c.get('expiry') else {}),
+                }
+                for c in cookies
+            ]})
+        except Exception:
+            # 非Chrome驱动或CDP不可用：先打开目标页面再逐个写入
+            driver.get(url)
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    continue
+    
+    def _save_session(self, driver, portal: str, account: str):
+        """保存当前登录会话及仪表板地址"""
+        if self.config.SESSION_REUSE:
+            self.session_store.save(portal, account, driver.get_cookies(), driver.current_url)
+    
+    @staticmethod
+    def _ieee_logged_in(driver) -> bool:
+        """ScholarOne页面是否处于登录状态"""
+        if driver.find_elements(By.XPATH, "//input[@type='password']"):
+            return False
+        return "ScholarOne" in driver.title or "Manuscripts" in driver.title
+    
+    @staticmethod
+    def _elsevier_logged_in(driver) -> bool:
+        """Editorial Manager页面是否处于登录状态"""
+        if driver.find_elements(By.XPATH, "//input[@type='password']"):
+            return False
+        return "Author" in driver.title or "Main Menu" in driver.title
+    
+    def fetch_ieee_manuscripts(self, driver, portal: PortalConfig) -> List[Manuscript]:
+        """
+        获取IEEE（ScholarOne）稿件列表
+        
+        优先复用已保存的登录会话，会话失效时才重新登录。
+        
+        Args:
+            driver: 用于抓取的浏览器驱动
+            portal: ScholarOne平台账户
+        
+        Returns:
+            稿件列表
+        
+        Raises:
+            FetchError: 登录失败或稿件列表提取出错
+        """
         print("\n" + "=" * 50)
-        print("📚 开始获取IEEE稿件状态...")
+        print(f"📚 开始获取 {portal.name} 稿件状态...")
         print("=" * 50)
         
         manuscripts = []
+        fetched = False
+        waiter = PageWaiter(driver, portal.name)
+        
+        try:
+            if self._restore_session(driver, waiter, portal.name, portal.username, self._ieee_logged_in):
+                print(f"✅ 已复用 {portal.name} 登录会话，直接进入作者仪表板")
+                manuscripts = self._extract_ieee_dashboard(driver, waiter)
+                fetched = True
+            elif self._login_ieee(driver, waiter, portal):
+                print(f"✅ {portal.name} 登录成功")
+                self._open_ieee_author_dashboard(driver, waiter, portal.name)
+                self._save_session(driver, portal.name, portal.username)
+                manuscripts = self._extract_ieee_dashboard(driver, waiter)
+                fetched = True
+            else:
+                print(f"❌ {portal.name} 登录失败，请检查账户信息")
+                
+        except Exception as e:
+            print(f"❌ 获取 {portal.name} 稿件失败: {e}")
+        
+        print(f"⏱️  [{portal.name}] 页面等待共 {len(waiter.timings)} 次，总耗时 {waiter.total_time():.1f}s")
+        print(f"📏 [{portal.name}] {waiter.page_load_summary()}")
+        if not fetched:
+            raise FetchError(f"{portal.name} 稿件获取未完成")
+        return manuscripts
+    
+    def _login_ieee(self, driver, waiter: PageWaiter, portal: PortalConfig) -> bool:
+        """
+        登录ScholarOne
+        
+        Returns:
+            是否登录成功
+        """
+        # 访问ScholarOne登录页面
+        print("🔗 访问ScholarOne登录页面...")
+        login_url = portal.url
+        print(f"🎯 目标网址: {login_url}")
         
+        driver.get(login_url)
+        waiter.ready('登录页加载')
+        login_page_url = driver.current_url
+        
+        # 输入用户名
+        print("📝 输入登录信息...")
         try:
-            # 访问ScholarOne登录页面
-            print("🔗 访问ScholarOne登录页面...")
-            login_url = self.config.IEEE_URL
-            print(f"🎯 目标网址: {login_url}")
+            # 按定位器缓存顺序查找用户名输入框（上次成功的方式优先）
+            _, email_input = self.locators.find(driver, waiter, portal.name, '用户名输入框', IEEE_USERNAME_LOCATORS, timeout=10)
+            if email_input is None:
+                raise NoSuchElementException("未找到用户名输入框")
             
-            self.driver.get(login_url)
-            time.sleep(2)
+            email_input.clear()
+            email_input.send_keys(portal.username)
+            print("✅ 用户名已输入")
             
-            # 输入用户名
-            print("📝 输入登录信息...")
-            try:
-                # 尝试多种方式查找用户名输入框
-                email_input = None
-                try:
-                    email_input = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.ID, "login"))
-                    )
-                except:
-                    try:
-                        email_input = self.driver.find_element(By.NAME, "login")
-                    except:
-                        try:
-                            email_input = self.driver.find_element(By.XPATH, "//input[@type='text' or @type='email']")
-                        except:
-                            email_input = self.driver.find_element(By.XPATH, "//input[contains(@placeholder, 'User') or contains(@placeholder, 'ID')]")
-                
-                email_input.clear()
-                email_input.send_keys(self.config.IEEE_EMAIL)
-                print("✅ 用户名已输入")
-                
-                # 输入密码
-                password_input = None
-                try:
-                    password_input = self.driver.find_element(By.ID, "password")
-                except:
-                    try:
-                        password_input = self.driver.find_element(By.NAME, "password")
-                    except:
-                        password_input = self.driver.find_element(By.XPATH, "//input[@type='password']")
-                
-                password_input.clear()
-                password_input.send_keys(self.config.IEEE_PASSWORD)
-                print("✅ 密码已输入")
-                
-                # 点击登录按钮
-                login_button = None
-                try:
-                    # 方式1：通过按钮文本查找
-                    login_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Log In')]")
-                    print("✅ 通过按钮文本找到登录按钮")
-                except:
-                    try:
-                        # 方式2：通过input value查找
-                        login_button = self.driver.find_element(By.XPATH, "//input[@value='Log In']")
-                        print("✅ 通过input value找到登录按钮")
-                    except:
-                        try:
-                            # 方式3：通过name属性查找
-                            login_button = self.driver.find_element(By.NAME, "login")
-                            print("✅ 通过name属性找到登录按钮")
-                        except:
-                            try:
-                                # 方式4：查找所有button和input，然后过滤
-                                buttons = self.driver.find_elements(By.XPATH, "//button | //input[@type='submit'] | //input[@type='button']")
-                                for btn in buttons:
-                                    btn_text = btn.text or btn.get_attribute('value') or ''
-                                    if 'log in' in btn_text.lower():
-                                        login_button = btn
-                                        print(f"✅ 通过遍历找到登录按钮: {btn_text}")
-                                        break
-                                if not login_button:
-                                    raise Exception("未找到登录按钮")
-                            except:
-                                # 方式5：直接按Enter键
-                                print("⚠️  未找到登录按钮，尝试按Enter键")
-                                password_input.send_keys("\n")  # 按Enter键
-                                login_button = None
-                
-                if login_button:
-                    login_button.click()
-                    print("✅ 已点击登录按钮")
-                else:
-                    print("✅ 已按Enter键提交")
-                
-            except Exception as e:
-                print(f"❌ 登录输入失败: {e}")
-                print(f"📝 当前页面标题: {self.driver.title}")
-                print(f"🔗 当前页面URL: {self.driver.current_url}")
-                raise
+            # 输入密码
+            _, password_input = self.locators.find(driver, waiter, portal.name, '密码输入框', IEEE_PASSWORD_LOCATORS, timeout=2)
+            if password_input is None:
+                raise NoSuchElementException("未找到密码输入框")
             
-            print("⏳ 等待登录...")
-            time.sleep(3)
+            password_input.clear()
+            password_input.send_keys(portal.password)
+            print("✅ 密码已输入")
             
-            # 检查是否登录成功
-            if "ScholarOne" in self.driver.title or "Manuscripts" in self.driver.title:
-                print("✅ IEEE登录成功")
-                
-                # 点击Author按钮进入作者仪表板
-                print("👉 点击Author按钮...")
-                try:
-                    author_button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.LINK_TEXT, "Author"))
-                    )
-                    author_button.click()
-                    time.sleep(3)
-                    print("✅ 已进入作者仪表板")
-                except Exception as e:
-                    print(f"⚠️  未找到Author按钮，尝试其他方式: {e}")
-                    # 尝试通过其他方式查找Author链接
-                    try:
-                        author_link = self.driver.find_element(By.XPATH, "//a[contains(text(), 'Author') or contains(@href, 'author')]")
-                        author_link.click()
-                        time.sleep(3)
-                    except:
-                        print("⚠️  无法找到Author入口，尝试直接查找稿件")
-                
-                # 查找稿件列表
-                print("🔍 正在查找稿件...")
-                time.sleep(2)
-                
+            # 查找登录按钮
+            _, login_button = self.locators.find(driver, waiter, portal.name, '登录按钮', IEEE_LOGIN_BUTTON_LOCATORS, timeout=2)
+            if not login_button:
+                # 直接按Enter键
+                print("⚠️  未找到登录按钮，尝试按Enter键")
+                password_input.send_keys("\n")  # 按Enter键
+            
+            if login_button:
+                login_button.click()
+                print("✅ 已点击登录按钮")
+            else:
+                print("✅ 已按Enter键提交")
+            
+        except Exception as e:
+            print(f"❌ 登录输入失败: {e}")
+            print(f"📝 当前页面标题: {driver.title}")
+            print(f"🔗 当前页面URL: {driver.current_url}")
+            raise
+        
+        print("⏳ 等待登录...")
+        waiter.navigation('登录', login_page_url, stale_element=password_input, timeout=20)
+        
+        # 检查是否登录成功
+        return "ScholarOne" in driver.title or "Manuscripts" in driver.title
+    
+    def _open_ieee_author_dashboard(self, driver, waiter: PageWaiter, portal_name: str):
+        """点击Author按钮进入作者仪表板（定位器缓存按平台账户分别记录）"""
+        print("👉 点击Author按钮...")
+        _, author_link = self.locators.find(driver, waiter, portal_name, 'Author入口', IEEE_AUTHOR_LOCATORS, timeout=10)
+        if author_link is None:
+            print("⚠️  无法找到Author入口，尝试直接查找稿件")
+            return
+        try:
+            current_url = driver.current_url
+            author_link.click()
+            waiter.navigation('作者仪表板', current_url, stale_element=author_link)
+            print("✅ 已进入作者仪表板")
+        except Exception as e:
+            print(f"⚠️  进入作者仪表板失败，尝试直接查找稿件: {e}")
+    
+    def _extract_ieee_dashboard(self, driver, waiter: PageWaiter) -> List[Manuscript]:
+        """从作者仪表板提取稿件列表"""
+        manuscripts = []
+        
+        # 查找稿件列表
+        print("🔍 正在查找稿件...")
+        waiter.present('稿件表格', (By.XPATH, "//table//tr[td]"), timeout=10, required=False)
+        fixtures.record_page(driver)
+        
+        try:
+            # 根据截图，稿件表格的列顺序是：STATUS, ID, TITLE, CREATED, SUBMITTED
+            if self.config.EXTRACTION_MODE == 'dom':
+                page_url, manuscript_rows = collect_scholarone_rows_dom(driver)
+            else:
+                # 单次execute_script往返提取整张表格
+                page_url, manuscript_rows = extract_scholarone_rows(driver)
+            
+            print(f"📄 找到 {len(manuscript_rows)} 行数据")
+            
+            if len(manuscript_rows) == 0:
+                print("⚠️  未找到稿件列表，可能需要调整XPath")
+                print("📝 当前页面标题:", driver.title)
+                print("🔗 当前页面URL:", page_url)
+            
+            for idx, row in enumerate(manuscript_rows):
                 try:
-                    # 根据截图，稿件表格的列顺序是：STATUS, ID, TITLE, CREATED, SUBMITTED
-                    manuscript_rows = []
+                    print(f"  行 {idx+1}: 找到 {row['cell_count']} 列")
                     
-                    # 方式1：查找带有data属性的表格行
-                    manuscript_rows = self.driver.find_elements(By.XPATH, "//table//tr[@class='data' or @class='data-even' or @class='data-odd']")
+                    # 输出每一列的HTML结构（前100个字符）
+                    for i, cell in enumerate(row['cells']):
+                        print(f"    列{i}: HTML=[{cell['html']}...]")
                     
-                    if not manuscript_rows:
-                        # 方式2：查找包含manuscript的表格行
-                        manuscript_rows = self.driver.find_elements(By.XPATH, "//table//tr[contains(@class, 'manuscript')]")
+                    parsed = parse_scholarone_row(row)
+                    if parsed is None:  # 需要至少5列才能提取STATUS, ID, TITLE
+                        print(f"    跳过：列数不足（需要至少5列）")
+                        continue
+                    status, manuscript_id, title = parsed
                     
-                    if not manuscript_rows:
-                        # 方式3：查找包含稿件信息的所有表格行（排除表头）
-                        all_rows = self.driver.find_elements(By.XPATH, "//table//tr[td]")
-                        # 过滤掉表头行
-                        manuscript_rows = [row for row in all_rows if len(row.find_elements(By.TAG_NAME, "td")) >= 3]
+                    print(f"    原始数据: STATUS=[{status}], ID=[{manuscript_id}], TITLE=[{title[:50] if title else ''}]")
                     
-                    print(f"📄 找到 {len(manuscript_rows)} 行数据")
+                    # 过滤掉空行、表头行或非稿件行
+                    skip_reason = scholarone_skip_reason(status, manuscript_id, title)
+                    if skip_reason:
+                        print(f"    跳过：{skip_reason}")
+                        continue
                     
-                    if len(manuscript_rows) == 0:
-                        print("⚠️  未找到稿件列表，可能需要调整XPath")
-                        print("📝 当前页面标题:", self.driver.title)
-                        print("🔗 当前页面URL:", self.driver.current_url)
+                    manuscripts.append(Manuscript(
+                        id=manuscript_id,
+                        title=title,
+                        status=status,
+                        source='IEEE',
+                        url=page_url
+                    ))
                     
-                    for idx, row in enumerate(manuscript_rows):
-                        try:
-                            cells = row.find_elements(By.TAG_NAME, "td")
-                            print(f"  行 {idx+1}: 找到 {len(cells)} 列")
-                            
-                            # 输出每一列的HTML结构（前100个字符）
-                            for i, cell in enumerate(cells[:5]):  # 只输出前5列
-                                cell_html = cell.get_attribute('innerHTML')[:100] if cell.get_attribute('innerHTML') else ''
-                                print(f"    列{i}: HTML=[{cell_html}...]")
-                            
-                            if len(cells) < 5:  # 需要至少5列才能提取STATUS, ID, TITLE
-                                print(f"    跳过：列数不足（需要至少5列）")
-                                continue
-                            
-                            # 根据实际HTML结构，列顺序是：列0(复杂结构), 列1(图标), 列2(STATUS), 列3(ID), 列4(TITLE)
-                            # STATUS在第2列
-                            status_cell = cells[2] if len(cells) > 2 else None
-                            status = "未知状态"
-                            if status_cell:
-                                # 尝试查找状态按钮或链接
-                                status_elements = status_cell.find_elements(By.XPATH, ".//a | .//button | .//span")
-                                if status_elements:
-                                    # 获取最后一个元素的文本（通常是状态）
-                                    for elem in status_elements:
-                                        elem_text = elem.text.strip()
-                                        if elem_text and elem_text not in ['Contact Journal', 'EIC:', 'ADM:']:
-                                            status = elem_text
-                                else:
-                                    status = status_cell.text.strip()
-                                    # 如果包含多行，取最后一行
-                                    if '\n' in status:
-                                        lines = [l.strip() for l in status.split('\n') if l.strip()]
-                                        status = lines[-1] if lines else "未知状态"
-                            
-                            # ID在第3列
-                            manuscript_id = ""
-                            if len(cells) > 3:
-                                id_cell = cells[3]
-                                # 尝试查找id_cell中的所有文本
-                                manuscript_id = id_cell.text.strip()
-                                # 如果为空，尝试查找子元素
-                                if not manuscript_id:
-                                    id_elements = id_cell.find_elements(By.XPATH, ".//*")
-                                    for elem in id_elements:
-                                        elem_text = elem.text.strip()
-                                        if elem_text:
-                                            manuscript_id = elem_text
-                                            break
-                            
-                            # TITLE在第4列
-                            title = ""
-                            if len(cells) > 4:
-                                title_cell = cells[4]
-                                # 尝试查找title_cell中的所有文本
-                                title = title_cell.text.strip()
-                                # 如果为空，尝试查找链接或其他元素
-                                if not title:
-                                    title_elements = title_cell.find_elements(By.XPATH, ".//a | .//span | .//div")
-                                    for elem in title_elements:
-                                        elem_text = elem.text.strip()
-                                        if elem_text and len(elem_text) > 5:  # 过滤掉太短的文本
-                                            title = elem_text
-                                            break
-                            
-                            print(f"    原始数据: STATUS=[{status}], ID=[{manuscript_id}], TITLE=[{title[:50] if title else ''}]")
-                            
-                            # 过滤掉空行、表头行或非稿件行
-                            if not manuscript_id or not title:
-                                print(f"    跳过：ID或标题为空")
-                                continue
-                            if manuscript_id.lower() in ['manuscript', 'id', '#', 'status']:
-                                print(f"    跳过：表头行 (ID={manuscript_id})")
-                                continue
-                            if status.lower() in ['status', 'id', 'title']:
-                                print(f"    跳过：表头行 (STATUS={status})")
-                                continue
-                            
-                            manuscripts.append({
-                                'id': manuscript_id,
-                                'title': title,
-                                'status': status,
-                                'source': 'IEEE',
-                                'url': self.driver.current_url
-                            })
-                            
-                            print(f"  ✓ [{status}] {manuscript_id}: {title}")
-                            
-                        except Exception as e:
-                            print(f"  ⚠️  解析稿件信息失败: {e}")
-                            continue
+                    print(f"  ✓ [{status}] {manuscript_id}: {title}")
                     
                 except Exception as e:
-                    print(f"⚠️  未找到稿件列表: {e}")
-                    print("💡 提示：可能需要根据实际页面结构调整XPath")
-                    
-            else:
-                print("❌ IEEE登录失败，请检查账户信息")
-                
+                    print(f"  ⚠️  解析稿件信息失败: {e}")
+                    continue
+            
         except Exception as e:
-            print(f"❌ 获取IEEE稿件失败: {e}")
+            print(f"⚠️  未找到稿件列表: {e}")
+            print("💡 提示：可能需要根据实际页面结构调整XPath")
+            raise
+        
+        # 表格未加载（如页面缓慢、等待超时）时不能当作没有稿件，否则会删除已保存的稿件
+        if not manuscripts and not is_empty_state(driver.page_source):
+            raise FetchError("作者仪表板中未识别到稿件，且页面没有空状态提示")
         
         return manuscripts
     
-    def fetch_elsevier_manuscripts(self) -> List[Dict]:
+    def fetch_elsevier_manuscripts(self, driver, portal: PortalConfig) -> List[Manuscript]:
         """
-        获取Elsevier稿件列表
+        获取Elsevier（Editorial Manager）稿件列表
+        
+        优先复用已保存的登录会话，会话失效时才重新登录。
+        
+        Args:
+            driver: 用于抓取的浏览器驱动
+            portal: Editorial Manager平台账户
         
         Returns:
             稿件列表
-        """
-        if not self.config.ELSEVIER_EMAIL or not self.config.ELSEVIER_PASSWORD or not self.config.ELSEVIER_URL:
-            print("⚠️  未配置Elsevier账户或期刊网址，跳过")
-            return []
         
+        Raises:
+            FetchError: 登录失败或稿件列表提取出错
+        """
         print("\n" + "=" * 50)
-        print("📚 开始获取Elsevier稿件状态...")
+        print(f"📚 开始获取 {portal.name} 稿件状态...")
         print("=" * 50)
         
         manuscripts = []
+        fetched = False
+        waiter = PageWaiter(driver, portal.name)
         
         try:
-            # 访问Editorial Manager登录页面
-            print("🔗 访问Editorial Manager登录页面...")
-            login_url = self.config.ELSEVIER_URL
-            print(f"🎯 目标网址: {login_url}")
-            
-            self.driver.get(login_url)
-            time.sleep(2)
-            
-            # 输入用户名
-            print("📝 输入登录信息...")
-            email_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "login"))
-            )
-            email_input.clear()
-            email_input.send_keys(self.config.ELSEVIER_EMAIL)
-            
-            # 输入密码
-            password_input = self.driver.find_element(By.NAME, "password")
-            password_input.clear()
-            password_input.send_keys(self.config.ELSEVIER_PASSWORD)
-            
-            # 点击登录按钮
-            login_button = self.driver.find_element(By.XPATH, "//input[@type='submit' and @value='Login']")
-            login_button.click()
-            
-            print("⏳ 等待登录...")
-            time.sleep(3)
-            
-            # 检查是否登录成功
-            if "Author" in self.driver.title or "Main Menu" in self.driver.title:
-                print("✅ Elsevier登录成功")
-                
-                print("🔍 正在查找稿件...")
-                
-                try:
-                    manuscript_links = self.driver.find_elements(By.XPATH, "//a[contains(text(), 'Submissions')]")
-                    
-                    for link in manuscript_links:
-                        try:
-                            link.click()
-                            time.sleep(2)
-                            
-                            manuscript_rows = self.driver.find_elements(By.XPATH, "//table//tr[contains(@class, 'data')]")
-                            
-                            print(f"📄 找到 {len(manuscript_rows)} 篇稿件")
-                            
-                            for row in manuscript_rows:
-                                try:
-                                    cells = row.find_elements(By.TAG_NAME, "td")
-                                    
-                                    if len(cells) >= 3:
-                                        manuscript_id = cells[0].text.strip()
-                                        title = cells[1].text.strip()
-                                        status = cells[2].text.strip()
-                                        
-                                        manuscripts.append({
-                                            'id': manuscript_id,
-                                            'title': title,
-                                            'status': status,
-                                            'source': 'Elsevier',
-                                            'url': self.driver.current_url
-                                        })
-                                        
-                                        print(f"  ✓ {manuscript_id}: {title} - {status}")
-                                        
-                                except Exception as e:
-                                    print(f"  ⚠️  解析稿件信息失败: {e}")
-                                    continue
-                            
-                            self.driver.back()
-                            time.sleep(1)
-                            
-                        except Exception as e:
-                            print(f"  ⚠️  处理稿件链接失败: {e}")
-                            continue
-                    
-                except Exception as e:
-                    print(f"⚠️  未找到稿件列表: {e}")
-                    print("💡 提示：可能需要根据实际页面结构调整XPath")
-                    
+            if self._restore_session(driver, waiter, portal.name, portal.username, self._elsevier_logged_in):
+                print(f"✅ 已复用 {portal.name} 登录会话，直接进入主菜单")
+                manuscripts = self._extract_elsevier_submissions(driver, waiter)
+                fetched = True
+            elif self._login_elsevier(driver, waiter, portal):
+                print(f"✅ {portal.name} 登录成功")
+                self._save_session(driver, portal.name, portal.username)
+                manuscripts = self._extract_elsevier_submissions(driver, waiter)
+                fetched = True
             else:
-                print("❌ Elsevier登录失败，请检查账户信息")
+                print(f"❌ {portal.name} 登录失败，请检查账户信息")
                 
         except Exception as e:
-            print(f"❌ 获取Elsevier稿件失败: {e}")
+            print(f"❌ 获取 {portal.name} 稿件失败: {e}")
         
+        print(f"⏱️  [{portal.name}] 页面等待共 {len(waiter.timings)} 次，总耗时 {waiter.total_time():.1f}s")
+        print(f"📏 [{portal.name}] {waiter.page_load_summary()}")
+        if not fetched:
+            raise FetchError(f"{portal.name} 稿件获取未完成")
+        return manuscripts
+    
+    def _login_elsevier(self, driver, waiter: PageWaiter, portal: PortalConfig) -> bool:
+        """
+        登录Editorial Manager
+        
+        Returns:
+            是否登录成功
+        """
+        # 访问Editorial Manager登录页面
+        print("🔗 访问Editorial Manager登录页面...")
+        login_url = portal.url
+        print(f"🎯 目标网址: {login_url}")
+        
+        driver.get(login_url)
+        waiter.ready('登录页加载')
+        login_page_url = driver.current_url
+        
+        # 输入用户名
+        print("📝 输入登录信息...")
+        email_input = waiter.present('用户名输入框', (By.NAME, "login"), timeout=10)
+        email_input.clear()
+        email_input.send_keys(portal.username)
+        
+        # 输入密码
+        password_input = driver.find_element(By.NAME, "password")
+        password_input.clear()
+        password_input.send_keys(portal.password)
+        
+        # 点击登录按钮
+        login_button = driver.find_element(By.XPATH, "//input[@type='submit' and @value='Login']")
+        login_button.click()
+        
+        print("⏳ 等待登录...")
+        waiter.navigation('登录', login_page_url, stale_element=login_button, timeout=20)
+        
+        # 检查是否登录成功
+        return "Author" in driver.title or "Main Menu" in driver.title
+    
+    def _extract_elsevier_submissions(self, driver, waiter: PageWaiter) -> List[Manuscript]:
+        """
+        从主菜单收集所有投稿列表地址并直接访问
+
+        每个投稿列表只需一次页面加载；FOLDER_TABS 大于1时在多个标签页中同时加载。
+        入口链接需要JavaScript跳转时回退到逐个点击、返回的方式。
+        """
+        print("🔍 正在查找稿件...")
+        
+        try:
+            links = extract_link_targets(driver, ELSEVIER_FOLDER_XPATH)
+        except Exception as e:
+            print(f"⚠️  未找到稿件列表: {e}")
+            print("💡 提示：可能需要根据实际页面结构调整XPath")
+            raise
+        
+        if not all(is_navigable(link['raw']) for link in links):
+            print("↩️  投稿列表入口需要JavaScript跳转，逐个点击进入")
+            return self._click_elsevier_folders(driver, waiter)
+        
+        hrefs = list(dict.fromkeys(link['href'] for link in links))
+        print(f"📂 找到 {len(hrefs)} 个投稿列表")
+        if not hrefs and not is_empty_state(driver.page_source):
+            raise FetchError("主菜单中未识别到投稿列表入口，且页面没有空状态提示")
+        
+        manuscripts = []
+        batch_size = max(1, self.config.FOLDER_TABS)
+        for i in range(0, len(hrefs), batch_size):
+            batch = hrefs[i:i + batch_size]
+            if len(batch) > 1:
+                manuscripts.extend(self._visit_in_tabs(driver, waiter, batch))
+            else:
+                manuscripts.extend(self._visit_elsevier_folder(driver, waiter, batch[0]))
+        return manuscripts
+    
+    def _visit_elsevier_folder(self, driver, waiter: PageWaiter, href: str) -> List[Manuscript]:
+        """在当前标签页中打开投稿列表并提取稿件"""
+        try:
+            driver.get(href)
+            waiter.ready('投稿列表')
+            return self._extract_elsevier_folder(driver, waiter)
+        except Exception as e:
+            print(f"  ⚠️  处理投稿列表失败: {e}")
+            raise
+    
+    def _visit_in_tabs(self, driver, waiter: PageWaiter, hrefs: List[str]) -> List[Manuscript]:
+        """
+        在新标签页中同时打开一批投稿列表，页面加载并行进行，再逐个提取
+
+        标签页数量与预期不符（如弹窗被拦截）时关闭新标签页，改为在当前标签页逐个访问。
+        某个投稿列表处理失败时其余标签页照常处理，全部处理完后抛出 FetchError。
+        """
+        main_handle = driver.current_window_handle
+        existing = set(driver.window_handles)
+        driver.execute_script("for (const url of arguments[0]) window.open(url, '_blank');", hrefs)
+        new_handles = [h for h in driver.window_handles if h not in existing]
+        
+        manuscripts = []
+        failed = 0
+        try:
+            if len(new_handles) == len(hrefs):
+                for handle in new_handles:
+                    try:
+                        driver.switch_to.window(handle)
+                        # 新标签页先以 about:blank 打开，readyState 需在导航开始后判断
+                        waiter.until('投稿列表(标签页跳转)', lambda d: d.current_url != 'about:blank', required=False)
+                        waiter.ready('投稿列表(标签页)')
+                        manuscripts.extend(self._extract_elsevier_folder(driver, waiter))
+                    except Exception as e:
+                        print(f"  ⚠️  处理投稿列表失败: {e}")
+                        failed += 1
+        finally:
+            for handle in new_handles:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except Exception:
+                    pass
+            driver.switch_to.window(main_handle)
+        
+        if len(new_handles) != len(hrefs):
+            print(f"⚠️  仅打开 {len(new_handles)}/{len(hrefs)} 个标签页，改为逐个访问")
+            for href in hrefs:
+                manuscripts.extend(self._visit_elsevier_folder(driver, waiter, href))
+        if failed:
+            raise FetchError(f"{failed}/{len(hrefs)} 个投稿列表处理失败")
+        return manuscripts
+    
+    def _click_elsevier_folders(self, driver, waiter: PageWaiter) -> List[Manuscript]:
+        """逐个点击投稿列表入口并返回主菜单（入口需要JavaScript跳转时使用）"""
+        manuscripts = []
+        failed = 0
+        link_count = len(driver.find_elements(By.XPATH, ELSEVIER_FOLDER_XPATH))
+        if not link_count and not is_empty_state(driver.page_source):
+            raise FetchError("主菜单中未识别到投稿列表入口，且页面没有空状态提示")
+        
+        for index in range(link_count):
+            try:
+                # 每次返回主菜单后重新查找链接，避免引用失效的元素
+                links = driver.find_elements(By.XPATH, ELSEVIER_FOLDER_XPATH)
+                if index >= len(links):
+                    break
+                link = links[index]
+                current_url = driver.current_url
+                link.click()
+                waiter.navigation('投稿列表', current_url, stale_element=link)
+                manuscripts.extend(self._extract_elsevier_folder(driver, waiter))
+                
+                current_url = driver.current_url
+                driver.back()
+                waiter.navigation('返回主菜单', current_url)
+                
+            except Exception as e:
+                print(f"  ⚠️  处理稿件链接失败: {e}")
+                failed += 1
+                continue
+        
+        if failed:
+            raise FetchError(f"{failed}/{link_count} 个投稿列表处理失败")
+        return manuscripts
+    
+    def _extract_elsevier_folder(self, driver, waiter: PageWaiter) -> List[Manuscript]:
+        """提取当前投稿列表页面中的稿件"""
+        waiter.present('稿件表格', (By.XPATH, "//table"), timeout=10, required=False)
+        fixtures.record_page(driver)
+        
+        if self.config.EXTRACTION_MODE == 'dom':
+            page_url, manuscript_rows = collect_elsevier_rows_dom(driver)
+        else:
+            # 单次execute_script往返提取整张表格
+            page_url, manuscript_rows = extract_elsevier_rows(driver)
+        
+        print(f"📄 找到 {len(manuscript_rows)} 篇稿件")
+        if not manuscript_rows and not is_empty_state(driver.page_source):
+            raise FetchError("投稿列表中未识别到稿件，且页面没有空状态提示")
+        
+        manuscripts = []
+        for cells in manuscript_rows:
+            if len(cells) >= 3:
+                manuscript_id = cells[0]
+                title = cells[1]
+                status = cells[2]
+                
+                manuscripts.append(Manuscript(
+                    id=manuscript_id,
+                    title=title,
+                    status=status,
+                    source='Elsevier',
+                    url=page_url
+                ))
+                
+                print(f"  ✓ {manuscript_id}: {title} - {status}")
         return manuscripts
     
     def run(self):
@@ -434,59 +745,62 @@ class JournalMonitor:
             print("\n❌ 配置验证失败，程序退出")
             return
         
+        if self.config.FIXTURE_RECORD_DIR:
+            fixtures.start_recording(self.config.FIXTURE_RECORD_DIR, self.config.get_portals())
+        
+        # 判断是否为每日第一次运行（北京时间9:00）
+        import os
+        self.is_daily_report = os.getenv('DAILY_REPORT', 'false').lower() == 'true'
+        self.changed_manuscripts = []
+        # 通知在各渠道的后台线程中渲染和发送，与存储写入及其余平台的抓取同时进行
+        self.notifications = NotificationQueue(self.notifiers)
+        # 之前运行中发送失败、已到重试时间的通知
+        self._deliver_pending()
+        
         try:
-            # 初始化浏览器
-            self._init_driver()
-            
-            # 获取所有稿件
-            all_manuscripts = []
-            
-            # 获取IEEE稿件
-            ieee_manuscripts = self.fetch_ieee_manuscripts()
-            all_manuscripts.extend(ieee_manuscripts)
+            # 初始化浏览器驱动池
+            self._init_driver_pool()
             
-            # 获取Elsevier稿件
-            elsevier_manuscripts = self.fetch_elsevier_manuscripts()
-            all_manuscripts.extend(elsevier_manuscripts)
+            # 并发获取所有平台的稿件
+            all_manuscripts = self.fetch_all_manuscripts()
             
             # 关闭浏览器
-            self._close_driver()
+            self._close_driver_pool()
             
             # 显示结果
             print("\n" + "=" * 50)
             print(f"📊 本次共获取 {len(all_manuscripts)} 篇稿件")
+            failed_portals = [p.name for p in self.config.get_portals() if p.name not in self.fetched_portals]
+            if failed_portals:
+                print(f"⚠️  以下平台抓取未完成，保留其已保存的稿件: {', '.join(failed_portals)}")
             print("=" * 50)
             
             if all_manuscripts:
-                # 对比状态变化
+                # 所有抓取成功的平台合并为一次对比和写入（其中没有稿件的平台，已保存的稿件视为已移除）
                 print("\n🔍 正在对比状态变化...")
-                changed_manuscripts = self.storage.compare_and_update(all_manuscripts)
-                
-                # 判断是否为每日第一次运行（北京时间9:00）
-                from datetime import datetime
-                import os
-                current_hour = datetime.now().hour
-                is_daily_report = os.getenv('DAILY_REPORT', 'false').lower() == 'true'
+                self._record_changes(self.storage.compare_and_update(all_manuscripts, self.fetched_portals,
+                                                                     self._stage_changes))
                 
                 # 发送通知
-                if is_daily_report:
+                if self.is_daily_report:
                     # 每日报告模式：无论是否有变化都发送邮件
                     print("\n📊 每日报告模式：发送所有稿件状态")
-                    self.notifier.send_daily_report(all_manuscripts)
-                    if changed_manuscripts:
-                        print(f"\n📬 检测到 {len(changed_manuscripts)} 篇稿件状态变化")
-                        for ms in changed_manuscripts:
-                            print(f"  • {ms.get('title', '未知')}: {ms.get('old_status', '未知')} → {ms.get('new_status', '未知')}")
+                    self.notifications.submit('send_daily_report', all_manuscripts)
+                    if self.changed_manuscripts:
+                        print(f"\n📬 检测到 {len(self.changed_manuscripts)} 篇稿件状态变化")
+                        for ms in self.changed_manuscripts:
+                            print(f"  • {ms.title}: {ms.old_status} → {ms.new_status}")
+                elif self.changed_manuscripts:
+                    print(f"\n📬 检测到 {len(self.changed_manuscripts)} 篇稿件状态变化")
                 else:
-                    # 普通模式：只在有变化时发送邮件
-                    if changed_manuscripts:
-                        print(f"\n📬 检测到 {len(changed_manuscripts)} 篇稿件状态变化")
-                        self.notifier.send_change_notification(changed_manuscripts)
-                    else:
-                        print("\n✅ 所有稿件状态无变化")
+                    print("\n✅ 所有稿件状态无变化")
             else:
                 print("\n⚠️  未获取到任何稿件，请检查账户配置或页面结构")
             
+            # 摘要队列中已到发送时间的变化放入发件箱发送
+            if self.digest.flush_due(self.outbox.enqueue):
+                self._deliver_pending()
+            
             print("\n" + "✅" * 25)
             print("监控任务完成")
             print("✅" * 25 + "\n")
@@ -496,8 +810,34 @@ class JournalMonitor:
             import traceback
             traceback.print_exc()
         finally:
-            # 确保浏览器关闭
-            self._close_driver()
+            # 确保浏览器关闭，并在限定时间内等待通知发送完成
+            self._close_driver_pool()
+            self.notifications.close(self.config.NOTIFY_DRAIN_TIMEOUT)
+    
+    def _stage_changes(self, changes: List[StatusChange]):
+        """
+        在稿件状态写入之前保存待发送的变化通知（由 compare_and_update 在存储锁内调用）
+        
+        启用摘要时变化先进入摘要队列，满足发送条件时才连同之前排队的变化一起放入发件箱
+        （先写入发件箱再清空摘要队列）；这里出错时本次状态不会写入，下次运行重新检测到这些变化
+        """
+        if self.is_daily_report:
+            return
+        self.digest.add(changes, self.outbox.enqueue)
+    
+    def _record_changes(self, changes: List[StatusChange]):
+        self.changed_manuscripts.extend(changes)
+        if changes:
+            self._deliver_pending()
+    
+    def _deliver_pending(self):
+        """把发件箱中已到发送时间的通知交给对应渠道的后台线程，发送结果写回发件箱"""
+        for entry in self.outbox.claim_due():
+            changes = [StatusChange.from_dict(record) for record in entry['changes']]
+            if not self.notifications.deliver(entry['channel'], entry['method'], (changes,),
+                                              partial(self.outbox.settle, entry['id'])):
+                # 渠道不可用时立即记为失败，按退避时间重试，而不是等待租约到期
+                self.outbox.settle(entry['id'], False, f"通知渠道 {entry['channel']} 不可用")
 
 
 if __name__ == '__main__':
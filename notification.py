@@ -1,26 +1,213 @@
 """
-邮件通知模块
-负责发送状态变化通知邮件
+通知模块
+负责通过各通知渠道发送状态变化通知和每日报告
+
+通知渠道（NOTIFY_CHANNELS）：
+- email：邮件。每次运行只建立一个已登录的SMTP会话（SmtpConnection），所有邮件复用该会话；
+  会话空闲一段时间后先发送NOOP确认连接可用，连接断开时自动重连重发
+- webhook：以JSON向指定地址发送POST请求，服务端5xx错误或连接失败时短暂等待后重试
+- file：追加写入本地JSONL文件，或以纯文本输出到标准输出，写入超时视为失败
+NotificationQueue 为每个渠道启动一个后台线程，通知同时发往所有渠道，监控流程提交后无需等待发送完成
 """
+import json
+import os
+from abc import ABC, abstractmethod
+import queue
+import re
 import smtplib
+import sys
+import threading
+import time
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
-from datetime import datetime
-from typing import List, Dict
+from typing import List, Optional
+import requests
 from config import Config
+from models import Manuscript, StatusChange
+import templates
+
+
+def _is_transient(error: Exception) -> bool:
+    """连接断开、超时或服务器暂时关闭连接（421），可以重连后重试"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    # smtplib 的其他异常（认证失败、收件人被拒等）重试也不会成功
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
 
 
-class EmailNotifier:
-    """邮件通知类"""
+class SmtpConnection:
+    """可复用的SMTP会话
+
+    第一次发送时建立连接并登录，之后的邮件复用同一会话；空闲超过 keepalive 秒后
+    发送前先用NOOP确认连接，连接已断开或发送时断开则重新连接登录后重发。
+
+    用法：
+        with SmtpConnection(host, port, user, password) as smtp:
+            smtp.send(sender, [receiver], message.as_string())
+    """
+    
+    def __init__(self, host: str, port: int, username: Optional[str], password: Optional[str],
+                 security: str = 'auto', timeout: float = 30, keepalive: float = 30, retries: int = 2):
+        """
+        Args:
+            host: SMTP服务器
+            port: 端口
+            username: 登录用户名，为空时不登录
+            password: 登录密码
+            security: ssl、starttls、none 或 auto（465端口用ssl，其他端口用starttls）
+            timeout: 连接和命令超时（秒）
+            keepalive: 会话空闲超过该秒数后，发送前先发NOOP检查连接
+            retries: 连接断开时重连重发的次数
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.security = security if security != 'auto' else ('ssl' if port == 465 else 'starttls')
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.retries = retries
+        self.server: Optional[smtplib.SMTP] = None
+        self.connect_count = 0
+        self.sent_count = 0
+        self._last_used = 0.0
+    
+    def __enter__(self) -> 'SmtpConnection':
+        return self
     
-    def __init__(self):
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _connect(self):
+        if self.security == 'ssl':
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == 'starttls':
+                server.starttls()
+        try:
+            # 不加密的本地测试服务通常不提供AUTH
+            if self.username and self.password and (self.security != 'none' or server.has_extn('auth')):
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        self.connect_count += 1
+        self._last_used = time.monotonic()
+        print(f"🔐 已连接SMTP服务器 {self.host}:{self.port}")
+    
+    def _alive(self) -> bool:
+        """空闲较久的会话先发送NOOP确认仍然可用"""
+        if self.server is None:
+            return False
+        if time.monotonic() - self._last_used < self.keepalive:
+            return True
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def _drop(self):
+        if self.server is not None:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+            self.server = None
+    
+    def send(self, sender: str, recipients: List[str], message: str):
+        """发送一封邮件，连接断开时自动重连重发"""
+        for attempt in range(self.retries + 1):
+            try:
+                if not self._alive():
+                    self._drop()
+                    self._connect()
+                self.server.sendmail(sender, recipients, message)
+                self._last_used = time.monotonic()
+                self.sent_count += 1
+                return
+            except Exception as e:
+                self._drop()
+                if attempt == self.retries or not _is_transient(e):
+                    raise
+                print(f"🔁 SMTP连接中断（{e}），重新连接...")
+    
+    def close(self):
+        """结束会话"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self._drop()
+
+
+def parse_receivers(value: Optional[str]) -> List[str]:
+    """解析收件地址，多个地址用逗号或分号分隔"""
+    return [address.strip() for address in re.split(r'[,;]', value or '') if address.strip()]
+
+
+class Notifier(ABC):
+    """通知渠道基类
+
+    子类实现 send_change_notification 和 send_daily_report，返回是否发送成功；
+    持有连接等资源的渠道在 close() 中释放。
+    """
+    
+    name = 'notifier'
+    
+    def __enter__(self) -> 'Notifier':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @abstractmethod
+    def send_change_notification(self, changed_manuscripts: List[StatusChange]) -> bool:
+        """发送状态变化通知"""
+    
+    @abstractmethod
+    def send_daily_report(self, all_manuscripts: List[Manuscript]) -> bool:
+        """发送每日报告"""
+    
+    def close(self):
+        pass
+
+
+class EmailNotifier(Notifier):
+    """邮件通知类
+    
+    同一个通知器发送的所有邮件共用一个SMTP会话，运行结束时调用 close() 关闭。
+    """
+    
+    name = 'email'
+    
+    def __init__(self, smtp: Optional[SmtpConnection] = None):
         self.sender = Config.EMAIL_SENDER
         self.password = Config.EMAIL_PASSWORD
         self.receiver = Config.EMAIL_RECEIVER
+        self.receivers = parse_receivers(Config.EMAIL_RECEIVER)
         self.smtp_host, self.smtp_port = Config.get_smtp_config()
+        self.smtp = smtp or SmtpConnection(self.smtp_host, self.smtp_port, self.sender, self.password,
+                                           Config.SMTP_SECURITY, Config.SMTP_TIMEOUT, Config.SMTP_KEEPALIVE)
+    
+    def close(self):
+        """关闭SMTP会话"""
+        self.smtp.close()
     
-    def send_change_notification(self, changed_manuscripts: List[Dict]) -> bool:
+    def _send(self, message):
+        """通过共用的SMTP会话发送邮件"""
+        self.smtp.send(self.sender, self.receivers, message.as_string())
+    
+    def _address_header(self) -> Header:
+        return Header(', '.join(self.receivers), 'utf-8')
+    
+    def send_change_notification(self, changed_manuscripts: List[StatusChange]) -> bool:
         """
         发送状态变化通知邮件
         
@@ -38,7 +225,7 @@ class EmailNotifier:
             # 创建邮件
             message = MIMEMultipart('alternative')
             message['From'] = Header(f"期刊状态监控 <{self.sender}>", 'utf-8')
-            message['To'] = Header(self.receiver, 'utf-8')
+            message['To'] = self._address_header()
             message['Subject'] = Header(
                 f"📬 期刊稿件状态更新通知 ({len(changed_manuscripts)}篇)",
                 'utf-8'
@@ -55,19 +242,8 @@ class EmailNotifier:
             message.attach(part2)
             
             # 发送邮件
-            print(f"📧 正在发送邮件到 {self.receiver}...")
-            
-            if self.smtp_port == 465:
-                # SSL连接
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
-            else:
-                # TLS连接
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                server.starttls()
-            
-            server.login(self.sender, self.password)
-            server.sendmail(self.sender, [self.receiver], message.as_string())
-            server.quit()
+            print(f"📧 正在发送邮件到 {', '.join(self.receivers)}...")
+            self._send(message)
             
             print("✅ 邮件发送成功！")
             return True
@@ -76,178 +252,15 @@ class EmailNotifier:
             print(f"❌ 邮件发送失败: {e}")
             return False
     
-    def _generate_html_content(self, changed_manuscripts: List[Dict]) -> str:
+    def _generate_html_content(self, changed_manuscripts: List[StatusChange]) -> str:
         """生成HTML格式的邮件内容"""
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 24px;
-        }}
-        .header p {{
-            margin: 5px 0 0 0;
-            opacity: 0.9;
-        }}
-        .manuscript {{
-            background: #f8f9fa;
-            border-left: 4px solid #667eea;
-            padding: 15px;
-            margin-bottom: 15px;
-            border-radius: 4px;
-        }}
-        .manuscript-title {{
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 8px;
-        }}
-        .manuscript-info {{
-            font-size: 14px;
-            color: #555;
-            margin: 5px 0;
-        }}
-        .status-change {{
-            background: white;
-            padding: 10px;
-            border-radius: 4px;
-            margin-top: 8px;
-        }}
-        .status-old {{
-            color: #e74c3c;
-            text-decoration: line-through;
-        }}
-        .status-new {{
-            color: #27ae60;
-            font-weight: bold;
-        }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            font-size: 12px;
-            color: #999;
-            text-align: center;
-        }}
-        .badge {{
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-size: 12px;
-            font-weight: bold;
-        }}
-        .badge-ieee {{
-            background: #0066cc;
-            color: white;
-        }}
-        .badge-elsevier {{
-            background: #ff6600;
-            color: white;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📬 期刊稿件状态更新通知</h1>
-        <p>检测到 {len(changed_manuscripts)} 篇稿件状态发生变化</p>
-    </div>
-"""
-        
-        for i, manuscript in enumerate(changed_manuscripts, 1):
-            source = manuscript.get('source', '未知')
-            badge_class = 'badge-ieee' if 'IEEE' in source.upper() else 'badge-elsevier'
-            
-            html += f"""
-    <div class="manuscript">
-        <div class="manuscript-title">
-            {i}. {manuscript.get('title', '未知标题')}
-        </div>
-        <div class="manuscript-info">
-            <span class="badge {badge_class}">{source}</span>
-            稿件ID: {manuscript.get('id', '未知')}
-        </div>
-        <div class="status-change">
-            <strong>状态变化：</strong>
-            <span class="status-old">{manuscript.get('old_status', '未知')}</span>
-            →
-            <span class="status-new">{manuscript.get('new_status', '未知')}</span>
-        </div>
-        <div class="manuscript-info" style="margin-top: 8px;">
-            <strong>变化时间：</strong> {manuscript.get('changed_at', current_time)}
-        </div>
-"""
-            if manuscript.get('url'):
-                html += f"""
-        <div class="manuscript-info">
-            <strong>查看链接：</strong> <a href="{manuscript['url']}">{manuscript['url']}</a>
-        </div>
-"""
-            html += """
-    </div>
-"""
-        
-        html += f"""
-    <div class="footer">
-        <p>此邮件由期刊状态监控系统自动发送</p>
-        <p>生成时间: {current_time}</p>
-    </div>
-</body>
-</html>
-"""
-        return html
+        return templates.render_change_html(changed_manuscripts)
     
-    def _generate_text_content(self, changed_manuscripts: List[Dict]) -> str:
+    def _generate_text_content(self, changed_manuscripts: List[StatusChange]) -> str:
         """生成纯文本格式的邮件内容"""
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        text = f"""
-期刊稿件状态更新通知
-{'=' * 50}
-
-检测到 {len(changed_manuscripts)} 篇稿件状态发生变化
-
-"""
-        
-        for i, manuscript in enumerate(changed_manuscripts, 1):
-            text += f"""
-{i}. {manuscript.get('title', '未知标题')}
-   来源: {manuscript.get('source', '未知')}
-   稿件ID: {manuscript.get('id', '未知')}
-   状态变化: {manuscript.get('old_status', '未知')} → {manuscript.get('new_status', '未知')}
-   变化时间: {manuscript.get('changed_at', current_time)}
-"""
-            if manuscript.get('url'):
-                text += f"   查看链接: {manuscript['url']}\n"
-            text += "\n"
-        
-        text += f"""
-{'=' * 50}
-此邮件由期刊状态监控系统自动发送
-生成时间: {current_time}
-"""
-        return text
+        return templates.render_change_text(changed_manuscripts)
     
-    def send_daily_report(self, all_manuscripts: List[Dict]) -> bool:
+    def send_daily_report(self, all_manuscripts: List[Manuscript]) -> bool:
         """
         发送每日定时报告邮件
         
@@ -265,7 +278,7 @@ class EmailNotifier:
             # 创建邮件
             message = MIMEMultipart('alternative')
             message['From'] = Header(f"期刊状态监控 <{self.sender}>", 'utf-8')
-            message['To'] = Header(self.receiver, 'utf-8')
+            message['To'] = self._address_header()
             message['Subject'] = Header(
                 f"📊 期刊稿件每日报告 ({len(all_manuscripts)}篇)",
                 'utf-8'
@@ -282,19 +295,8 @@ class EmailNotifier:
             message.attach(part2)
             
             # 发送邮件
-            print(f"📧 正在发送每日报告邮件到 {self.receiver}...")
-            
-            if self.smtp_port == 465:
-                # SSL连接
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
-            else:
-                # TLS连接
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                server.starttls()
-            
-            server.login(self.sender, self.password)
-            server.sendmail(self.sender, [self.receiver], message.as_string())
-            server.quit()
+            print(f"📧 正在发送每日报告邮件到 {', '.join(self.receivers)}...")
+            self._send(message)
             
             print("✅ 每日报告邮件发送成功！")
             return True
@@ -303,173 +305,23 @@ class EmailNotifier:
             print(f"❌ 每日报告邮件发送失败: {e}")
             return False
     
-    def _generate_daily_report_html(self, all_manuscripts: List[Dict]) -> str:
+    def _generate_daily_report_html(self, all_manuscripts: List[Manuscript]) -> str:
         """生成每日报告HTML格式的邮件内容"""
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 24px;
-        }}
-        .header p {{
-            margin: 5px 0 0 0;
-            opacity: 0.9;
-        }}
-        .manuscript {{
-            background: #f8f9fa;
-            border-left: 4px solid #11998e;
-            padding: 15px;
-            margin-bottom: 15px;
-            border-radius: 4px;
-        }}
-        .manuscript-title {{
-            font-size: 16px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 8px;
-        }}
-        .manuscript-info {{
-            font-size: 14px;
-            color: #555;
-            margin: 5px 0;
-        }}
-        .status {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 4px;
-            font-size: 13px;
-            font-weight: bold;
-            background: #27ae60;
-            color: white;
-        }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            font-size: 12px;
-            color: #999;
-            text-align: center;
-        }}
-        .badge {{
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-size: 12px;
-            font-weight: bold;
-        }}
-        .badge-ieee {{
-            background: #0066cc;
-            color: white;
-        }}
-        .badge-elsevier {{
-            background: #ff6600;
-            color: white;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📊 期刊稿件每日报告</h1>
-        <p>当前共有 {len(all_manuscripts)} 篇稿件</p>
-    </div>
-"""
-        
-        for i, manuscript in enumerate(all_manuscripts, 1):
-            source = manuscript.get('source', '未知')
-            badge_class = 'badge-ieee' if 'IEEE' in source.upper() else 'badge-elsevier'
-            
-            html += f"""
-    <div class="manuscript">
-        <div class="manuscript-title">
-            {i}. {manuscript.get('title', '未知标题')}
-        </div>
-        <div class="manuscript-info">
-            <span class="badge {badge_class}">{source}</span>
-            稿件ID: {manuscript.get('id', '未知')}
-        </div>
-        <div class="manuscript-info" style="margin-top: 8px;">
-            <strong>当前状态：</strong>
-            <span class="status">{manuscript.get('status', '未知')}</span>
-        </div>
-    </div>
-"""
-        
-        html += f"""
-    <div class="footer">
-        <p>此邮件由期刊状态监控系统自动发送</p>
-        <p>生成时间: {current_time}</p>
-    </div>
-</body>
-</html>
-"""
-        return html
+        return templates.render_daily_html(all_manuscripts)
     
-    def _generate_daily_report_text(self, all_manuscripts: List[Dict]) -> str:
+    def _generate_daily_report_text(self, all_manuscripts: List[Manuscript]) -> str:
         """生成每日报告纯文本格式的邮件内容"""
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        text = f"""
-期刊稿件每日报告
-{'=' * 50}
-
-当前共有 {len(all_manuscripts)} 篇稿件
-
-"""
-        
-        for i, manuscript in enumerate(all_manuscripts, 1):
-            text += f"""
-{i}. {manuscript.get('title', '未知标题')}
-   来源: {manuscript.get('source', '未知')}
-   稿件ID: {manuscript.get('id', '未知')}
-   当前状态: {manuscript.get('status', '未知')}
-
-"""
-        
-        text += f"""
-{'=' * 50}
-此邮件由期刊状态监控系统自动发送
-生成时间: {current_time}
-"""
-        return text
+        return templates.render_daily_text(all_manuscripts)
     
     def send_test_email(self) -> bool:
         """发送测试邮件"""
         try:
             message = MIMEText('这是一封测试邮件，用于验证邮件配置是否正确。', 'plain', 'utf-8')
             message['From'] = Header(f"期刊状态监控 <{self.sender}>", 'utf-8')
-            message['To'] = Header(self.receiver, 'utf-8')
+            message['To'] = self._address_header()
             message['Subject'] = Header('📧 期刊状态监控 - 测试邮件', 'utf-8')
             
-            if self.smtp_port == 465:
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
-            else:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                server.starttls()
-            
-            server.login(self.sender, self.password)
-            server.sendmail(self.sender, [self.receiver], message.as_string())
-            server.quit()
+            self._send(message)
             
             print("✅ 测试邮件发送成功！")
             return True
@@ -477,3 +329,265 @@ class EmailNotifier:
         except Exception as e:
             print(f"❌ 测试邮件发送失败: {e}")
             return False
+        finally:
+            self.close()
+
+
+def _payload_time() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class WebhookNotifier(Notifier):
+    """HTTP Webhook 通知渠道
+
+    以JSON发送POST请求，变化通知为 {"event": "status_change", "changes": [...]}，
+    每日报告为 {"event": "daily_report", "manuscripts": [...]}；返回非2xx状态码视为失败。
+    服务端返回5xx或连接失败时等待 retry_delay 秒（每次翻倍）后重试，最多重试 retries 次；
+    读取超时不重试（服务端可能已收到请求），由发件箱在之后的运行中重新发送。
+    """
+    
+    name = 'webhook'
+    
+    def __init__(self, url: str, timeout: float = 10, token: Optional[str] = None,
+                 retries: int = 2, retry_delay: float = 1):
+        self.url = url
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self.session = requests.Session()
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+    
+    def _post(self, payload: dict, label: str) -> bool:
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                print(f"✅ Webhook {label}发送成功（HTTP {response.status_code}）")
+                return True
+            except (requests.HTTPError, requests.ConnectionError) as e:
+                response = getattr(e, 'response', None)
+                retryable = response is None or response.status_code >= 500
+                if not retryable or attempt == self.retries:
+                    print(f"❌ Webhook {label}发送失败: {e}")
+                    return False
+                delay = self.retry_delay * 2 ** attempt
+                print(f"🔁 Webhook {label}发送失败，{delay:g}s 后重试（第 {attempt + 1} 次）: {e}")
+                time.sleep(delay)
+            except requests.RequestException as e:
+                print(f"❌ Webhook {label}发送失败: {e}")
+                return False
+        return False
+    
+    def send_change_notification(self, changed_manuscripts: List[StatusChange]) -> bool:
+        return self._post({'event': 'status_change', 'sent_at': _payload_time(),
+                           'changes': [change.to_dict() for change in changed_manuscripts]}, '变化通知')
+    
+    def send_daily_report(self, all_manuscripts: List[Manuscript]) -> bool:
+        return self._post({'event': 'daily_report', 'sent_at': _payload_time(),
+                           'manuscripts': [manuscript.to_dict() for manuscript in all_manuscripts]}, '每日报告')
+    
+    def close(self):
+        self.session.close()
+
+
+class FileNotifier(Notifier):
+    """本地文件通知渠道
+
+    path 为文件路径时每个通知追加一行JSON（内容与 Webhook 相同）；
+    为 "-" 时以纯文本格式输出到标准输出。
+    写入在单独的线程中进行，超过 timeout 秒未完成（如网络文件系统或管道阻塞）视为失败。
+    """
+    
+    name = 'file'
+    
+    def __init__(self, path: str = '-', timeout: float = 10):
+        self.path = path
+        self.timeout = timeout
+    
+    def _append(self, payload: dict, text: str):
+        if self.path == '-':
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        target_dir = os.path.dirname(self.path)
+        if target_dir:
+            os.makedirs(target_dir, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(payload, ensure_ascii=False) + '\n')
+    
+    def _write(self, payload: dict, text: str) -> bool:
+        errors = []
+        
+        def append():
+            try:
+                self._append(payload, text)
+            except Exception as e:
+                errors.append(e)
+        
+        writer = threading.Thread(target=append, name='notify-file-write', daemon=True)
+        writer.start()
+        writer.join(self.timeout)
+        if writer.is_alive():
+            print(f"❌ 写入通知文件超时（{self.timeout:g}s）: {self.path}")
+            return False
+        if errors:
+            print(f"❌ 写入通知文件失败: {errors[0]}")
+            return False
+        if self.path != '-':
+            print(f"✅ 通知已写入 {self.path}")
+        return True
+    
+    def send_change_notification(self, changed_manuscripts: List[StatusChange]) -> bool:
+        payload = {'event': 'status_change', 'sent_at': _payload_time(),
+                   'changes': [change.to_dict() for change in changed_manuscripts]}
+        text = templates.render_change_text(changed_manuscripts) if self.path == '-' else ''
+        return self._write(payload, text)
+    
+    def send_daily_report(self, all_manuscripts: List[Manuscript]) -> bool:
+        payload = {'event': 'daily_report', 'sent_at': _payload_time(),
+                   'manuscripts': [manuscript.to_dict() for manuscript in all_manuscripts]}
+        text = templates.render_daily_text(all_manuscripts) if self.path == '-' else ''
+        return self._write(payload, text)
+
+
+def create_notifiers(config=Config) -> List[Notifier]:
+    """按 NOTIFY_CHANNELS 创建通知渠道"""
+    notifiers = []
+    for channel in config.get_notify_channels():
+        if channel == 'email':
+            notifiers.append(EmailNotifier())
+        elif channel == 'webhook':
+            notifiers.append(WebhookNotifier(config.WEBHOOK_URL, config.WEBHOOK_TIMEOUT, config.WEBHOOK_TOKEN,
+                                             config.WEBHOOK_RETRIES))
+        elif channel == 'file':
+            notifiers.append(FileNotifier(config.NOTIFY_FILE, config.NOTIFY_FILE_TIMEOUT))
+        else:
+            print(f"⚠️  未知的通知渠道: {channel}")
+    return notifiers
+
+
+class _ChannelWorker:
+    """一个通知渠道的队列和后台线程"""
+    
+    _STOP = object()
+    
+    def __init__(self, notifier):
+        self.notifier = notifier
+        self.name = getattr(notifier, 'name', type(notifier).__name__)
+        self.queue: queue.Queue = queue.Queue()
+        self.submitted = 0
+        # 每个通知的 {'method', 'wait', 'duration', 'ok'}：排队等待时间和发送耗时（秒）
+        self.results: List[dict] = []
+        self.thread = threading.Thread(target=self._run, name=f'notify-{self.name}', daemon=True)
+        self.thread.start()
+    
+    def submit(self, method: str, args: tuple, queued_at: float, on_done=None):
+        self.submitted += 1
+        self.queue.put((method, args, queued_at, on_done))
+    
+    def stop(self):
+        self.queue.put(self._STOP)
+    
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+            method, args, queued_at, on_done = item
+            start = time.monotonic()
+            error = ''
+            try:
+                ok = getattr(self.notifier, method)(*args)
+                if not ok:
+                    error = f"{method} 返回失败"
+            except Exception as e:
+                print(f"❌ [{self.name}] 通知发送失败（{method}）: {e}")
+                ok, error = False, str(e)
+            self.results.append({'method': method, 'wait': start - queued_at,
+                                 'duration': time.monotonic() - start, 'ok': bool(ok)})
+            if on_done:
+                try:
+                    on_done(bool(ok), error)
+                except Exception as e:
+                    print(f"⚠️  [{self.name}] 记录通知发送结果失败: {e}")
+        try:
+            self.notifier.close()
+        except Exception as e:
+            print(f"⚠️  [{self.name}] 关闭通知渠道失败: {e}")
+
+
+class NotificationQueue:
+    """后台通知队列
+
+    通知（通知器的方法名和参数）提交后立即返回，submit 发往所有通知渠道，deliver 只发往一个渠道。每个渠道有自己的队列和
+    后台线程，依次渲染并发送该渠道的通知（邮件渠道在该线程中复用SMTP会话），
+    一个渠道变慢不影响其他渠道。close() 停止接收，在限定时间内等待所有渠道发送完毕，
+    之后各渠道在自己的线程中释放连接；超时未完成的渠道不会阻塞运行结束。
+
+    用法：
+        notifications = NotificationQueue(create_notifiers())
+        notifications.submit('send_change_notification', changes)
+        notifications.close(timeout=120)
+    """
+    
+    def __init__(self, notifiers):
+        if not isinstance(notifiers, (list, tuple)):
+            notifiers = [notifiers]
+        self.channels = [_ChannelWorker(notifier) for notifier in notifiers]
+    
+    @property
+    def submitted(self) -> int:
+        return sum(channel.submitted for channel in self.channels)
+    
+    @property
+    def results(self) -> List[dict]:
+        return [result for channel in self.channels for result in channel.results]
+    
+    def submit(self, method: str, *args):
+        """提交一个通知，method 为通知器的方法名（如 send_change_notification）"""
+        queued_at = time.monotonic()
+        for channel in self.channels:
+            channel.submit(method, args, queued_at)
+    
+    def deliver(self, channel_name: str, method: str, args: tuple, on_done) -> bool:
+        """
+        只向指定渠道提交一个通知（发件箱条目），发送结束后在该渠道的线程中调用 on_done(ok, error)
+        
+        Returns:
+            是否有该渠道
+        """
+        for channel in self.channels:
+            if channel.name == channel_name:
+                channel.submit(method, args, time.monotonic(), on_done)
+                return True
+        return False
+    
+    def close(self, timeout: float) -> bool:
+        """
+        停止接收通知，最多等待 timeout 秒让所有渠道发送完毕（各渠道同时发送，共用同一期限）
+        
+        Returns:
+            是否全部处理完成（未完成的通知随进程退出而放弃）
+        """
+        for channel in self.channels:
+            channel.stop()
+        deadline = time.monotonic() + timeout
+        for channel in self.channels:
+            channel.thread.join(max(0, deadline - time.monotonic()))
+        
+        done = True
+        for channel in self.channels:
+            results = channel.results
+            if results:
+                waits = [r['wait'] for r in results]
+                durations = [r['duration'] for r in results]
+                failed = sum(not r['ok'] for r in results)
+                print(f"📮 通知队列 [{channel.name}]: 已处理 {len(results)}/{channel.submitted} 个通知"
+                      f"（失败 {failed} 个），排队等待最长 {max(waits):.2f}s，"
+                      f"发送耗时共 {sum(durations):.2f}s")
+            if channel.thread.is_alive():
+                done = False
+                print(f"⚠️  通知渠道 [{channel.name}] 在 {timeout:g}s 内未完成，"
+                      f"{channel.submitted - len(results)} 个通知可能未发送")
+        return done
@@ -0,0 +1,135 @@
+"""
+通知发件箱模块
+待发送的变化通知先写入磁盘上的发件箱（在稿件状态写入之前、同一存储锁内），
+由各通知渠道的后台线程发送，成功后才从发件箱删除；发送失败按带随机抖动的指数退避
+安排重试，跨运行保留，直到成功或达到最大尝试次数，保证每条变化至少通知一次
+"""
+import json
+import os
+import random
+import time
+import uuid
+from typing import Dict, Iterable, List
+
+from locks import file_lock
+from models import StatusChange
+
+
+class NotificationOutbox:
+    """通知发件箱
+
+    outbox_file 中每个条目对应一个通知渠道的一次变化通知：
+    {'id', 'channel', 'method', 'changes', 'attempts', 'next_attempt_ts', 'created_ts', 'last_error'}。
+
+    取出条目（claim_due）时把 next_attempt_ts 推迟 LEASE_SECONDS 作为租约：
+    进程在发送完成前退出时，租约到期后由之后的运行重新发送。
+    已从配置中移除的渠道的条目在取出时删除，避免发件箱无限增长。
+    """
+
+    # 取出后尚未确认的条目在该时间（秒）后可被重新取出
+    LEASE_SECONDS = 900
+
+    def __init__(self, outbox_file: str, channels: Iterable[str], max_attempts: int = 8,
+                 backoff_base: float = 300, backoff_max: float = 21600, lock_timeout: float = 60):
+        self.outbox_file = outbox_file
+        self.channels = list(channels)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lock_timeout = lock_timeout
+
+    @classmethod
+    def from_config(cls, config, channels: Iterable[str]) -> 'NotificationOutbox':
+        return cls(config.OUTBOX_FILE, channels, config.OUTBOX_MAX_ATTEMPTS, config.OUTBOX_BACKOFF_BASE,
+                   config.OUTBOX_BACKOFF_MAX, config.STORAGE_LOCK_TIMEOUT)
+
+    def _read(self) -> List[Dict]:
+        if not os.path.exists(self.outbox_file):
+            return []
+        try:
+            with open(self.outbox_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('entries', [])
+        except Exception as e:
+            print(f"⚠️  读取通知发件箱失败: {e}")
+            return []
+
+    def _write(self, entries: List[Dict]):
+        """写入临时文件并同步到磁盘后再替换，发件箱先于稿件状态落盘"""
+        outbox_dir = os.path.dirname(self.outbox_file)
+        if outbox_dir:
+            os.makedirs(outbox_dir, exist_ok=True)
+        tmp_file = f"{self.outbox_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'entries': entries}, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.outbox_file)
+
+    def backoff(self, attempts: int) -> float:
+        """第 attempts 次失败后的等待时间（秒）：指数增长并封顶，取其后一半区间内的随机值"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def enqueue(self, changes: List[StatusChange]):
+        """为每个通知渠道加入一条变化通知"""
+        if not changes or not self.channels:
+            return
+        now = time.time()
+        records = [change.to_dict() for change in changes]
+        with file_lock(self.outbox_file, self.lock_timeout):
+            entries = self._read()
+            entries += [{'id': uuid.uuid4().hex, 'channel': channel, 'method': 'send_change_notification',
+                         'changes': records, 'attempts': 0, 'next_attempt_ts': now, 'created_ts': now,
+                         'last_error': None}
+                        for channel in self.channels]
+            self._write(entries)
+
+    def claim_due(self) -> List[Dict]:
+        """取出已到发送时间的条目（只取当前启用的渠道），并为其设置租约；删除已停用渠道的条目"""
+        if not os.path.exists(self.outbox_file):
+            return []
+        now = time.time()
+        with file_lock(self.outbox_file, self.lock_timeout):
+            entries = self._read()
+            orphaned = [e for e in entries if e['channel'] not in self.channels]
+            if orphaned:
+                entries = [e for e in entries if e['channel'] in self.channels]
+                print(f"🗑️  删除发件箱中已停用渠道的 {len(orphaned)} 个通知"
+                      f"（{', '.join(sorted({e['channel'] for e in orphaned}))}）")
+            due = [e for e in entries if e['next_attempt_ts'] <= now]
+            if not due and not orphaned:
+                return []
+            for entry in due:
+                entry['next_attempt_ts'] = now + self.LEASE_SECONDS
+            self._write(entries)
+        retries = sum(1 for e in due if e['attempts'])
+        if retries:
+            print(f"📤 发件箱中有 {retries} 个之前发送失败的通知，重新发送")
+        return due
+
+    def settle(self, entry_id: str, ok: bool, error: str = ''):
+        """记录发送结果：成功则删除条目，失败则按退避时间安排重试，达到最大尝试次数后放弃"""
+        with file_lock(self.outbox_file, self.lock_timeout):
+            entries = self._read()
+            entry = next((e for e in entries if e['id'] == entry_id), None)
+            if entry is None:
+                return
+            if ok:
+                entries.remove(entry)
+            else:
+                entry['attempts'] += 1
+                entry['last_error'] = error
+                if entry['attempts'] >= self.max_attempts:
+                    entries.remove(entry)
+                    print(f"❌ [{entry['channel']}] 通知已失败 {entry['attempts']} 次，放弃发送"
+                          f"（{len(entry['changes'])} 篇稿件状态变化）: {error}")
+                else:
+                    delay = self.backoff(entry['attempts'])
+                    entry['next_attempt_ts'] = time.time() + delay
+                    print(f"🔁 [{entry['channel']}] 通知发送失败（第 {entry['attempts']} 次），"
+                          f"约 {delay / 60:.0f} 分钟后的运行中重试")
+            self._write(entries)
+
+    def pending(self) -> int:
+        """发件箱中尚未发送成功的条目数"""
+        return len(self._read())
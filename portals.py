@@ -0,0 +1,139 @@
+"""
+投稿平台配置模块
+支持多账户、多期刊：从配置文件、JSON环境变量或编号环境变量读取平台列表
+"""
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+# 平台类型别名
+PORTAL_TYPES = {
+    'scholarone': 'scholarone',
+    'ieee': 'scholarone',
+    'editorial_manager': 'editorial_manager',
+    'editorialmanager': 'editorial_manager',
+    'em': 'editorial_manager',
+    'elsevier': 'editorial_manager',
+}
+
+# 平台类型对应的稿件来源名称
+PORTAL_SOURCES = {
+    'scholarone': 'IEEE',
+    'editorial_manager': 'Elsevier',
+}
+
+# 编号环境变量的最大序号（PORTAL_1_* ~ PORTAL_99_*）
+MAX_INDEXED_PORTALS = 99
+
+
+@dataclass(frozen=True)
+class PortalConfig:
+    """单个投稿平台账户"""
+    name: str
+    type: str
+    url: str
+    username: str
+    password: str
+
+    @property
+    def source(self) -> str:
+        """稿件来源名称（IEEE / Elsevier）"""
+        return PORTAL_SOURCES[self.type]
+
+    def __repr__(self) -> str:
+        # 避免密码出现在日志中
+        return f"PortalConfig(name={self.name!r}, type={self.type!r}, url={self.url!r}, username={self.username!r})"
+
+
+def _normalize_type(value: Optional[str]) -> Optional[str]:
+    return PORTAL_TYPES.get((value or '').strip().lower().replace('-', '_'))
+
+
+def _from_entry(entry: Dict, index: int) -> Optional[PortalConfig]:
+    """从配置项构建平台配置；password_env 可引用环境变量中的密码"""
+    portal_type = _normalize_type(entry.get('type'))
+    if not portal_type:
+        print(f"⚠️  第 {index} 个平台类型无效: {entry.get('type')}")
+        return None
+
+    password = entry.get('password') or os.getenv(entry.get('password_env') or '', '')
+    username = entry.get('username') or entry.get('email')
+    url = entry.get('url')
+    if not (url and username and password):
+        print(f"⚠️  第 {index} 个平台配置不完整（需要网址、账户和密码），跳过")
+        return None
+
+    name = entry.get('name') or f"{PORTAL_SOURCES[portal_type]}-{index}"
+    return PortalConfig(name=name, type=portal_type, url=url, username=username, password=password)
+
+
+def _load_json_entries(portals_file: Optional[str], portals_json: Optional[str]) -> List[Dict]:
+    entries = []
+    if portals_file:
+        try:
+            with open(portals_file, 'r', encoding='utf-8') as f:
+                entries.extend(json.load(f))
+        except Exception as e:
+            print(f"⚠️  读取平台配置文件失败: {e}")
+    if portals_json:
+        try:
+            entries.extend(json.loads(portals_json))
+        except Exception as e:
+            print(f"⚠️  解析 PORTALS_JSON 失败: {e}")
+    return entries
+
+
+def _load_indexed_entries() -> List[Dict]:
+    """读取 PORTAL_<n>_TYPE / _URL / _USERNAME / _PASSWORD / _NAME 形式的环境变量"""
+    entries = []
+    for n in range(1, MAX_INDEXED_PORTALS + 1):
+        prefix = f"PORTAL_{n}_"
+        if not os.getenv(prefix + 'TYPE'):
+            continue
+        entries.append({
+            'name': os.getenv(prefix + 'NAME'),
+            'type': os.getenv(prefix + 'TYPE'),
+            'url': os.getenv(prefix + 'URL'),
+            'username': os.getenv(prefix + 'USERNAME'),
+            'password': os.getenv(prefix + 'PASSWORD'),
+        })
+    return entries
+
+
+def load_portals(config) -> List[PortalConfig]:
+    """
+    读取所有平台配置
+
+    依次合并：IEEE_* / ELSEVIER_* 单账户配置、PORTALS_FILE 配置文件、
+    PORTALS_JSON 环境变量、PORTAL_<n>_* 编号环境变量。名称重复的平台只保留第一个。
+
+    Args:
+        config: 配置类
+
+    Returns:
+        平台配置列表
+    """
+    entries = []
+    if config.IEEE_EMAIL and config.IEEE_PASSWORD and config.IEEE_URL:
+        entries.append({'name': 'IEEE', 'type': 'scholarone', 'url': config.IEEE_URL,
+                        'username': config.IEEE_EMAIL, 'password': config.IEEE_PASSWORD})
+    if config.ELSEVIER_EMAIL and config.ELSEVIER_PASSWORD and config.ELSEVIER_URL:
+        entries.append({'name': 'Elsevier', 'type': 'editorial_manager', 'url': config.ELSEVIER_URL,
+                        'username': config.ELSEVIER_EMAIL, 'password': config.ELSEVIER_PASSWORD})
+    entries.extend(_load_json_entries(config.PORTALS_FILE, config.PORTALS_JSON))
+    entries.extend(_load_indexed_entries())
+
+    portals = []
+    names = set()
+    for index, entry in enumerate(entries, 1):
+        portal = _from_entry(entry, index)
+        if portal is None:
+            continue
+        if portal.name in names:
+            print(f"⚠️  平台名称重复，跳过: {portal.name}")
+            continue
+        names.add(portal.name)
+        portals.append(portal)
+    return portals
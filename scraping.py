@@ -0,0 +1,254 @@
+"""
+页面数据提取模块
+通过单次 execute_script 调用批量提取稿件表格，并统计WebDriver命令次数
+"""
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from selenium.webdriver.common.by import By
+
+
+# 状态列中需要忽略的文本
+IGNORED_STATUS_TEXTS = ['Contact Journal', 'EIC:', 'ADM:']
+
+# ScholarOne作者仪表板：一次性提取所有稿件行的前5列
+# 行查找顺序与逐元素模式一致：data类行 → manuscript类行 → 至少3列的数据行
+SCHOLARONE_ROWS_JS = r"""
+const byXPath = (path) => {
+    const result = document.evaluate(path, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+};
+let rows = byXPath("//table//tr[@class='data' or @class='data-even' or @class='data-odd']");
+if (!rows.length) rows = byXPath("//table//tr[contains(@class, 'manuscript')]");
+if (!rows.length) rows = byXPath("//table//tr[td]").filter(r => r.getElementsByTagName('td').length >= 3);
+const text = (el) => (el.innerText || '').trim();
+const texts = (cell, selector) => Array.from(cell.querySelectorAll(selector)).map(text);
+return {
+    url: location.href,
+    rows: rows.map(row => {
+        const cells = Array.from(row.getElementsByTagName('td'));
+        return {
+            cell_count: cells.length,
+            cells: cells.slice(0, 5).map(cell => ({
+                text: text(cell),
+                html: (cell.innerHTML || '').slice(0, 100),
+                status_items: texts(cell, 'a, button, span'),
+                children: texts(cell, '*'),
+                blocks: texts(cell, 'a, span, div'),
+            })),
+        };
+    }),
+};
+"""
+
+# Editorial Manager投稿列表：一次性提取所有数据行的单元格文本
+ELSEVIER_ROWS_JS = r"""
+const result = document.evaluate("//table//tr[contains(@class, 'data')]", document, null,
+                                 XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const rows = [];
+for (let i = 0; i < result.snapshotLength; i++) {
+    const row = result.snapshotItem(i);
+    rows.push(Array.from(row.getElementsByTagName('td')).map(td => (td.innerText || '').trim()));
+}
+return {url: location.href, rows: rows};
+"""
+
+# Editorial Manager主菜单中的投稿列表入口
+ELSEVIER_FOLDER_XPATH = "//a[contains(text(), 'Submissions')]"
+
+# 平台明确提示"没有稿件"的空状态文本，只有识别到这类提示时才把空列表视为抓取成功
+EMPTY_STATE_PATTERN = re.compile(
+    r"\b(?:there are|you have|you currently have)\s+no\b"
+    r"|\bno\s+(?:manuscripts?|submissions?|records?|papers?)\b"
+    r"|\b0\s+(?:manuscripts?|submissions?)\b",
+    re.IGNORECASE)
+
+# 一次性读取所有匹配链接的文本和绝对地址（XPath由 arguments[0] 传入）
+LINK_TARGETS_JS = r"""
+const result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const links = [];
+for (let i = 0; i < result.snapshotLength; i++) {
+    const a = result.snapshotItem(i);
+    links.push({text: (a.innerText || '').trim(), raw: a.getAttribute('href') || '', href: a.href || ''});
+}
+return links;
+"""
+
+
+class CommandCounter:
+    """WebDriver命令计数器
+
+    每个WebDriver命令都是一次与chromedriver的HTTP往返，
+    在上下文中统计驱动发出的命令总数及各命令的次数。
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self.by_command: Counter = Counter()
+
+    def __enter__(self):
+        original_execute = self.driver.execute
+
+        def execute(driver_command, params=None):
+            self.count += 1
+            self.by_command[driver_command] += 1
+            return original_execute(driver_command, params)
+
+        self.driver.execute = execute
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 删除实例属性，恢复类上的原始方法
+        self.driver.__dict__.pop('execute', None)
+        return False
+
+    def summary(self, top: int = 3) -> str:
+        """命令统计摘要"""
+        details = ', '.join(f"{name}×{n}" for name, n in self.by_command.most_common(top))
+        return f"{self.count} 次" + (f"（{details}）" if details else '')
+
+
+def extract_scholarone_rows(driver) -> Tuple[str, List[Dict]]:
+    """
+    单次往返提取ScholarOne稿件表格
+
+    Returns:
+        (当前页面URL, 行列表)，每行包含 cell_count 和前5列的 cells
+    """
+    result = driver.execute_script(SCHOLARONE_ROWS_JS) or {}
+    return result.get('url', ''), result.get('rows', [])
+
+
+def collect_scholarone_rows_dom(driver) -> Tuple[str, List[Dict]]:
+    """
+    逐元素提取ScholarOne稿件表格（兼容模式）
+
+    每行、每列、每个子元素都需要单独的WebDriver命令，仅在 EXTRACTION_MODE=dom 时使用。
+    返回结构与 extract_scholarone_rows 相同。
+    """
+    # 方式1：查找带有data属性的表格行
+    manuscript_rows = driver.find_elements(By.XPATH, "//table//tr[@class='data' or @class='data-even' or @class='data-odd']")
+
+    if not manuscript_rows:
+        # 方式2：查找包含manuscript的表格行
+        manuscript_rows = driver.find_elements(By.XPATH, "//table//tr[contains(@class, 'manuscript')]")
+
+    if not manuscript_rows:
+        # 方式3：查找包含稿件信息的所有表格行（排除表头）
+        all_rows = driver.find_elements(By.XPATH, "//table//tr[td]")
+        manuscript_rows = [row for row in all_rows if len(row.find_elements(By.TAG_NAME, "td")) >= 3]
+
+    rows = []
+    for row in manuscript_rows:
+        cells = row.find_elements(By.TAG_NAME, "td")
+        rows.append({
+            'cell_count': len(cells),
+            'cells': [{
+                'text': cell.text.strip(),
+                'html': (cell.get_attribute('innerHTML') or '')[:100],
+                'status_items': [e.text.strip() for e in cell.find_elements(By.XPATH, ".//a | .//button | .//span")],
+                'children': [e.text.strip() for e in cell.find_elements(By.XPATH, ".//*")],
+                'blocks': [e.text.strip() for e in cell.find_elements(By.XPATH, ".//a | .//span | .//div")],
+            } for cell in cells[:5]],
+        })
+    return driver.current_url, rows
+
+
+def parse_scholarone_row(row: Dict) -> Optional[Tuple[str, str, str]]:
+    """
+    从提取到的行数据中解析 STATUS, ID, TITLE
+
+    根据实际HTML结构，列顺序是：列0(复杂结构), 列1(图标), 列2(STATUS), 列3(ID), 列4(TITLE)
+
+    Returns:
+        (status, manuscript_id, title)，列数不足时返回None
+    """
+    cells = row.get('cells', [])
+    if row.get('cell_count', len(cells)) < 5 or len(cells) < 5:
+        return None
+
+    # STATUS在第2列
+    status_cell = cells[2]
+    status = "未知状态"
+    if status_cell['status_items']:
+        # 获取最后一个有效元素的文本（通常是状态）
+        for elem_text in status_cell['status_items']:
+            if elem_text and elem_text not in IGNORED_STATUS_TEXTS:
+                status = elem_text
+    else:
+        status = status_cell['text']
+        # 如果包含多行，取最后一行
+        if '\n' in status:
+            lines = [l.strip() for l in status.split('\n') if l.strip()]
+            status = lines[-1] if lines else "未知状态"
+
+    # ID在第3列，为空时取第一个有文本的子元素
+    manuscript_id = cells[3]['text']
+    if not manuscript_id:
+        manuscript_id = next((t for t in cells[3]['children'] if t), '')
+
+    # TITLE在第4列，为空时取第一个足够长的链接或文本块
+    title = cells[4]['text']
+    if not title:
+        title = next((t for t in cells[4]['blocks'] if t and len(t) > 5), '')
+
+    return status, manuscript_id, title
+
+
+def scholarone_skip_reason(status: str, manuscript_id: str, title: str) -> Optional[str]:
+    """
+    判断解析结果是否为空行、表头行或非稿件行
+
+    Returns:
+        跳过原因，正常稿件行返回None
+    """
+    if not manuscript_id or not title:
+        return "ID或标题为空"
+    if manuscript_id.lower() in ['manuscript', 'id', '#', 'status']:
+        return f"表头行 (ID={manuscript_id})"
+    if status.lower() in ['status', 'id', 'title']:
+        return f"表头行 (STATUS={status})"
+    return None
+
+
+def extract_elsevier_rows(driver) -> Tuple[str, List[List[str]]]:
+    """
+    单次往返提取Editorial Manager投稿列表
+
+    Returns:
+        (当前页面URL, 每行的单元格文本列表)
+    """
+    result = driver.execute_script(ELSEVIER_ROWS_JS) or {}
+    return result.get('url', ''), result.get('rows', [])
+
+
+def extract_link_targets(driver, xpath: str) -> List[Dict]:
+    """
+    单次往返读取链接的文本和地址
+
+    Returns:
+        [{'text': 链接文本, 'raw': href属性原值, 'href': 浏览器解析后的绝对地址}]
+    """
+    return driver.execute_script(LINK_TARGETS_JS, xpath) or []
+
+
+def is_empty_state(text: str) -> bool:
+    """页面文本是否为平台的空状态提示（没有任何稿件）"""
+    return bool(EMPTY_STATE_PATTERN.search(text or ''))
+
+
+def is_navigable(raw_href: str) -> bool:
+    """链接是否可以直接通过地址访问（排除 javascript: 和页内锚点）"""
+    raw_href = (raw_href or '').strip()
+    return bool(raw_href) and not raw_href.lower().startswith('javascript:') and not raw_href.startswith('#')
+
+
+def collect_elsevier_rows_dom(driver) -> Tuple[str, List[List[str]]]:
+    """逐元素提取Editorial Manager投稿列表（兼容模式）"""
+    rows = []
+    for row in driver.find_elements(By.XPATH, "//table//tr[contains(@class, 'data')]"):
+        rows.append([cell.text.strip() for cell in row.find_elements(By.TAG_NAME, "td")])
+    return driver.current_url, rows
@@ -0,0 +1,97 @@
+"""
+登录会话存储模块
+按平台和账户保存登录后的Cookie，供下次运行时直接复用
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class SessionStore:
+    """登录会话存储类"""
+
+    def __init__(self, session_file: str, max_age_hours: float = 24):
+        self.session_file = session_file
+        self.max_age_seconds = max_age_hours * 3600
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(portal: str, account: str) -> str:
+        """构建会话唯一键"""
+        return f"{portal}:{(account or '').lower()}"
+
+    def _read(self) -> Dict:
+        if not os.path.exists(self.session_file):
+            return {}
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️  读取会话文件失败: {e}")
+            return {}
+
+    def _write(self, sessions: Dict):
+        session_dir = os.path.dirname(self.session_file)
+        if session_dir:
+            os.makedirs(session_dir, exist_ok=True)
+        tmp_file = f"{self.session_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(sessions, f, ensure_ascii=False)
+        os.replace(tmp_file, self.session_file)
+
+    def load(self, portal: str, account: str) -> Optional[Dict]:
+        """
+        读取可用的会话
+
+        超过最长保存时间、或Cookie已全部过期的会话视为不可用。
+
+        Returns:
+            包含 cookies 和 dashboard_url 的字典，不可用时返回None
+        """
+        with self._lock:
+            session = self._read().get(self._key(portal, account))
+
+        if not session:
+            return None
+
+        if time.time() - session.get('saved_at_ts', 0) > self.max_age_seconds:
+            print(f"⌛ {portal} 会话已超过保存期限")
+            return None
+
+        now = time.time()
+        cookies = [c for c in session.get('cookies', []) if not c.get('expiry') or c['expiry'] > now]
+        if not cookies:
+            print(f"⌛ {portal} 会话Cookie已过期")
+            return None
+
+        session['cookies'] = cookies
+        return session
+
+    def save(self, portal: str, account: str, cookies: List[Dict], dashboard_url: str):
+        """保存登录成功后的会话"""
+        try:
+            with self._lock:
+                sessions = self._read()
+                sessions[self._key(portal, account)] = {
+                    'cookies': cookies,
+                    'dashboard_url': dashboard_url,
+                    'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'saved_at_ts': time.time(),
+                }
+                self._write(sessions)
+            print(f"💾 已保存 {portal} 登录会话")
+        except Exception as e:
+            print(f"⚠️  保存会话失败: {e}")
+
+    def invalidate(self, portal: str, account: str):
+        """删除已失效的会话"""
+        try:
+            with self._lock:
+                sessions = self._read()
+                if sessions.pop(self._key(portal, account), None) is not None:
+                    self._write(sessions)
+        except Exception as e:
+            print(f"⚠️  删除会话失败: {e}")
@@ -0,0 +1,195 @@
+"""
+二进制快照格式模块
+按列保存稿件当前状态，状态/来源/平台等重复值放在字符串表中只存一次，
+读取时通过 mmap 映射文件，按稿件键查找只需二分查找键列，无需解析整个文件
+
+文件布局（整数均为小端 uint32）：
+- 文件头：魔数、稿件数、字符串表长度，随后是各段的起始偏移
+- 字符串表段：去重排序后的状态/来源/平台字符串
+- 文本列段（key、id、title、url、first_seen）：按键排序，每段为 n+1 个结束偏移 + UTF-8 数据
+- 字符串表引用列段（status、source、portal）：每篇稿件一个字符串表下标
+
+文本段中每个值以 NUL 结尾（值本身中的 NUL 在写入时去掉），读取整列时一次解码后按 NUL 切分；
+结束偏移指向 NUL 之后，最高位为1表示该值为None。
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+
+MAGIC = b'MSSNAP01'
+HEADER = struct.Struct('<8sII')
+U32 = struct.Struct('<I')
+
+TEXT_COLUMNS = ('key', 'id', 'title', 'url', 'first_seen')
+INTERNED_COLUMNS = ('status', 'source', 'portal')
+
+NULL_INDEX = 0xFFFFFFFF
+NULL_FLAG = 0x80000000
+SECTION_COUNT = 1 + len(TEXT_COLUMNS) + len(INTERNED_COLUMNS)
+
+
+def _u32_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array('I', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_strings(values: List[Optional[str]]) -> bytes:
+    """打包一列字符串：n+1 个结束偏移 + 以 NUL 结尾的 UTF-8 数据，补齐到4字节边界"""
+    offsets = array('I', [0])
+    blob = bytearray()
+    for value in values:
+        if value is not None:
+            blob += value.replace('\0', '').encode('utf-8')
+        blob += b'\0'
+        offsets.append(len(blob) | (NULL_FLAG if value is None else 0))
+    blob += b'\0' * (-len(blob) % 4)
+    return _u32_bytes(offsets) + bytes(blob)
+
+
+def encode(manuscripts: Dict[str, Dict]) -> bytes:
+    """
+    将稿件数据编码为快照（按键排序，相同内容总是得到相同字节）
+
+    Args:
+        manuscripts: {稿件键: 持久字段}
+    """
+    keys = sorted(manuscripts)
+    strings = sorted({manuscripts[k].get(c) for k in keys for c in INTERNED_COLUMNS} - {None})
+    index = {s: i for i, s in enumerate(strings)}
+
+    sections = [_pack_strings(strings)]
+    sections += [_pack_strings([k if column == 'key' else manuscripts[k].get(column) for k in keys])
+                 for column in TEXT_COLUMNS]
+    for column in INTERNED_COLUMNS:
+        values = (manuscripts[k].get(column) for k in keys)
+        sections.append(_u32_bytes(array('I', (NULL_INDEX if v is None else index[v] for v in values))))
+
+    position = HEADER.size + U32.size * SECTION_COUNT
+    offsets = []
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    return HEADER.pack(MAGIC, len(keys), len(strings)) + struct.pack(f'<{SECTION_COUNT}I', *offsets) + b''.join(sections)
+
+
+class SnapshotReader:
+    """快照读取器（上下文管理器），文件以只读方式映射到内存
+
+    用法：
+        with SnapshotReader(path) as snapshot:
+            record = snapshot.get('IEEE_TNNLS-2024-0001')
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._mm = None
+
+    def __enter__(self) -> 'SnapshotReader':
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.count, self.string_count = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} 不是有效的快照文件")
+            self._sections = struct.unpack_from(f'<{SECTION_COUNT}I', self._mm, HEADER.size)
+        except Exception:
+            self.close()
+            raise
+        self._strings = self._read_column(self._sections[0], self.string_count)
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _u32(self, position: int) -> int:
+        return U32.unpack_from(self._mm, position)[0]
+
+    def _text(self, section: int, count: int, i: int) -> Optional[str]:
+        """读取文本段中的第 i 个值"""
+        end = self._u32(section + 4 * (i + 1))
+        if end & NULL_FLAG:
+            return None
+        start = self._u32(section + 4 * i) & ~NULL_FLAG
+        data = section + 4 * (count + 1)
+        return self._mm[data + start:data + end - 1].decode('utf-8')
+
+    def _read_column(self, section: int, count: int) -> List[Optional[str]]:
+        """一次读取整个文本段"""
+        ends = array('I')
+        ends.frombytes(self._mm[section:section + 4 * (count + 1)])
+        if sys.byteorder == 'big':
+            ends.byteswap()
+        data = section + 4 * (count + 1)
+        size = ends[count] & ~NULL_FLAG
+        values = self._mm[data:data + size].decode('utf-8').split('\0')[:count]
+        if any(end & NULL_FLAG for end in ends):
+            for i, end in enumerate(ends[1:]):
+                if end & NULL_FLAG:
+                    values[i] = None
+        return values
+
+    def _interned(self, column: int, i: int) -> Optional[str]:
+        value = self._u32(self._sections[1 + len(TEXT_COLUMNS) + column] + 4 * i)
+        return None if value == NULL_INDEX else self._strings[value]
+
+    def find(self, key: str) -> int:
+        """二分查找稿件键，返回下标，不存在时返回 -1"""
+        section = self._sections[1]
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._text(section, self.count, mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._text(section, self.count, low) == key:
+            return low
+        return -1
+
+    def record(self, i: int) -> Dict:
+        """读取第 i 篇稿件的持久字段"""
+        record = {column: self._text(self._sections[1 + c], self.count, i)
+                  for c, column in enumerate(TEXT_COLUMNS) if column != 'key'}
+        record.update({column: self._interned(c, i) for c, column in enumerate(INTERNED_COLUMNS)})
+        return record
+
+    def get(self, key: str) -> Optional[Dict]:
+        """按稿件键读取一篇稿件，不存在时返回None"""
+        i = self.find(key)
+        return self.record(i) if i >= 0 else None
+
+    def load_all(self) -> Dict[str, Dict]:
+        """读取全部稿件"""
+        columns = {column: self._read_column(self._sections[1 + c], self.count)
+                   for c, column in enumerate(TEXT_COLUMNS)}
+        for c, column in enumerate(INTERNED_COLUMNS):
+            section = self._sections[1 + len(TEXT_COLUMNS) + c]
+            indexes = array('I')
+            indexes.frombytes(self._mm[section:section + 4 * self.count])
+            if sys.byteorder == 'big':
+                indexes.byteswap()
+            columns[column] = [None if i == NULL_INDEX else self._strings[i] for i in indexes]
+
+        return {
+            key: {'id': id_, 'title': title, 'url': url, 'first_seen': first_seen,
+                  'status': status, 'source': source, 'portal': portal}
+            for key, id_, title, url, first_seen, status, source, portal
+            in zip(*(columns[c] for c in TEXT_COLUMNS + INTERNED_COLUMNS))
+        }
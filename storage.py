@@ -1,19 +1,612 @@
 """
 数据存储和状态对比模块
 负责保存和读取稿件状态，检测变化
+
+支持五种存储后端：
+- json：整个数据文件一次读写（默认，便于在仓库中查看）
+- sqlite：当前状态表 + 只追加的状态变化表，每次运行只写入有变化的行
+- eventlog：数据文件作为快照，之后的变化追加到JSONL事件日志，日志过长时压缩回快照
+- sharded：每个平台账户一个JSON分片文件，只读写本次抓取到的平台的分片
+- binary：紧凑的按列二进制快照（见 snapshot.py），通过 mmap 读取，可按稿件键直接查找
+
+每次运行都会变化的检查时间（last_checked）按平台单独保存在心跳文件中，不写入上述持久数据，
+因此稿件状态没有变化时持久数据文件保持不变。
+某个平台抓取失败时，该平台已保存的稿件原样保留，不会被当作已删除。
+多个监控进程可以共用同一份数据：写入在文件锁内进行，并通过数据版本检查（比较并交换）合并并发更新。
 """
+import argparse
+import hashlib
 import json
 import os
+import re
+import sqlite3
+from contextlib import closing, nullcontext
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from history import StatusHistory
+from models import Manuscript, StatusChange, manuscript_key
+from locks import file_lock, file_locks
+import snapshot
+
+
+# 当前状态中除 last_checked 外需要保存的字段
+RECORD_FIELDS = ('id', 'title', 'status', 'source', 'portal', 'url', 'first_seen')
+
+
+def _atomic_write(path: str, content):
+    """先写临时文件再重命名，写入中断时不会留下被截断的文件（content 为文本或字节）"""
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(content if isinstance(content, bytes) else content.encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def _durable(manuscripts: Dict) -> Dict:
+    """去掉心跳字段后的持久数据"""
+    return {key: {f: record.get(f) for f in RECORD_FIELDS} for key, record in manuscripts.items()}
+
+
+def _canonical(manuscripts: Dict) -> str:
+    """持久数据的规范化JSON文本（键排序，相同内容总是得到相同文本）"""
+    return json.dumps(_durable(manuscripts), ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+
+
+def _digest(paths: Iterable[str]) -> str:
+    """若干文件内容的摘要，用作数据版本（文件不存在也计入）"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode('utf-8') + b'\0')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        else:
+            digest.update(b'-')
+    return digest.hexdigest()
+
+
+def _portal_of(record: Dict) -> str:
+    """记录所属的平台账户（旧数据没有 portal 字段，按来源归属）"""
+    return record.get('portal') or record.get('source')
+
+
+def _diff(old_data: Dict, new_data: Dict) -> Tuple[Dict, List[str]]:
+    """
+    对比两次的稿件数据（忽略 last_checked）
+
+    Returns:
+        (新增或内容变化的记录, 不再出现的稿件键)
+    """
+    upserts = {
+        key: record for key, record in new_data.items()
+        if key not in old_data or any(old_data[key].get(f) != record.get(f) for f in RECORD_FIELDS)
+    }
+    deletes = [key for key in old_data if key not in new_data]
+    return upserts, deletes
+
+
+class JsonBackend:
+    """JSON文件存储后端：每次读取和写入整个文件
+
+    文件内容为规范化JSON，写入前比较内容哈希，没有变化时不改写文件。
+    """
+
+    def __init__(self, data_file: str):
+        self.data_file = data_file
+        self._hash: Optional[str] = None
+
+    def load(self, portals: Optional[Set[str]] = None) -> Dict:
+        # 整个文件一次读取，portals 由调用方过滤
+        if not os.path.exists(self.data_file):
+            return {}
+        try:
+            with open(self.data_file, 'rb') as f:
+                content = f.read()
+            self._hash = hashlib.sha256(content).hexdigest()
+            return json.loads(content.decode('utf-8'))
+        except Exception as e:
+            print(f"⚠️  读取数据文件失败: {e}")
+            return {}
+
+    def save_all(self, manuscripts: Dict) -> bool:
+        """写入规范化的持久数据；内容没有变化时跳过，返回是否写入"""
+        text = _canonical(manuscripts)
+        new_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        if self._hash is None and os.path.exists(self.data_file):
+            with open(self.data_file, 'rb') as f:
+                self._hash = hashlib.sha256(f.read()).hexdigest()
+        if new_hash == self._hash:
+            return False
+        _atomic_write(self.data_file, text)
+        self._hash = new_hash
+        return True
+
+    def commit(self, new_data: Dict, upserts: Dict, deletes: List[str], transitions: List[Dict],
+               portals: Optional[Set[str]] = None) -> bool:
+        # JSON文件只保存最新状态，无法按行更新
+        return self.save_all(new_data)
+
+    def version(self, portals: Optional[Set[str]] = None) -> str:
+        return _digest([self.data_file])
+
+    def lock_paths(self, portals: Optional[Set[str]] = None) -> List[str]:
+        return [self.data_file]
+
+    def clear(self):
+        if os.path.exists(self.data_file):
+            os.remove(self.data_file)
+        self._hash = None
+
+    @property
+    def location(self) -> str:
+        return self.data_file
+
+
+class SqliteBackend:
+    """SQLite存储后端
+
+    manuscripts 表保存每篇稿件的当前状态（以 source_id 为主键），
+    transitions 表只追加状态变化记录（按稿件和时间建立索引），
+    状态未变化的稿件行不会被改写。meta 表中的 version 每次写入加1，用作数据版本。
+    """
+
+    # 可以只读取部分平台的稿件
+    partial = True
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS manuscripts (
+        key TEXT PRIMARY KEY,
+        id TEXT,
+        title TEXT,
+        status TEXT,
+        source TEXT,
+        portal TEXT,
+        url TEXT,
+        first_seen TEXT
+    );
+    CREATE TABLE IF NOT EXISTS transitions (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        key TEXT NOT NULL,
+        old_status TEXT,
+        new_status TEXT,
+        changed_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_transitions_key_time ON transitions (key, changed_at);
+    CREATE TABLE IF NOT EXISTS meta (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        with closing(self._connect()) as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def is_empty(self) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM manuscripts LIMIT 1").fetchone() is None
+
+    def load(self, portals: Optional[Set[str]] = None) -> Dict:
+        query = f"SELECT key, {', '.join(RECORD_FIELDS)} FROM manuscripts"
+        params: Tuple = ()
+        if portals is not None:
+            query += f" WHERE COALESCE(portal, source) IN ({', '.join('?' for _ in portals)})"
+            params = tuple(portals)
+        with closing(self._connect()) as conn:
+            return {r['key']: {f: r[f] for f in RECORD_FIELDS} for r in conn.execute(query, params)}
+
+    def owners(self, keys: Iterable[str]) -> Dict[str, str]:
+        """按稿件键查找已保存记录所属的平台（只查询这些键，不读取整张表）"""
+        keys = list(keys)
+        found = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                query = (f"SELECT key, COALESCE(portal, source) AS owner FROM manuscripts "
+                         f"WHERE key IN ({', '.join('?' for _ in chunk)})")
+                found.update((r['key'], r['owner']) for r in conn.execute(query, chunk))
+        return found
+
+    def save_all(self, manuscripts: Dict) -> bool:
+        """整体替换当前状态（用于导入），不生成状态变化记录"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM manuscripts")
+            self._upsert(conn, manuscripts)
+            self._bump_version(conn)
+        return True
+
+    def commit(self, new_data: Dict, upserts: Dict, deletes: List[str], transitions: List[Dict],
+               portals: Optional[Set[str]] = None) -> bool:
+        """在一个事务中写入有变化的行和状态变化记录"""
+        with closing(self._connect()) as conn, conn:
+            self._upsert(conn, upserts)
+            conn.executemany("DELETE FROM manuscripts WHERE key = ?", [(key,) for key in deletes])
+            conn.executemany(
+                "INSERT INTO transitions (key, old_status, new_status, changed_at) VALUES (?, ?, ?, ?)",
+                [(t['key'], t['old_status'], t['new_status'], t['changed_at']) for t in transitions]
+            )
+            self._bump_version(conn)
+        return True
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection):
+        conn.execute("INSERT INTO meta (name, value) VALUES ('version', 1) "
+                     "ON CONFLICT(name) DO UPDATE SET value = value + 1")
+
+    def version(self, portals: Optional[Set[str]] = None) -> str:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        return str(row['value'] if row else 0)
+
+    def lock_paths(self, portals: Optional[Set[str]] = None) -> List[str]:
+        return [self.db_file]
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, records: Dict):
+        columns = ', '.join(RECORD_FIELDS)
+        placeholders = ', '.join('?' for _ in RECORD_FIELDS)
+        updates = ', '.join(f"{f} = excluded.{f}" for f in RECORD_FIELDS)
+        conn.executemany(
+            f"INSERT INTO manuscripts (key, {columns}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(key) DO UPDATE SET {updates}",
+            [(key, *(record.get(f) for f in RECORD_FIELDS)) for key, record in records.items()]
+        )
+
+    def history(self, key: str) -> List[Dict]:
+        """读取一篇稿件的全部状态变化记录（按时间排序）"""
+        with closing(self._connect()) as conn:
+            return [dict(r) for r in conn.execute(
+                "SELECT key, old_status, new_status, changed_at FROM transitions WHERE key = ? ORDER BY changed_at, seq",
+                (key,)
+            )]
+
+    def clear(self):
+        if os.path.exists(self.db_file):
+            os.remove(self.db_file)
+
+    @property
+    def location(self) -> str:
+        return self.db_file
+
+
+class EventLogBackend:
+    """事件日志存储后端
+
+    数据文件作为快照，新稿件、状态变化和删除以单行事件追加到日志文件，
+    没有变化的运行不写入任何内容。
+    读取时从快照开始重放日志；日志行数达到阈值后把当前状态写回快照并清空日志。
+    """
+
+    def __init__(self, snapshot_file: str, log_file: str, compact_threshold: int = 500):
+        self.snapshot_file = snapshot_file
+        self.log_file = log_file
+        self.compact_threshold = max(1, compact_threshold)
+        self._log_lines = 0
+
+    def load(self, portals: Optional[Set[str]] = None) -> Dict:
+        # 需要完整重放日志，portals 由调用方过滤
+        manuscripts = JsonBackend(self.snapshot_file).load()
+        self._log_lines = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    self._log_lines += 1
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # 写入中断留下的不完整行
+                        print(f"⚠️  跳过损坏的事件日志行: {line[:80]!r}")
+                        continue
+                    if event['op'] == 'set':
+                        manuscripts[event['k']] = {**manuscripts.get(event['k'], {}), **event['r']}
+                    elif event['op'] == 'del':
+                        manuscripts.pop(event['k'], None)
+        return manuscripts
+
+    def _append(self, events: List[Dict]):
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(e, ensure_ascii=False, separators=(',', ':')) + '\n' for e in events))
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_lines += len(events)
+
+    def save_all(self, manuscripts: Dict) -> bool:
+        """写入新快照并清空日志"""
+        _atomic_write(self.snapshot_file, _canonical(manuscripts))
+        # 快照已包含日志中的全部变化；即使清空前中断，重放日志也是幂等的
+        open(self.log_file, 'w').close()
+        self._log_lines = 0
+        return True
+
+    def commit(self, new_data: Dict, upserts: Dict, deletes: List[str], transitions: List[Dict],
+               portals: Optional[Set[str]] = None) -> bool:
+        """追加本次运行的事件，日志过长时压缩"""
+        changed_at = {t['key']: t['changed_at'] for t in transitions}
+        old_statuses = {t['key']: t['old_status'] for t in transitions}
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        events = [
+            {'op': 'set', 'k': key, 'r': {f: record.get(f) for f in RECORD_FIELDS},
+             **({'from': old_statuses[key]} if old_statuses.get(key) else {}), 't': changed_at.get(key, now)}
+            for key, record in upserts.items()
+        ]
+        events += [{'op': 'del', 'k': key, 't': now} for key in deletes]
+        self._append(events)
+
+        if self._log_lines >= self.compact_threshold:
+            print(f"🗜️  事件日志达到 {self._log_lines} 行，压缩到快照 {self.snapshot_file}")
+            self.save_all(new_data)
+        return True
+
+    def version(self, portals: Optional[Set[str]] = None) -> str:
+        return _digest([self.snapshot_file, self.log_file])
+
+    def lock_paths(self, portals: Optional[Set[str]] = None) -> List[str]:
+        return [self.snapshot_file]
+
+    def clear(self):
+        for path in (self.snapshot_file, self.log_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @property
+    def location(self) -> str:
+        return self.log_file
+
+
+class ShardedBackend:
+    """按平台分片的JSON存储后端
+
+    每个平台账户的稿件保存在分片目录下的独立JSON文件中（格式与数据文件相同），
+    每次运行只读取和改写本次抓取到的平台的分片，其他平台的分片保持不变。
+    各分片分别比较内容哈希，没有变化的分片不改写。
+    分片目录中另有稿件键 → 所属平台的索引文件，按键查找所属平台时不必读取所有分片。
+    """
+
+    partial = True
+
+    INDEX_NAME = 'keys.index'
+
+    def __init__(self, shard_dir: str):
+        self.shard_dir = shard_dir
+        self.index_file = os.path.join(shard_dir, self.INDEX_NAME)
+        self._shards: Dict[str, JsonBackend] = {}
+        os.makedirs(shard_dir, exist_ok=True)
+
+    def _shard_file(self, portal: str) -> str:
+        return os.path.join(self.shard_dir, re.sub(r'[^\w.-]', '_', portal or '未知来源') + '.json')
+
+    def _shard(self, path: str) -> JsonBackend:
+        if path not in self._shards:
+            self._shards[path] = JsonBackend(path)
+        return self._shards[path]
+
+    def _shard_files(self) -> List[str]:
+        return sorted(os.path.join(self.shard_dir, name) for name in os.listdir(self.shard_dir)
+                      if name.endswith('.json'))
+
+    @staticmethod
+    def _group(manuscripts: Dict) -> Dict[str, Dict]:
+        groups: Dict[str, Dict] = {}
+        for key, record in manuscripts.items():
+            groups.setdefault(_portal_of(record), {})[key] = record
+        return groups
+
+    def is_empty(self) -> bool:
+        return not self._shard_files()
+
+    def load(self, portals: Optional[Set[str]] = None) -> Dict:
+        manuscripts = {}
+        for path in self._scope_files(portals):
+            manuscripts.update(self._shard(path).load())
+        return manuscripts
+
+    def _write(self, groups: Dict[str, Dict], portals: Iterable[str]) -> int:
+        """写入指定平台的分片并更新键索引，返回实际改写的分片数"""
+        portals = set(portals)
+        written = 0
+        for portal in portals:
+            path = self._shard_file(portal)
+            records = groups.get(portal, {})
+            if records or os.path.exists(path):
+                written += self._shard(path).save_all(records)
+        if written:
+            self._update_index(groups, portals)
+        return written
+
+    def _read_index(self) -> Dict[str, str]:
+        """读取键索引；索引不存在或损坏时由所有分片重建一次"""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️  读取分片键索引失败，重新建立: {e}")
+        return {key: _portal_of(record) for key, record in self.load().items()}
+
+    def _update_index(self, groups: Dict[str, Dict], portals: Set[str]):
+        """用刚写入的平台分片替换索引中这些平台的键（索引单独加锁，不同平台的进程可以同时更新）"""
+        with file_lock(self.index_file):
+            index = {key: owner for key, owner in self._read_index().items() if owner not in portals}
+            for portal in portals:
+                index.update((key, portal) for key in groups.get(portal, {}))
+            _atomic_write(self.index_file, json.dumps(index, ensure_ascii=False, sort_keys=True))
+
+    def owners(self, keys: Iterable[str]) -> Dict[str, str]:
+        """按稿件键查找已保存记录所属的平台（只读取键索引）"""
+        index = self._read_index()
+        return {key: index[key] for key in keys if key in index}
+
+    def save_all(self, manuscripts: Dict) -> bool:
+        """整体替换所有分片（用于导入），删除不再有稿件的分片文件"""
+        groups = self._group(manuscripts)
+        written = self._write(groups, groups)
+        keep = {self._shard_file(p) for p in groups}
+        for path in self._shard_files():
+            if path not in keep:
+                os.remove(path)
+                self._shards.pop(path, None)
+                written += 1
+        return written > 0
+
+    def commit(self, new_data: Dict, upserts: Dict, deletes: List[str], transitions: List[Dict],
+               portals: Optional[Set[str]] = None) -> bool:
+        """只改写本次抓取范围内的分片"""
+        groups = self._group(new_data)
+        return self._write(groups, groups if portals is None else portals) > 0
+
+    def _scope_files(self, portals: Optional[Set[str]]) -> List[str]:
+        if portals is None:
+            return self._shard_files()
+        return sorted({self._shard_file(p) for p in portals})
+
+    def version(self, portals: Optional[Set[str]] = None) -> str:
+        return _digest(self._scope_files(portals))
+
+    def lock_paths(self, portals: Optional[Set[str]] = None) -> List[str]:
+        # 只锁定涉及的分片，不同平台的进程可以同时写入
+        return self._scope_files(portals)
+
+    def clear(self):
+        for path in self._shard_files() + [self.index_file]:
+            if os.path.exists(path):
+                os.remove(path)
+        self._shards = {}
+
+    @property
+    def location(self) -> str:
+        return self.shard_dir
+
+
+class BinarySnapshotBackend:
+    """二进制快照存储后端
+
+    当前状态保存为 snapshot.py 定义的按列快照，读取时映射文件而不是解析JSON，
+    按稿件键查找只读取键列和该稿件的字段。写入前比较内容哈希，没有变化时不改写文件。
+    """
+
+    def __init__(self, snapshot_file: str):
+        self.snapshot_file = snapshot_file
+        self._hash: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not os.path.exists(self.snapshot_file)
+
+    def load(self, portals: Optional[Set[str]] = None) -> Dict:
+        if not os.path.exists(self.snapshot_file):
+            return {}
+        try:
+            with snapshot.SnapshotReader(self.snapshot_file) as reader:
+                return reader.load_all()
+        except Exception as e:
+            print(f"⚠️  读取快照文件失败: {e}")
+            return {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        if not os.path.exists(self.snapshot_file):
+            return None
+        with snapshot.SnapshotReader(self.snapshot_file) as reader:
+            return reader.get(key)
+
+    def save_all(self, manuscripts: Dict) -> bool:
+        data = snapshot.encode(_durable(manuscripts))
+        new_hash = hashlib.sha256(data).hexdigest()
+        if self._hash is None and os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'rb') as f:
+                self._hash = hashlib.sha256(f.read()).hexdigest()
+        if new_hash == self._hash:
+            return False
+        _atomic_write(self.snapshot_file, data)
+        self._hash = new_hash
+        return True
+
+    def commit(self, new_data: Dict, upserts: Dict, deletes: List[str], transitions: List[Dict],
+               portals: Optional[Set[str]] = None) -> bool:
+        return self.save_all(new_data)
+
+    def version(self, portals: Optional[Set[str]] = None) -> str:
+        return _digest([self.snapshot_file])
+
+    def lock_paths(self, portals: Optional[Set[str]] = None) -> List[str]:
+        return [self.snapshot_file]
+
+    def clear(self):
+        if os.path.exists(self.snapshot_file):
+            os.remove(self.snapshot_file)
+        self._hash = None
+
+    @property
+    def location(self) -> str:
+        return self.snapshot_file
 
 
 class ManuscriptStorage:
     """稿件存储类"""
     
-    def __init__(self, data_file: str):
+    # 乐观合并的重试次数，之后在锁内完成整个合并
+    CAS_RETRIES = 3
+    
+    def __init__(self, data_file: str, backend: str = 'json', db_file: Optional[str] = None,
+                 event_log_file: Optional[str] = None, compact_threshold: int = 500,
+                 heartbeat_file: Optional[str] = None, history_file: Optional[str] = None,
+                 history_stats_file: Optional[str] = None, shard_dir: Optional[str] = None,
+                 snapshot_file: Optional[str] = None, lock_timeout: float = 60):
+        """
+        Args:
+            data_file: JSON数据文件（json后端的存储位置、eventlog后端的快照，也是导入导出的默认文件）
+            backend: 存储后端，json、sqlite、eventlog、sharded 或 binary
+            db_file: SQLite数据库文件，默认与数据文件同目录的 manuscripts.db
+            event_log_file: 事件日志文件，默认与数据文件同目录的 manuscripts.events.jsonl
+            compact_threshold: 事件日志压缩阈值（行数）
+            heartbeat_file: 按平台保存最近检查时间的心跳文件，默认与数据文件同目录的 heartbeat.json
+            history_file: 状态变化历史文件，默认与数据文件同目录的 history.jsonl
+            history_stats_file: 状态停留统计文件，默认与数据文件同目录的 history_stats.json
+            shard_dir: 分片目录，默认与数据文件同目录的 shards
+            snapshot_file: 二进制快照文件，默认与数据文件同目录的 manuscripts.snap
+            lock_timeout: 等待文件锁的最长时间（秒）
+        """
         self.data_file = data_file
+        self.lock_timeout = lock_timeout
         self._ensure_data_dir()
+        data_dir = os.path.dirname(data_file)
+        self.heartbeat_file = heartbeat_file or os.path.join(data_dir, 'heartbeat.json')
+        self.history = StatusHistory(history_file or os.path.join(data_dir, 'history.jsonl'),
+                                     history_stats_file or os.path.join(data_dir, 'history_stats.json'))
+        if backend == 'sqlite':
+            self.backend = SqliteBackend(db_file or os.path.join(data_dir, 'manuscripts.db'))
+            self._migrate_json()
+        elif backend == 'sharded':
+            self.backend = ShardedBackend(shard_dir or os.path.join(data_dir, 'shards'))
+            self._migrate_json()
+        elif backend == 'binary':
+            self.backend = BinarySnapshotBackend(snapshot_file or os.path.join(data_dir, 'manuscripts.snap'))
+            self._migrate_json()
+        elif backend == 'eventlog':
+            self.backend = EventLogBackend(data_file, event_log_file or os.path.join(data_dir, 'manuscripts.events.jsonl'),
+                                           compact_threshold)
+        else:
+            self.backend = JsonBackend(data_file)
+    
+    @classmethod
+    def from_config(cls, config) -> 'ManuscriptStorage':
+        """按配置创建存储"""
+        return cls(config.DATA_FILE, config.STORAGE_BACKEND, config.STORAGE_DB,
+                   config.EVENT_LOG_FILE, config.EVENT_LOG_COMPACT_THRESHOLD, config.HEARTBEAT_FILE,
+                   config.HISTORY_FILE, config.HISTORY_STATS_FILE, config.SHARD_DIR,
+                   config.SNAPSHOT_FILE, config.STORAGE_LOCK_TIMEOUT)
+    
+    @staticmethod
+    def make_key(source: str, manuscript_id: str) -> str:
+        """构建稿件唯一键"""
+        return manuscript_key(source, manuscript_id)
     
     def _ensure_data_dir(self):
         """确保数据目录存在"""
@@ -21,51 +614,147 @@ class ManuscriptStorage:
         if data_dir and not os.path.exists(data_dir):
             os.makedirs(data_dir, exist_ok=True)
     
-    def load_manuscripts(self) -> Dict:
-        """加载已保存的稿件数据"""
-        if not os.path.exists(self.data_file):
+    def _migrate_json(self):
+        """首次使用SQLite、分片或二进制快照后端时导入已有的JSON数据文件"""
+        if not self.backend.is_empty() or not os.path.exists(self.data_file):
+            return
+        with file_lock(self.data_file, self.lock_timeout):
+            if not self.backend.is_empty():
+                return
+            manuscripts = JsonBackend(self.data_file).load()
+            if manuscripts:
+                self.backend.save_all(manuscripts)
+                print(f"📥 已从 {self.data_file} 导入 {len(manuscripts)} 篇稿件到 {self.backend.location}")
+    
+    def _load_heartbeat(self) -> Dict[str, str]:
+        """读取各平台的最近检查时间"""
+        if not os.path.exists(self.heartbeat_file):
             return {}
-        
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
+            with open(self.heartbeat_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"⚠️  读取数据文件失败: {e}")
+            print(f"⚠️  读取心跳文件失败: {e}")
             return {}
     
+    def _save_heartbeat(self, heartbeat: Dict[str, str]):
+        try:
+            _atomic_write(self.heartbeat_file, json.dumps(heartbeat, ensure_ascii=False, indent=2, sort_keys=True))
+        except Exception as e:
+            print(f"⚠️  保存心跳文件失败: {e}")
+    
+    def load_manuscripts(self, portals: Optional[Set[str]] = None) -> Dict:
+        """
+        加载已保存的稿件数据（last_checked 取自心跳文件中对应平台的检查时间）
+        
+        Args:
+            portals: 只需要这些平台的稿件；支持部分读取的后端只读取这些平台，其他后端仍返回全部稿件
+        """
+        manuscripts = self.backend.load(portals if getattr(self.backend, 'partial', False) else None)
+        heartbeat = self._load_heartbeat()
+        for record in manuscripts.values():
+            # 旧心跳文件按来源记录
+            record['last_checked'] = heartbeat.get(_portal_of(record)) or heartbeat.get(record.get('source')) \
+                or record.get('last_checked')
+        return manuscripts
+    
     def save_manuscripts(self, manuscripts: Dict):
-        """保存稿件数据"""
+        """保存稿件数据（整体替换）"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(manuscripts, f, ensure_ascii=False, indent=2)
-            print(f"✅ 数据已保存到 {self.data_file}")
+            with self._lock():
+                saved = self.backend.save_all(manuscripts)
+            if saved:
+                print(f"✅ 数据已保存到 {self.backend.location}")
+            else:
+                print(f"ℹ️  数据无变化，未改写 {self.backend.location}")
         except Exception as e:
             print(f"❌ 保存数据失败: {e}")
     
-    def compare_and_update(self, new_manuscripts: List[Dict]) -> List[Dict]:
+    def compare_and_update(self, new_manuscripts: List[Manuscript],
+                           fetched_portals: Optional[Iterable[str]] = None,
+                           before_commit: Optional[Callable[[List[StatusChange]], None]] = None) -> List[StatusChange]:
         """
         对比新旧稿件状态，返回有变化的稿件
         
+        只有抓取成功的平台参与对比：这些平台中不再出现的稿件被删除，
+        其他平台（抓取失败或未配置抓取）已保存的稿件原样保留。
+        
+        多个进程共用同一份数据时采用乐观并发：不加锁读取和对比，写入前在文件锁内确认
+        数据版本未变再提交；版本已变（其他进程先写入）则重新读取合并，
+        重试 CAS_RETRIES 次后改为在锁内完成整个读取-合并-写入。
+        分片后端只锁定本次抓取范围内的分片，不同平台的进程互不阻塞。
+        
         Args:
-            new_manuscripts: 新获取的稿件列表
+            new_manuscripts: 新获取的稿件列表（旧格式的字典会被转换为 Manuscript）
+            fetched_portals: 本次抓取成功的平台名称，None 表示所有平台（整体替换）
+            before_commit: 有状态变化时在写入之前（持有存储锁）调用，参数为状态变化列表；
+                用于把待发送的通知与状态写入一起保存，调用失败时不写入，下次运行重新检测
         
         Returns:
-            有状态变化的稿件列表
+            状态变化列表
         """
-        old_data = self.load_manuscripts()
+        new_manuscripts = [m if isinstance(m, Manuscript) else Manuscript.from_dict(m) for m in new_manuscripts]
+        portals = None
+        if fetched_portals is not None:
+            portals = set(fetched_portals) | {m.portal for m in new_manuscripts}
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        for attempt in range(self.CAS_RETRIES + 1):
+            optimistic = attempt < self.CAS_RETRIES
+            scope = self._scope(new_manuscripts, portals)
+            with nullcontext() if optimistic else self._lock(scope):
+                version = self.backend.version(scope)
+                merge = self._merge(self.load_manuscripts(scope), new_manuscripts, portals, current_time)
+                with self._lock(scope) if optimistic else nullcontext():
+                    if optimistic and self.backend.version(scope) != version:
+                        print(f"🔁 数据已被其他进程更新，重新合并（第 {attempt + 1} 次）")
+                        continue
+                    return self._apply(merge, portals, scope, current_time, before_commit)
+    
+    def _scope(self, new_manuscripts: List[Manuscript], portals: Optional[Set[str]]) -> Optional[Set[str]]:
+        """
+        本次需要读取和写入的平台范围：抓取范围，加上本次稿件已保存在其他平台名下时的那些平台
+        
+        同一篇稿件可能同时出现在多个账户中，记录保留在最先保存它的平台名下。
+        只有支持部分读取的后端需要查找，按稿件键查询所属平台（SQLite按键查询，分片后端读取键索引）；
+        其他后端本来就读取全部稿件。
+        """
+        if portals is None or not getattr(self.backend, 'partial', False):
+            return portals
+        return portals | set(self.backend.owners(m.key for m in new_manuscripts).values())
+    
+    def _lock(self, portals: Optional[Set[str]] = None):
+        """锁定存储后端中 portals 涉及的文件"""
+        return file_locks(self.backend.lock_paths(portals), self.lock_timeout)
+    
+    def _merge(self, stored: Dict, new_manuscripts: List[Manuscript], portals: Optional[Set[str]],
+               current_time: str) -> Dict:
+        """
+        将新获取的稿件与已保存的稿件合并（只计算，不写入）
+        
+        Returns:
+            {'changed', 'transitions', 'updated', 'old', 'kept', 'messages'}
+        """
+        # 对比按稿件键查找已保存的记录（不论其属于哪个平台），平台范围只决定哪些未出现的稿件被删除
+        seen = {m.key for m in new_manuscripts}
+        old_data = {key: r for key, r in stored.items()
+                    if portals is None or _portal_of(r) in portals or key in seen}
+        kept = {key: r for key, r in stored.items() if key not in old_data}
         changed_manuscripts = []
+        transitions = []
         updated_data = {}
-        
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        messages = []
         
         for manuscript in new_manuscripts:
-            manuscript_id = manuscript.get('id')
-            title = manuscript.get('title', '未知标题')
-            current_status = manuscript.get('status', '未知状态')
-            source = manuscript.get('source', '未知来源')
-            
-            # 构建唯一键
-            key = f"{source}_{manuscript_id}"
+            key = manuscript.key
+            # 同一稿件出现在多个账户中时只取第一次出现
+            if key in updated_data:
+                continue
+            # 已保存的稿件保留原来所属的平台，避免在多个账户之间来回切换
+            if key in old_data and _portal_of(old_data[key]) != manuscript.portal:
+                manuscript = manuscript.on_portal(_portal_of(old_data[key]))
+            title = manuscript.title
+            current_status = manuscript.status
             
             # 检查是否有旧记录
             if key in old_data:
@@ -73,44 +762,160 @@ class ManuscriptStorage:
                 
                 # 状态发生变化
                 if old_status != current_status:
-                    changed_manuscripts.append({
-                        'id': manuscript_id,
-                        'title': title,
-                        'source': source,
-                        'old_status': old_status,
-                        'new_status': current_status,
-                        'changed_at': current_time,
-                        'url': manuscript.get('url', '')
-                    })
-                    print(f"📝 检测到状态变化: {title}")
-                    print(f"   {old_status} → {current_status}")
+                    changed_manuscripts.append(StatusChange(manuscript, old_status, current_time))
+                    transitions.append({'key': key, 'journal': manuscript.source, 'old_status': old_status,
+                                        'new_status': current_status, 'changed_at': current_time})
+                    messages.append(f"📝 检测到状态变化: {title}\n   {old_status} → {current_status}")
             else:
                 # 新稿件
-                print(f"🆕 发现新稿件: {title} ({current_status})")
+                transitions.append({'key': key, 'journal': manuscript.source, 'old_status': None,
+                                    'new_status': current_status, 'changed_at': current_time})
+                messages.append(f"🆕 发现新稿件: {title} ({current_status})")
             
             # 更新数据
             updated_data[key] = {
-                'id': manuscript_id,
-                'title': title,
-                'status': current_status,
-                'source': source,
-                'url': manuscript.get('url', ''),
+                **manuscript.to_dict(),
                 'last_checked': current_time,
                 'first_seen': old_data.get(key, {}).get('first_seen', current_time)
             }
         
-        # 保存更新后的数据
-        self.save_manuscripts(updated_data)
+        return {'changed': changed_manuscripts, 'transitions': transitions, 'updated': updated_data,
+                'old': old_data, 'kept': kept, 'messages': messages}
+    
+    def _apply(self, merge: Dict, portals: Optional[Set[str]], scope: Optional[Set[str]], current_time: str,
+               before_commit: Optional[Callable[[List[StatusChange]], None]] = None) -> List[StatusChange]:
+        """写入合并结果（调用方已持有 scope 范围的存储锁；portals 为抓取范围，用于更新检查时间）"""
+        for message in merge['messages']:
+            print(message)
         
-        return changed_manuscripts
+        # 只有持久数据有变化时才写入（SQLite和事件日志后端只写入有变化的行，分片后端只写入抓取范围内的分片）
+        transitions = merge['transitions']
+        upserts, deletes = _diff(merge['old'], merge['updated'])
+        if not upserts and not deletes and not transitions:
+            print(f"ℹ️  稿件数据无变化，未改写 {self.backend.location}")
+            self._touch_heartbeat(merge, portals, current_time)
+            return merge['changed']
+        if merge['kept']:
+            print(f"ℹ️  保留未抓取平台的 {len(merge['kept'])} 篇稿件")
+        if before_commit and merge['changed']:
+            try:
+                before_commit(merge['changed'])
+            except Exception as e:
+                print(f"❌ 保存待发送通知失败，本次不更新稿件状态: {e}")
+                return []
+        try:
+            if self.backend.commit({**merge['kept'], **merge['updated']}, upserts, deletes, transitions, scope):
+                print(f"✅ 数据已保存到 {self.backend.location}（{len(upserts)} 行更新，{len(deletes)} 行删除）")
+            else:
+                print(f"ℹ️  数据无变化，未改写 {self.backend.location}")
+            self._touch_heartbeat(merge, portals, current_time)
+        except Exception as e:
+            print(f"❌ 保存数据失败: {e}")
+            return merge['changed']
+        # 稿件数据已经提交，历史记录失败只影响时间线和停留统计，单独报告
+        try:
+            self.history.record(transitions, self.lock_timeout)
+        except Exception as e:
+            print(f"⚠️  记录状态历史失败（稿件数据已保存）: {e}")
+        
+        return merge['changed']
+    
+    def _touch_heartbeat(self, merge: Dict, portals: Optional[Set[str]], current_time: str):
+        """保存成功后更新本次检查过的平台的检查时间（检查时间只写入心跳文件）"""
+        with file_lock(self.heartbeat_file, self.lock_timeout):
+            heartbeat = self._load_heartbeat()
+            heartbeat.update({p: current_time for p in (portals or ())})
+            if portals is None:
+                heartbeat.update({record['portal']: current_time for record in merge['updated'].values()})
+            self._save_heartbeat(heartbeat)
     
     def get_all_manuscripts(self) -> List[Dict]:
         """获取所有稿件列表"""
         data = self.load_manuscripts()
         return list(data.values())
     
+    def get_manuscript(self, source: str, manuscript_id: str) -> Optional[Dict]:
+        """按来源和稿件编号读取一篇稿件（二进制快照后端无需读取全部数据），不存在时返回None"""
+        key = self.make_key(source, manuscript_id)
+        if hasattr(self.backend, 'get'):
+            record = self.backend.get(key)
+            if record is not None:
+                heartbeat = self._load_heartbeat()
+                record['last_checked'] = heartbeat.get(_portal_of(record)) or heartbeat.get(record.get('source'))
+            return record
+        return self.load_manuscripts().get(key)
+    
+    def timeline(self, source: str, manuscript_id: str) -> List[Dict]:
+        """
+        稿件的状态时间线
+        
+        Returns:
+            [{'status', 'since', 'until', 'days'}]，当前状态的 until 为None
+        """
+        return self.history.timeline(self.make_key(source, manuscript_id))
+    
+    def time_in_status(self, source: str, manuscript_id: str) -> Dict[str, float]:
+        """稿件在每个状态累计停留的天数"""
+        return self.history.time_in_status(self.make_key(source, manuscript_id))
+    
+    def median_days_in_status(self, journal: str, status: str) -> Optional[float]:
+        """某期刊（稿件来源）在某状态停留天数的中位数，直接读取增量维护的统计"""
+        return self.history.median_days(journal, status)
+    
+    def dwell_summary(self) -> List[Dict]:
+        """所有期刊、状态的停留天数统计"""
+        return self.history.summary()
+    
+    def export_json(self, json_file: Optional[str] = None) -> int:
+        """将当前状态导出为JSON数据文件格式，返回稿件数量"""
+        manuscripts = self.load_manuscripts()
+        JsonBackend(json_file or self.data_file).save_all(manuscripts)
+        return len(manuscripts)
+    
+    def import_json(self, json_file: Optional[str] = None) -> int:
+        """从JSON数据文件导入并替换当前状态，返回稿件数量"""
+        json_file = json_file or self.data_file
+        if os.path.abspath(json_file) == os.path.abspath(getattr(self.backend, 'snapshot_file', self.backend.location)):
+            print(f"ℹ️  {json_file} 就是当前存储使用的文件，无需导入")
+            return 0
+        manuscripts = JsonBackend(json_file).load()
+        with self._lock():
+            self.backend.save_all(manuscripts)
+        return len(manuscripts)
+    
     def clear_data(self):
         """清空数据（用于测试）"""
-        if os.path.exists(self.data_file):
-            os.remove(self.data_file)
-            print(f"🗑️  已清空数据文件: {self.data_file}")
+        self.backend.clear()
+        self.history.clear()
+        if os.path.exists(self.heartbeat_file):
+            os.remove(self.heartbeat_file)
+        print(f"🗑️  已清空数据文件: {self.backend.location}")
+
+
+def main():
+    """数据命令行：python storage.py export|import [JSON文件]，python storage.py stats"""
+    from config import Config
+
+    parser = argparse.ArgumentParser(description='稿件数据导入导出和状态统计')
+    parser.add_argument('command', choices=['export', 'import', 'stats'])
+    parser.add_argument('json_file', nargs='?', help=f'JSON数据文件，默认 {Config.DATA_FILE}')
+    args = parser.parse_args()
+
+    storage = ManuscriptStorage.from_config(Config)
+    json_file = args.json_file or Config.DATA_FILE
+    if args.command == 'stats':
+        summary = storage.dwell_summary()
+        if not summary:
+            print("ℹ️  暂无已结束的状态停留记录")
+        for item in summary:
+            print(f"📊 {item['journal']} | {item['status']}: 中位数 {item['median_days']} 天（{item['count']} 次）")
+    elif args.command == 'export':
+        count = storage.export_json(json_file)
+        print(f"📤 已导出 {count} 篇稿件到 {json_file}")
+    else:
+        count = storage.import_json(json_file)
+        print(f"📥 已从 {json_file} 导入 {count} 篇稿件到 {storage.backend.location}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""
+邮件模板模块
+变化通知和每日报告的HTML/纯文本模板。样式表和页面头部在导入时拼好（每个进程一次），
+每篇稿件的片段模板为随模块编译的 f-string；正文由生成器逐段产出，最后一次 join，
+渲染耗时与稿件数量成线性关系。
+"""
+import html
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+from models import Manuscript, StatusChange
+
+
+# 两种邮件共用的样式，GRADIENT 和 BORDER 处替换为各自的配色
+_CSS_HEAD = """        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            background: linear-gradient(135deg, GRADIENT);
+            color: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+        }
+        .header h1 {
+            margin: 0;
+            font-size: 24px;
+        }
+        .header p {
+            margin: 5px 0 0 0;
+            opacity: 0.9;
+        }
+        .manuscript {
+            background: #f8f9fa;
+            border-left: 4px solid BORDER;
+            padding: 15px;
+            margin-bottom: 15px;
+            border-radius: 4px;
+        }
+        .manuscript-title {
+            font-size: 16px;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-bottom: 8px;
+        }
+        .manuscript-info {
+            font-size: 14px;
+            color: #555;
+            margin: 5px 0;
+        }
+"""
+
+_CSS_TAIL = """        .footer {
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #ddd;
+            font-size: 12px;
+            color: #999;
+            text-align: center;
+        }
+        .badge {
+            display: inline-block;
+            padding: 3px 8px;
+            border-radius: 3px;
+            font-size: 12px;
+            font-weight: bold;
+        }
+        .badge-ieee {
+            background: #0066cc;
+            color: white;
+        }
+        .badge-elsevier {
+            background: #ff6600;
+            color: white;
+        }
+"""
+
+_CHANGE_CSS = """        .status-change {
+            background: white;
+            padding: 10px;
+            border-radius: 4px;
+            margin-top: 8px;
+        }
+        .status-old {
+            color: #e74c3c;
+            text-decoration: line-through;
+        }
+        .status-new {
+            color: #27ae60;
+            font-weight: bold;
+        }
+"""
+
+_DAILY_CSS = """        .status {
+            display: inline-block;
+            padding: 4px 10px;
+            border-radius: 4px;
+            font-size: 13px;
+            font-weight: bold;
+            background: #27ae60;
+            color: white;
+        }
+"""
+
+
+def _page_head(gradient: str, border: str, extra_css: str) -> str:
+    css = _CSS_HEAD.replace('GRADIENT', gradient).replace('BORDER', border) + extra_css + _CSS_TAIL
+    return f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+{css}    </style>
+</head>
+<body>
+"""
+
+
+CHANGE_HEAD = _page_head('#667eea 0%, #764ba2 100%', '#667eea', _CHANGE_CSS)
+DAILY_HEAD = _page_head('#11998e 0%, #38ef7d 100%', '#11998e', _DAILY_CSS)
+
+_render_banner = """    <div class="header">
+        <h1>{heading}</h1>
+        <p>{summary}</p>
+    </div>
+""".format
+
+_render_change_link = """
+        <div class="manuscript-info">
+            <strong>查看链接：</strong> <a href="{url}">{url}</a>
+        </div>
+""".format
+
+_ITEM_END = """
+    </div>
+"""
+
+_render_footer_html = """
+    <div class="footer">
+        <p>此邮件由期刊状态监控系统自动发送</p>
+        <p>生成时间: {now}</p>
+    </div>
+</body>
+</html>
+""".format
+
+_RULE = '=' * 50
+
+_render_text_head = """
+{heading}
+{rule}
+
+{summary}
+
+""".format
+
+_render_text_footer = """
+{rule}
+此邮件由期刊状态监控系统自动发送
+生成时间: {now}
+""".format
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _h(value) -> str:
+    return html.escape(value if isinstance(value, str) else str(value))
+
+
+@lru_cache(maxsize=1024)
+def _h_cached(value: Optional[str]) -> str:
+    """状态、来源等重复出现的值只转义一次（没有旧状态时为 None，输出空字符串）"""
+    return html.escape(value) if value else ''
+
+
+@lru_cache(maxsize=None)
+def _badge(source: str) -> str:
+    return 'badge-ieee' if 'IEEE' in source.upper() else 'badge-elsevier'
+
+
+def iter_change_html(changes: Iterable[StatusChange], count: int, now: Optional[str] = None) -> Iterator[str]:
+    """逐段产出变化通知的HTML正文"""
+    yield CHANGE_HEAD
+    yield _render_banner(heading='📬 期刊稿件状态更新通知', summary=f"检测到 {count} 篇稿件状态发生变化")
+    for i, change in enumerate(changes, 1):
+        source = change.source
+        yield f"""
+    <div class="manuscript">
+        <div class="manuscript-title">
+            {i}. {_h(change.title)}
+        </div>
+        <div class="manuscript-info">
+            <span class="badge {_badge(source)}">{_h_cached(source)}</span>
+            稿件ID: {_h(change.id)}
+        </div>
+        <div class="status-change">
+            <strong>状态变化：</strong>
+            <span class="status-old">{_h_cached(change.old_status)}</span>
+            →
+            <span class="status-new">{_h_cached(change.new_status)}</span>
+        </div>
+        <div class="manuscript-info" style="margin-top: 8px;">
+            <strong>变化时间：</strong> {change.changed_at}
+        </div>
+"""
+        if change.url:
+            yield _render_change_link(url=_h(change.url))
+        yield _ITEM_END
+    yield _render_footer_html(now=now or _now())
+
+
+def iter_change_text(changes: Iterable[StatusChange], count: int, now: Optional[str] = None) -> Iterator[str]:
+    """逐段产出变化通知的纯文本正文"""
+    yield _render_text_head(heading='期刊稿件状态更新通知', rule=_RULE, summary=f"检测到 {count} 篇稿件状态发生变化")
+    for i, change in enumerate(changes, 1):
+        yield f"""
+{i}. {change.title}
+   来源: {change.source}
+   稿件ID: {change.id}
+   状态变化: {change.old_status or ''} → {change.new_status}
+   变化时间: {change.changed_at}
+"""
+        if change.url:
+            yield f"   查看链接: {change.url}\n"
+        yield "\n"
+    yield _render_text_footer(rule=_RULE, now=now or _now())
+
+
+def iter_daily_html(manuscripts: Iterable[Manuscript], count: int, now: Optional[str] = None) -> Iterator[str]:
+    """逐段产出每日报告的HTML正文"""
+    yield DAILY_HEAD
+    yield _render_banner(heading='📊 期刊稿件每日报告', summary=f"当前共有 {count} 篇稿件")
+    for i, manuscript in enumerate(manuscripts, 1):
+        source = manuscript.source
+        yield f"""
+    <div class="manuscript">
+        <div class="manuscript-title">
+            {i}. {_h(manuscript.title)}
+        </div>
+        <div class="manuscript-info">
+            <span class="badge {_badge(source)}">{_h_cached(source)}</span>
+            稿件ID: {_h(manuscript.id)}
+        </div>
+        <div class="manuscript-info" style="margin-top: 8px;">
+            <strong>当前状态：</strong>
+            <span class="status">{_h_cached(manuscript.status)}</span>
+        </div>
+    </div>
+"""
+    yield _render_footer_html(now=now or _now())
+
+
+def iter_daily_text(manuscripts: Iterable[Manuscript], count: int, now: Optional[str] = None) -> Iterator[str]:
+    """逐段产出每日报告的纯文本正文"""
+    yield _render_text_head(heading='期刊稿件每日报告', rule=_RULE, summary=f"当前共有 {count} 篇稿件")
+    for i, manuscript in enumerate(manuscripts, 1):
+        yield f"""
+{i}. {manuscript.title}
+   来源: {manuscript.source}
+   稿件ID: {manuscript.id}
+   当前状态: {manuscript.status}
+
+"""
+    yield _render_text_footer(rule=_RULE, now=now or _now())
+
+
+def render_change_html(changes, now: Optional[str] = None) -> str:
+    return ''.join(iter_change_html(changes, len(changes), now))
+
+
+def render_change_text(changes, now: Optional[str] = None) -> str:
+    return ''.join(iter_change_text(changes, len(changes), now))
+
+
+def render_daily_html(manuscripts, now: Optional[str] = None) -> str:
+    return ''.join(iter_daily_html(manuscripts, len(manuscripts), now))
+
+
+def render_daily_text(manuscripts, now: Optional[str] = None) -> str:
+    return ''.join(iter_daily_text(manuscripts, len(manuscripts), now))
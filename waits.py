@@ -0,0 +1,195 @@
+"""
+页面等待模块
+基于显式就绪条件（URL变化、元素出现、document.readyState）进行等待，
+替代固定时长的 time.sleep，并记录每次等待的实际耗时
+"""
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from config import Config
+import fixtures
+
+
+# 轮询间隔（秒）
+POLL_INTERVAL = 0.1
+
+# 读取最近一次页面导航的加载耗时（毫秒）和资源数量
+PAGE_TIMING_JS = r"""
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return null;
+return {
+    url: nav.name,
+    dom_content_loaded: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transfer_size: nav.transferSize || 0,
+    resources: performance.getEntriesByType('resource').length,
+};
+"""
+
+Locator = Tuple[str, str]
+
+
+class PageWaiter:
+    """页面等待器
+
+    每个等待步骤都有独立的超时时间，等待结束后打印并记录实际耗时。
+    """
+
+    def __init__(self, driver, label: str = ''):
+        self.driver = driver
+        self.label = label
+        self.timings: List[Tuple[str, float, bool]] = []
+        self.page_loads: List[Dict] = []
+
+    def _log(self, step: str, elapsed: float, ok: bool):
+        self.timings.append((step, elapsed, ok))
+        prefix = f"[{self.label}] " if self.label else ''
+        if ok:
+            print(f"⏱️  {prefix}{step}: {elapsed:.2f}s")
+        else:
+            print(f"⏱️  {prefix}{step}: 超时 ({elapsed:.2f}s)")
+
+    def until(self, step: str, condition: Callable, timeout: Optional[float] = None, required: bool = True):
+        """
+        等待条件成立
+
+        Args:
+            step: 步骤名称（用于日志）
+            condition: 接收driver的条件函数，返回真值表示就绪
+            timeout: 本步骤的超时时间（秒），默认使用 Config.WAIT_TIMEOUT
+            required: 超时时是否抛出异常；为False时返回None
+
+        Returns:
+            条件函数的返回值
+        """
+        timeout = Config.WAIT_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(
+                self.driver, timeout, poll_frequency=POLL_INTERVAL,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(condition)
+        except TimeoutException:
+            self._log(step, time.perf_counter() - start, False)
+            if required:
+                raise
+            return None
+        self._log(step, time.perf_counter() - start, True)
+        return result
+
+    def ready(self, step: str = '页面加载', timeout: Optional[float] = None,
+              states: Optional[Sequence[str]] = None, required: bool = False) -> bool:
+        """
+        等待 document.readyState 达到指定状态，并记录本次页面加载的耗时
+
+        精简模式使用eager加载策略，默认DOM解析完成（interactive）即视为就绪。
+        """
+        if states is None:
+            states = ('interactive', 'complete') if Config.LEAN_BROWSER else ('complete',)
+        ok = bool(self.until(step, document_ready(states), timeout, required))
+        if ok:
+            self._record_page_load(step)
+            fixtures.record_page(self.driver)
+        return ok
+
+    def _record_page_load(self, step: str):
+        """记录浏览器Navigation Timing中的页面加载耗时"""
+        try:
+            timing = self.driver.execute_script(PAGE_TIMING_JS)
+        except WebDriverException:
+            return
+        if not timing or timing['url'] in [p['url'] for p in self.page_loads[-1:]]:
+            return
+        timing['step'] = step
+        self.page_loads.append(timing)
+        load = f"{timing['load'] / 1000:.2f}s" if timing['load'] else '未完成'
+        print(f"📏 {step}: DOMContentLoaded {timing['dom_content_loaded'] / 1000:.2f}s, "
+              f"load {load}, 资源 {timing['resources']} 个")
+
+    def page_load_summary(self) -> str:
+        """页面加载耗时汇总，用于对比精简模式开启前后的效果"""
+        if not self.page_loads:
+            return "无页面加载记录"
+        count = len(self.page_loads)
+        avg_dcl = sum(p['dom_content_loaded'] for p in self.page_loads) / count / 1000
+        resources = sum(p['resources'] for p in self.page_loads)
+        mode = '精简模式' if Config.LEAN_BROWSER else '标准模式'
+        return f"页面加载 {count} 次，平均 DOMContentLoaded {avg_dcl:.2f}s，共请求资源 {resources} 个（{mode}）"
+
+    def url_changes(self, step: str, old_url: str, timeout: Optional[float] = None, required: bool = False) -> bool:
+        """等待URL离开 old_url"""
+        return bool(self.until(step, lambda d: d.current_url != old_url, timeout, required))
+
+    def present(self, step: str, locator: Locator, timeout: Optional[float] = None, required: bool = True):
+        """等待元素出现并返回该元素"""
+        return self.until(step, element_present(locator), timeout, required)
+
+    def first_present(self, step: str, locators: Sequence[Locator], timeout: Optional[float] = None,
+                      required: bool = True):
+        """
+        等待多个候选定位方式中的任意一个出现
+
+        每轮轮询依次尝试所有候选，不会因为某个候选不存在而单独等待。
+
+        Returns:
+            (命中的定位方式, 元素)，未找到且 required=False 时返回None
+        """
+        def condition(driver):
+            for locator in locators:
+                elements = driver.find_elements(*locator)
+                if elements:
+                    return locator, elements[0]
+            return False
+
+        return self.until(step, condition, timeout, required)
+
+    def navigation(self, step: str, old_url: str, stale_element=None, timeout: Optional[float] = None,
+                   required: bool = False) -> bool:
+        """
+        等待一次页面跳转完成
+
+        以URL变化或旧页面元素失效作为跳转信号，再等待新页面 readyState 就绪。
+        """
+        timeout = Config.WAIT_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        changed = self.until(f"{step}(跳转)", page_changed(old_url, stale_element), timeout, required)
+        remaining = max(timeout - (time.perf_counter() - start), 1)
+        self.ready(f"{step}(就绪)", remaining)
+        return bool(changed)
+
+    def total_time(self) -> float:
+        """所有等待步骤的总耗时"""
+        return sum(elapsed for _, elapsed, _ in self.timings)
+
+
+def document_ready(states: Sequence[str] = ('complete',)) -> Callable:
+    """document.readyState 条件"""
+    def condition(driver):
+        try:
+            return driver.execute_script("return document.readyState") in states
+        except WebDriverException:
+            return False
+    return condition
+
+
+def element_present(locator: Locator) -> Callable:
+    """元素存在条件（不依赖隐式等待）"""
+    def condition(driver):
+        elements = driver.find_elements(*locator)
+        return elements[0] if elements else False
+    return condition
+
+
+def page_changed(old_url: str, stale_element=None) -> Callable:
+    """页面跳转条件：URL发生变化，或旧页面上的元素已失效"""
+    def condition(driver):
+        if driver.current_url != old_url:
+            return True
+        if stale_element is not None:
+            try:
+                stale_element.is_enabled()
+            except StaleElementReferenceException:
+                return True
+        return False
+    return condition